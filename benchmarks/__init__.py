@@ -0,0 +1 @@
+from . import harness, bench_coder, bench_flask, bench_import, bench_json, bench_rules
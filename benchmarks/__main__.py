@@ -0,0 +1,33 @@
+import argparse
+import sys
+from . import harness
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument("-k", "--filter", default="*", help="glob of names to run")
+    parser.add_argument("-r", "--repeat", type=int, default=5)
+    parser.add_argument("--save", metavar="PATH", help="store results as a baseline")
+    parser.add_argument("--compare", metavar="PATH", help="baseline to compare to")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = harness.run(args.filter, args.repeat)
+    baseline = harness.load(args.compare) if args.compare else {}
+    for name, result in results.items():
+        line = f"{name:<32} {result['min'] * 1e6:>12.2f} us"
+        if name in baseline:
+            ratio = result["min"] / baseline[name]["min"]
+            line += f" {ratio:>8.2f}x"
+        print(line)
+
+    if args.save:
+        harness.save(args.save, results)
+    regressions = harness.compare(results, baseline, args.tolerance)
+    for name in regressions:
+        print(f"regression: {name}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
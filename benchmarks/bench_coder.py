@@ -0,0 +1,22 @@
+from .harness import benchmark
+from . import fixtures
+
+
+def _register(algorithm: str, size: str) -> None:
+    payload = fixtures.payloads[size]
+
+    @benchmark(f"encode.{algorithm}.{size}")
+    def encode():
+        handler = fixtures.handler(algorithm)
+        return lambda: handler.encode(dict(payload))
+
+    @benchmark(f"decode.{algorithm}.{size}")
+    def decode():
+        handler = fixtures.handler(algorithm)
+        token = handler.encode(dict(payload))
+        return lambda: handler.decode(token)
+
+
+for _algorithm in fixtures.algorithms:
+    for _size in fixtures.payloads:
+        _register(_algorithm, _size)
@@ -0,0 +1,61 @@
+import flask
+import flask_jwt
+from .harness import benchmark
+from . import fixtures
+
+
+def _app(algorithm: str, **kwargs) -> flask.Flask:
+    app = flask.Flask(__name__)
+    jwt = fixtures.handler(algorithm, flask_jwt.FlaskJWT, **kwargs)
+    jwt.init_app(app)
+    view = flask_jwt.jwt_protected(
+        flask_jwt.HasScopes("read:thing"), flask_jwt.MatchValue("url:uuid", "jwt:sub")
+    )(lambda uuid: uuid)
+    app.add_url_rule("/protected/<uuid>", "protected", view)
+    app.jwt = jwt
+    return app
+
+
+def _register(algorithm: str) -> None:
+    @benchmark(f"pre_request.{algorithm}")
+    def pre_request():
+        app = _app(algorithm)
+        token = app.jwt.encode(dict(fixtures.small_payload))
+        headers = {"Authorization": f"Bearer {token}"}
+        with app.test_request_context("/", headers=headers):
+            yield app.jwt._pre_request_callback
+
+    @benchmark(f"round_trip.{algorithm}")
+    def round_trip():
+        app = _app(algorithm, auto_update=True)
+        token = app.jwt.encode(dict(fixtures.small_payload))
+        client = app.test_client()
+        headers = {"Authorization": f"Bearer {token}"}
+        return lambda: client.get("/protected/1234", headers=headers)
+
+
+for _algorithm in fixtures.algorithms:
+    _register(_algorithm)
+
+
+@benchmark("pre_request.tenants")
+def pre_request_tenants():
+    # the last of 100 tenants, found through the issuer index.
+    registry = flask_jwt.TenantRegistry(
+        *(
+            flask_jwt.FlaskJWT(f"secret-{index}", 3600, issuer=f"tenant-{index}")
+            for index in range(100)
+        )
+    )
+    app = _app("HS256", tenants=registry)
+    token = registry.get(issuer="tenant-99").encode(dict(fixtures.small_payload))
+    with app.test_request_context("/", headers={"Authorization": f"Bearer {token}"}):
+        yield app.jwt._pre_request_callback
+
+
+@benchmark("pre_request.shared_cache")
+def pre_request_shared_cache():
+    app = _app("RS256", token_cache=flask_jwt.SharedTokenCache())
+    token = app.jwt.encode(dict(fixtures.small_payload))
+    with app.test_request_context("/", headers={"Authorization": f"Bearer {token}"}):
+        yield app.jwt._pre_request_callback
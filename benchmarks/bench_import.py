@@ -0,0 +1,23 @@
+import subprocess
+import sys
+from .harness import benchmark
+
+# each run is a fresh interpreter, so nothing is already in sys.modules.
+statements = {
+    "interpreter": "pass",
+    "package": "import flask_jwt",
+    "keys": "from flask_jwt import KeySet",
+    "extension": "from flask_jwt import FlaskJWT, jwt_protected, HasScopes",
+    "everything": "import flask_jwt; [getattr(flask_jwt, n) for n in flask_jwt.__all__]",
+}
+
+
+def _register(name: str, statement: str) -> None:
+    @benchmark(f"import.{name}")
+    def run():
+        command = [sys.executable, "-c", statement]
+        return lambda: subprocess.run(command, check=True)
+
+
+for _name, _statement in statements.items():
+    _register(_name, _statement)
@@ -0,0 +1,28 @@
+import flask_jwt
+from .harness import benchmark
+from . import fixtures
+
+
+def _register(backend: str) -> None:
+    serializer = flask_jwt.serializers.backends[backend]()
+    payload = fixtures.large_payload
+
+    @benchmark(f"json.{backend}.dumps")
+    def dumps():
+        return lambda: serializer.dumps(payload)
+
+    @benchmark(f"json.{backend}.loads")
+    def loads():
+        data = serializer.dumps(payload)
+        return lambda: serializer.loads(data)
+
+    @benchmark(f"json.{backend}.round_trip")
+    def round_trip():
+        handler = fixtures.handler("HS256", serializer=serializer)
+        return lambda: handler.decode(handler.encode(dict(payload)))
+
+
+# only the backends installed here are benchmarked.
+for _backend, _serializer in flask_jwt.serializers.backends.items():
+    if _serializer.available(None):
+        _register(_backend)
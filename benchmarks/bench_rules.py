@@ -0,0 +1,56 @@
+import flask
+import flask_jwt
+from .harness import benchmark
+from . import fixtures
+
+
+def _deep_tree(depth: int) -> flask_jwt.JWTRule:
+    rule = flask_jwt.HasScopes("scope:0")
+    for level in range(depth):
+        group = flask_jwt.AllOf if level % 2 else flask_jwt.AnyOf
+        rule = group(rule, flask_jwt.HasScopes(f"scope:{level}"))
+    return rule
+
+
+@benchmark("rules.has_scopes.large")
+def has_scopes():
+    rule = flask_jwt.HasScopes(*(f"scope:{index}" for index in range(0, 200, 10)))
+    token = fixtures.large_payload
+    return lambda: rule(token)
+
+
+@benchmark("rules.has_scopes.registry")
+def has_scopes_registry():
+    registry = flask_jwt.ScopeRegistry()
+    rule = flask_jwt.HasScopes(
+        *(f"scope:{index}" for index in range(0, 200, 10)), registry=registry
+    )
+    app = flask.Flask(__name__)
+    token = fixtures.large_payload
+    with app.test_request_context("/"):
+        yield lambda: rule(token)
+
+
+@benchmark("rules.deep_tree")
+def deep_tree():
+    rule = flask_jwt.AllOf(*(_deep_tree(8) for _ in range(4)))
+    token = fixtures.large_payload
+    return lambda: rule(token)
+
+
+@benchmark("rules.match_value")
+def match_value():
+    app = flask.Flask(__name__)
+    rule = flask_jwt.MatchValue("header:X-User", "jwt:sub")
+    token = fixtures.small_payload
+    with app.test_request_context("/", headers={"X-User": "1234"}):
+        yield lambda: rule(token)
+
+
+@benchmark("protected.deep_tree")
+def protected():
+    view = flask_jwt.jwt_protected(*(_deep_tree(8) for _ in range(4)))(lambda: None)
+    app = flask.Flask(__name__)
+    with app.test_request_context("/"):
+        flask_jwt.handlers._Store.set(dict(fixtures.large_payload))
+        yield view
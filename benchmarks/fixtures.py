@@ -0,0 +1,35 @@
+from typing import Dict
+import functools
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+import flask_jwt
+
+algorithms = ("HS256", "RS256", "ES256")
+
+small_payload: Dict = {"sub": "1234", "scp": ["read:thing"]}
+
+large_payload: Dict = {
+    "sub": "1234",
+    "scp": [f"scope:{index}" for index in range(200)],
+    "profile": {
+        "name": "benchmark",
+        "groups": [{"id": index, "name": f"group {index}"} for index in range(50)],
+    },
+}
+
+payloads = {"small": small_payload, "large": large_payload}
+
+
+@functools.lru_cache(maxsize=None)
+def key(algorithm: str) -> flask_jwt.Key:
+    if algorithm.startswith("HS"):
+        return flask_jwt.Key("benchmark-secret", algorithm)
+    if algorithm.startswith("RS"):
+        private = rsa.generate_private_key(65537, 2048, default_backend())
+    else:
+        private = ec.generate_private_key(ec.SECP256R1(), default_backend())
+    return flask_jwt.Key(private, algorithm)
+
+
+def handler(algorithm: str, cls: type = flask_jwt.handlers.JWTHandler, **kwargs):
+    return cls(flask_jwt.KeySet(key(algorithm)), 3600, **kwargs)
@@ -0,0 +1,74 @@
+from typing import Any, Callable, ContextManager, Dict, List, Optional
+import contextlib
+import fnmatch
+import inspect
+import json
+import platform
+import statistics
+import timeit
+
+# setups return the function to time, or yield it and clean up afterwards.
+registry: Dict[str, Callable[[], Any]] = {}
+
+
+def benchmark(name: str) -> Callable:
+    def register(setup: Callable[[], Any]) -> Callable:
+        if name in registry:
+            raise ValueError(f"benchmark {name} is already registered")
+        registry[name] = setup
+        return setup
+
+    return register
+
+
+def measure(func: Callable[[], Any], repeat: int = 5) -> Dict[str, float]:
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    times = [total / number for total in timer.repeat(repeat, number)]
+    return {"min": min(times), "mean": statistics.mean(times), "number": number}
+
+
+def run(pattern: str = "*", repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for name in sorted(registry):
+        if fnmatch.fnmatch(name, pattern):
+            with _prepared(registry[name]) as func:
+                results[name] = measure(func, repeat)
+    return results
+
+
+def _prepared(setup: Callable[[], Any]) -> ContextManager:
+    if inspect.isgeneratorfunction(setup):
+        return contextlib.contextmanager(setup)()
+    return contextlib.nullcontext(setup())
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    regressions = []
+    for name, result in results.items():
+        expected: Optional[Dict[str, float]] = baseline.get(name, None)
+        if expected and result["min"] > expected["min"] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def save(path: str, results: Dict[str, Dict[str, float]]) -> None:
+    document = {
+        "machine": {
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "processor": platform.processor() or platform.machine(),
+        },
+        "results": results,
+    }
+    with open(path, "w") as baseline_file:
+        json.dump(document, baseline_file, indent=2, sort_keys=True)
+
+
+def load(path: str) -> Dict[str, Dict[str, float]]:
+    with open(path) as baseline_file:
+        return json.load(baseline_file)["results"]
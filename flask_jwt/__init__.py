@@ -1,20 +1,88 @@
-from . import errors, handlers, rules, decorators
+import importlib
 
+# public name -> (submodule, attribute), submodules are only imported when one
+# of their names is first used, so `import flask_jwt` doesn't load flask or jwt.
+# (no typing here either, importing it costs more than the rest of this file)
+_exports = {
+    "FlaskJWT": ("handlers", "FlaskJWT"),
+    "AsyncFlaskJWT": ("handlers", "AsyncFlaskJWT"),
+    "TokenCache": ("cache", "TokenCache"),
+    "RejectionCache": ("cache", "RejectionCache"),
+    "SharedTokenCache": ("cache", "SharedTokenCache"),
+    "Claims": ("claims", "Claims"),
+    "Key": ("keys", "Key"),
+    "KeySet": ("keys", "KeySet"),
+    "JWKSource": ("jwks", "JWKSource"),
+    "TokenValidator": ("validators", "TokenValidator"),
+    "ScopeRegistry": ("scopes", "ScopeRegistry"),
+    "TenantRegistry": ("tenants", "TenantRegistry"),
+    "RevocationList": ("revocation", "RevocationList"),
+    "InMemoryMetrics": ("instrumentation", "InMemoryMetrics"),
+    "StatsDMetrics": ("instrumentation", "StatsDMetrics"),
+    "current_token": ("handlers", "JWTHandler.current_token"),
+    "current_token_async": ("handlers", "JWTHandler.current_token_async"),
+    "generate_token": ("handlers", "JWTHandler.generate_token"),
+    "jwt_protected": ("decorators", "JWTProtected"),
+    "async_jwt_protected": ("decorators", "AsyncJWTProtected"),
+    "JWTRule": ("rules", "JWTRule"),
+    "HasScopes": ("rules", "HasScopes"),
+    "MatchValue": ("rules", "MatchValue"),
+    "AllOf": ("rules", "AllOf"),
+    "AnyOf": ("rules", "AnyOf"),
+    "NoneOf": ("rules", "NoneOf"),
+    "compile_rules": ("compiler", "compile_rules"),
+    "JWTEncodeError": ("errors", "JWTEncodeError"),
+    "JWTDecodeError": ("errors", "JWTDecodeError"),
+    "JWTValidationError": ("errors", "JWTValidationError"),
+    "JWTImmutableClaimsError": ("errors", "JWTImmutableClaimsError"),
+    "JWTStructureError": ("errors", "JWTStructureError"),
+    "JWTHeaderError": ("errors", "JWTHeaderError"),
+    "JWTClaimsError": ("errors", "JWTClaimsError"),
+    "JWTSignatureError": ("errors", "JWTSignatureError"),
+    "JWTRevokedError": ("errors", "JWTRevokedError"),
+}
 
-FlaskJWT = handlers.FlaskJWT
+_submodules = (
+    "cache",
+    "claims",
+    "cli",
+    "clocks",
+    "compiler",
+    "decorators",
+    "encoder",
+    "errors",
+    "handlers",
+    "instrumentation",
+    "jwks",
+    "keys",
+    "policies",
+    "revocation",
+    "rules",
+    "scopes",
+    "serializers",
+    "tenants",
+    "validators",
+)
 
-current_token = handlers.JWTHandler.current_token
-generate_token = handlers.JWTHandler.generate_token
+__all__ = sorted(_exports)
 
-jwt_protected = decorators.JWTProtected
 
-JWTRule = rules.JWTRule
-HasScopes = rules.HasScopes
-MatchValue = rules.MatchValue
-AllOf = rules.AllOf
-AnyOf = rules.AnyOf
-NoneOf = rules.NoneOf
+def _resolve(name):
+    module_name, path = _exports[name]
+    value = importlib.import_module(f"{__name__}.{module_name}")
+    for attribute in path.split("."):
+        value = getattr(value, attribute)
+    return value
 
-JWTEncodeError = errors.JWTEncodeError
-JWTDecodeError = errors.JWTDecodeError
-JWTValidationError = errors.JWTValidationError
+
+def __getattr__(name):
+    if name in _exports:
+        value = globals()[name] = _resolve(name)
+        return value
+    if name in _submodules:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__} has no attribute {name}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_exports) | set(_submodules))
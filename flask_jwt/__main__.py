@@ -0,0 +1,13 @@
+import os
+import sys
+from . import cli
+
+if __name__ == "__main__":
+    try:
+        code = cli.main()
+    except BrokenPipeError:
+        # the reader went away (e.g. piped into head), exit without a
+        # traceback or a second error when stdout is flushed.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        code = 1
+    sys.exit(code)
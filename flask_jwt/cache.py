@@ -0,0 +1,307 @@
+from typing import Dict, List, Optional, Tuple, Union
+import collections
+import hashlib
+import struct
+import threading
+import time
+from . import claims, clocks, errors, serializers
+
+
+class TokenCache:
+    def __init__(self, max_size: int = 1024, ttl: Optional[float] = None):
+        if max_size < 1:
+            raise ValueError("TokenCache requires a max_size of at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Tuple[float, float, Dict]] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, jwt_string: str, now: Optional[float] = None) -> Optional[Dict]:
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(jwt_string, None)
+            if entry is None:
+                self.misses += 1
+                return None
+            not_before, expires, token = entry
+            if now < not_before or now >= expires:
+                del self._entries[jwt_string]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(jwt_string)
+            self.hits += 1
+        return _copy(token)
+
+    def set(
+        self,
+        jwt_string: str,
+        token: Dict,
+        now: Optional[float] = None,
+        leeway: clocks.Leeway = clocks.Leeway(),
+    ) -> None:
+        now = time.time() if now is None else now
+        expires = _expires(token, now, leeway, self.ttl)
+        if expires is None or expires <= now:
+            return
+        not_before = float(token.get("nbf", 0) or 0) - leeway.nbf
+        with self._lock:
+            self._entries[jwt_string] = (not_before, expires, _copy(token))
+            self._entries.move_to_end(jwt_string)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+
+class RejectionCache:
+    def __init__(self, max_size: int = 1024, ttl: float = 5.0):
+        if max_size < 1:
+            raise ValueError("RejectionCache requires a max_size of at least 1")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[bytes, List] = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, jwt_string: str, now: Optional[float] = None
+    ) -> Optional[errors.FlaskJWTError]:
+        now = time.time() if now is None else now
+        digest = _digest(jwt_string)
+        with self._lock:
+            entry = self._entries.get(digest, None)
+            if entry is None or now >= entry[0]:
+                if entry is not None:
+                    del self._entries[digest]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            entry[3] += 1
+            self.hits += 1
+        return entry[1](entry[2])
+
+    def set(
+        self, jwt_string: str, error: errors.FlaskJWTError, now: Optional[float] = None
+    ) -> None:
+        now = time.time() if now is None else now
+        # a digest keeps each entry small however large the rejected token is.
+        entry = [now + self.ttl, type(error), str(error), 0]
+        digest = _digest(jwt_string)
+        with self._lock:
+            self._entries[digest] = entry
+            self._entries.move_to_end(digest)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def top(self, count: int = 10) -> List[Tuple[str, int, str]]:
+        with self._lock:
+            entries = list(self._entries.items())
+        entries.sort(key=lambda item: item[1][3], reverse=True)
+        return [
+            (digest.hex(), hits, f"{error.__name__}: {message}")
+            for digest, (_, error, message, hits) in entries[:count]
+        ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+
+class SharedTokenCache:
+
+    # per slot: sequence, digest, not before, expires, payload length.
+    header = struct.Struct("=Q16sddI")
+
+    def __init__(
+        self,
+        max_size: int = 4096,
+        slot_size: int = 1024,
+        ways: int = 4,
+        stripes: int = 64,
+        ttl: Optional[float] = None,
+        serializer: Union[str, serializers.Serializer] = "json",
+    ):
+        if max_size < 1 or ways < 1 or stripes < 1:
+            raise ValueError("SharedTokenCache requires a max_size of at least 1")
+        if slot_size <= self.header.size:
+            raise ValueError(f"slot_size must be larger than {self.header.size}")
+        import mmap
+        import multiprocessing
+
+        self.ways = ways
+        self.buckets = -(-max_size // ways)
+        self.max_size = self.buckets * ways
+        self.slot_size = slot_size
+        self.ttl = ttl
+        self.serializer = serializers.get(serializer)
+        self.hits = 0
+        self.misses = 0
+        # an anonymous mapping and the locks are inherited by forked workers,
+        # so the cache has to be created before the server forks.
+        self._buffer = mmap.mmap(-1, self.max_size * slot_size)
+        self._locks = [multiprocessing.Lock() for _ in range(stripes)]
+
+    def __len__(self) -> int:
+        now = time.time()
+        count = 0
+        for index in range(self.max_size):
+            entry = self._read(index * self.slot_size)
+            if entry is not None and entry[0] != _empty and now < entry[2]:
+                count += 1
+        return count
+
+    def get(self, jwt_string: str, now: Optional[float] = None) -> Optional[Dict]:
+        now = time.time() if now is None else now
+        digest = _short_digest(jwt_string)
+        bucket = self._bucket(digest)
+        for offset in self._slots(bucket):
+            entry = self._read(offset)
+            if entry is None or entry[0] != digest:
+                continue
+            _, not_before, expires, payload = entry
+            if not_before <= now < expires:
+                self.hits += 1
+                return claims.Claims(self.serializer.loads(payload), jwt_string)
+            break
+        self.misses += 1
+        return None
+
+    def set(
+        self,
+        jwt_string: str,
+        token: Dict,
+        now: Optional[float] = None,
+        leeway: clocks.Leeway = clocks.Leeway(),
+    ) -> None:
+        now = time.time() if now is None else now
+        expires = _expires(token, now, leeway, self.ttl)
+        if expires is None or expires <= now:
+            return
+        not_before = float(token.get("nbf", 0) or 0) - leeway.nbf
+        payload = self.serializer.dumps(dict(token))
+        if len(payload) > self.slot_size - self.header.size:
+            # too large for a slot, workers keep decoding it themselves.
+            return
+        digest = _short_digest(jwt_string)
+        bucket = self._bucket(digest)
+        lock = self._locks[bucket % len(self._locks)]
+        # a worker that died holding the lock only costs the others a write.
+        if not lock.acquire(timeout=0.1):
+            return
+        try:
+            offset = self._victim(bucket, digest, now)
+            self._write(offset, digest, not_before, expires, payload)
+        finally:
+            lock.release()
+
+    def clear(self) -> None:
+        for bucket in range(self.buckets):
+            lock = self._locks[bucket % len(self._locks)]
+            with lock:
+                for offset in self._slots(bucket):
+                    self._write(offset, _empty, 0.0, 0.0, b"")
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self)}
+
+    def _bucket(self, digest: bytes) -> int:
+        return int.from_bytes(digest[:8], "little") % self.buckets
+
+    def _slots(self, bucket: int) -> range:
+        start = bucket * self.ways * self.slot_size
+        return range(start, start + self.ways * self.slot_size, self.slot_size)
+
+    def _victim(self, bucket: int, digest: bytes, now: float) -> int:
+        # the same token, then an empty or expired slot, then the entry that
+        # expires first.
+        victim, victim_expires = 0, None
+        for offset in self._slots(bucket):
+            _, stored, _, expires, _ = self.header.unpack_from(self._buffer, offset)
+            if stored == digest or stored == _empty or expires <= now:
+                return offset
+            if victim_expires is None or expires < victim_expires:
+                victim, victim_expires = offset, expires
+        return victim
+
+    def _read(self, offset: int) -> Optional[Tuple[bytes, float, float, bytes]]:
+        # lock free, a sequence that is odd or changed during the read means
+        # a writer was active. a torn read is a miss, never a wrong token.
+        buffer = self._buffer
+        for _ in range(3):
+            sequence, digest, not_before, expires, length = self.header.unpack_from(
+                buffer, offset
+            )
+            if sequence & 1:
+                continue
+            start = offset + self.header.size
+            payload = buffer[start : start + min(length, self.slot_size)]
+            if self.header.unpack_from(buffer, offset)[0] == sequence:
+                return digest, not_before, expires, payload
+        return None
+
+    def _write(
+        self,
+        offset: int,
+        digest: bytes,
+        not_before: float,
+        expires: float,
+        payload: bytes,
+    ) -> None:
+        buffer = self._buffer
+        sequence = self.header.unpack_from(buffer, offset)[0]
+        # odd while writing, also when a dead writer left it odd.
+        begin = (sequence + 1) | 1
+        _sequence.pack_into(buffer, offset, begin)
+        start = offset + self.header.size
+        buffer[start : start + len(payload)] = payload
+        self.header.pack_into(
+            buffer, offset, begin, digest, not_before, expires, len(payload)
+        )
+        _sequence.pack_into(buffer, offset, begin + 1)
+
+
+_sequence = struct.Struct("=Q")
+_empty = bytes(16)
+
+
+def _expires(
+    token: Dict, now: float, leeway: clocks.Leeway, ttl: Optional[float]
+) -> Optional[float]:
+    expires = None
+    if token.get("exp", None) is not None:
+        # exp is truncated to an int before it is compared to the clock,
+        # so expire the entry no later than that truncated value.
+        expires = float(int(token["exp"])) + leeway.exp
+    if ttl is not None:
+        expires = now + ttl if expires is None else min(expires, now + ttl)
+    return expires
+
+
+def _short_digest(jwt_string: str) -> bytes:
+    return hashlib.blake2b(jwt_string.encode("utf8"), digest_size=16).digest()
+
+
+def _digest(jwt_string: str) -> bytes:
+    return hashlib.sha256(jwt_string.encode("utf8")).digest()
+
+
+def _copy(token: Dict) -> Dict:
+    # immutable claims can be shared, plain dicts are copied in and out.
+    return token if isinstance(token, claims.Claims) else dict(token)
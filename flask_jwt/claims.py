@@ -0,0 +1,58 @@
+from typing import Any, Dict, Mapping, NoReturn, Optional, Tuple
+import types
+from . import errors
+
+REGISTERED = ("iss", "sub", "aud", "exp", "nbf", "iat", "jti", "scp")
+
+
+class Claims(dict):
+
+    # a dict subclass, so json.dumps, flask.jsonify and orjson take it as is.
+    __slots__ = ("raw", "_custom")
+
+    def __init__(self, source: Optional[Dict] = None, raw: Optional[str] = None):
+        super(Claims, self).__init__(() if source is None else source)
+        object.__setattr__(self, "raw", raw)
+        object.__setattr__(self, "_custom", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("claims are immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("claims are immutable")
+
+    def __reduce__(self) -> Tuple:
+        return type(self), (dict(self), self.raw)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict.__repr__(self)})"
+
+    def _immutable(self, *_: Any, **__: Any) -> NoReturn:
+        # the same object is shared by every request presenting the token.
+        raise errors.JWTImmutableClaimsError(
+            "claims are immutable, store a changed copy with "
+            "FlaskJWT.store.set({**token, ...}) or generate_token(...)"
+        )
+
+    __setitem__ = __delitem__ = __ior__ = _immutable
+    clear = pop = popitem = setdefault = update = _immutable
+
+    def copy(self) -> Dict:
+        return dict(self)
+
+    @property
+    def custom(self) -> Mapping[str, Any]:
+        # only built for callers that ask for the non registered claims.
+        if self._custom is None:
+            custom = {k: v for k, v in self.items() if k not in REGISTERED}
+            object.__setattr__(self, "_custom", types.MappingProxyType(custom))
+        return self._custom
+
+
+def _registered(name: str) -> property:
+    return property(lambda claims: dict.get(claims, name, None))
+
+
+for _name in REGISTERED:
+    setattr(Claims, _name, _registered(_name))
+del _name
@@ -0,0 +1,198 @@
+from typing import IO, Any, Callable, Deque, Iterator, List, Optional, Tuple
+import argparse
+import collections
+import concurrent.futures
+import functools
+import itertools
+import json
+import sys
+import time
+from . import errors, handlers, jwks, keys
+
+
+def main(
+    argv: Optional[List[str]] = None,
+    stdin: Optional[IO[str]] = None,
+    stdout: Optional[IO[str]] = None,
+    stderr: Optional[IO[str]] = None,
+) -> int:
+    stdin = stdin or sys.stdin
+    stdout = stdout or sys.stdout
+    stderr = stderr or sys.stderr
+    args = _parser().parse_args(argv)
+    try:
+        handler = _handler(args)
+    except (OSError, ValueError) as ex:
+        print(f"flask_jwt: {ex}", file=stderr)
+        return 2
+
+    lines = _lines(args.files, stdin)
+    executor = None
+    if args.workers > 1:
+        executor = concurrent.futures.ThreadPoolExecutor(args.workers)
+    start = time.perf_counter()
+    try:
+        if args.command == "encode":
+            parse, process, field = _claims, handler.encode_many, "token"
+        else:
+            parse, field = _token, "claims"
+            verify = args.command == "verify"
+            process = functools.partial(handler.decode_many, verify=verify)
+        results = _Results(stdout, field)
+        results.consume(lines, parse, process, executor, args.chunk_size)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    elapsed = time.perf_counter() - start
+
+    rate = results.total / elapsed if elapsed else 0.0
+    print(
+        f"{args.command}: {results.total} tokens, {results.failed} errors"
+        f" in {elapsed:.2f}s ({rate:.0f}/s)",
+        file=stderr,
+    )
+    return 1 if results.failed else 0
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m flask_jwt")
+    commands = parser.add_subparsers(dest="command", required=True)
+    descriptions = {
+        "decode": "print the claims of each token without checking signatures",
+        "verify": "check the signature and claims of each token",
+        "encode": "sign each line of json claims",
+    }
+    for command, description in descriptions.items():
+        sub = commands.add_parser(command, help=description, description=description)
+        sub.add_argument("files", nargs="*", help="input files, stdin by default")
+        sub.add_argument("-w", "--workers", type=int, default=1)
+        sub.add_argument("--chunk-size", type=int, default=64)
+        sub.add_argument("-a", "--algorithm", default="HS256")
+        sub.add_argument("--serializer", default="json")
+        keys_group = sub.add_mutually_exclusive_group(required=command != "decode")
+        keys_group.add_argument("-s", "--secret", help="hmac secret")
+        keys_group.add_argument("-k", "--key-file", help="pem encoded key")
+        if command != "encode":
+            keys_group.add_argument("--jwks", help="jwks file or url")
+            sub.add_argument("--issuer")
+            sub.add_argument("--audience")
+            sub.add_argument("--leeway", type=float, default=0)
+        else:
+            sub.add_argument("--kid", help="key id header of the signing key")
+            sub.add_argument("--issuer")
+            sub.add_argument("--audience")
+            sub.add_argument("-l", "--lifespan", type=int, default=3600)
+    return parser
+
+
+def _handler(args: argparse.Namespace) -> handlers.JWTHandler:
+    jwks_location = getattr(args, "jwks", None)
+    if jwks_location:
+        secret: Any = jwks.JWKSource(jwks_location)
+    elif args.command == "decode":
+        # nothing is verified, so no key is needed (or built from -a).
+        secret = keys.KeySet()
+    elif args.key_file:
+        with open(args.key_file) as key_file:
+            secret = keys.KeySet(
+                keys.Key(key_file.read(), args.algorithm, getattr(args, "kid", None))
+            )
+    else:
+        secret = keys.KeySet(
+            keys.Key(args.secret or "", args.algorithm, getattr(args, "kid", None))
+        )
+    return handlers.JWTHandler(
+        secret,
+        getattr(args, "lifespan", 0),
+        args.algorithm,
+        issuer=args.issuer,
+        audience=args.audience,
+        serializer=args.serializer,
+        leeway=getattr(args, "leeway", None),
+    )
+
+
+def _lines(files: List[str], stdin: IO[str]) -> Iterator[str]:
+    for path in files or ["-"]:
+        if path == "-":
+            yield from stdin
+            continue
+        with open(path) as input_file:
+            yield from input_file
+
+
+def _token(line: str) -> str:
+    token = line.strip()
+    # tokens copied from request logs keep their header prefix.
+    prefix = handlers.FlaskJWT.token_prefix
+    return token[len(prefix) :] if token.startswith(prefix) else token
+
+
+def _claims(line: str) -> Any:
+    try:
+        claims = json.loads(line)
+    except ValueError as ex:
+        raise errors.JWTEncodeError(f"invalid json claims: {ex}")
+    if not isinstance(claims, dict):
+        raise errors.JWTEncodeError("claims must be a json object")
+    return claims
+
+
+class _Results:
+    def __init__(self, stdout: IO[str], field: str):
+        self.stdout = stdout
+        self.field = field
+        self.total = 0
+        self.failed = 0
+        # line numbers of the items handed to the handler and not written
+        # yet, only as many as the chunks in flight.
+        self.pending: Deque[int] = collections.deque()
+        self.error: Optional[Tuple[int, errors.FlaskJWTError]] = None
+
+    def consume(
+        self,
+        lines: Iterator[str],
+        parse: Callable[[str], Any],
+        process: Callable[..., Iterator],
+        executor: Optional[concurrent.futures.Executor],
+        chunk_size: int,
+    ) -> None:
+        numbered = zip(itertools.count(1), lines)
+        while True:
+            items = self._parsed(numbered, parse)
+            for result in process(items, executor=executor, chunk_size=chunk_size):
+                self.write(self.pending.popleft(), result)
+            if self.error is None:
+                return
+            self.write(*self.error)
+            self.error = None
+
+    def write(self, number: int, result: Any) -> None:
+        self.total += 1
+        if isinstance(result, errors.FlaskJWTError):
+            self.failed += 1
+            record = {"line": number, "error": type(result).__name__}
+            record["message"] = str(result)
+        else:
+            record = {"line": number, self.field: result}
+        self.stdout.write(json.dumps(record, default=str, separators=(",", ":")))
+        self.stdout.write("\n")
+
+    def _parsed(
+        self, numbered: Iterator[Tuple[int, str]], parse: Callable[[str], Any]
+    ) -> Iterator[Any]:
+        for number, line in numbered:
+            if not line.strip():
+                continue
+            try:
+                item = parse(line)
+            except errors.FlaskJWTError as ex:
+                if not self.pending:
+                    self.write(number, ex)
+                    continue
+                # the results still in flight are written first, so the batch
+                # ends here and consume() starts another after the error.
+                self.error = number, ex
+                return
+            self.pending.append(number)
+            yield item
@@ -0,0 +1,33 @@
+from typing import Callable, Dict, NamedTuple, Optional, Union
+import time
+
+Clock = Callable[[], float]
+
+
+class Leeway(NamedTuple):
+    exp: float = 0
+    nbf: float = 0
+    # pyjwt never rejected a token for its iat, a future iat is only checked
+    # when a leeway is given for it.
+    iat: Optional[float] = None
+
+
+class FrozenClock:
+    def __init__(self, now: Optional[float] = None):
+        self.now = time.time() if now is None else now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def leeway(value: Union[float, Dict[str, float], Leeway, None]) -> Leeway:
+    if value is None:
+        return Leeway()
+    if isinstance(value, Leeway):
+        return value
+    if isinstance(value, dict):
+        return Leeway(**value)
+    return Leeway(value, value)
@@ -0,0 +1,195 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import functools
+from . import handlers, rules
+
+
+class _Node:
+    def __init__(
+        self,
+        kind: str,
+        children: Tuple["_Node", ...],
+        rule: Callable,
+        sources: Tuple[Callable, ...] = (),
+    ):
+        self.kind = kind
+        self.children = children
+        self.rule = rule
+        # the rules a merged rule replaced, explain() reports these.
+        self.sources = sources
+        if kind == "rule":
+            self.cost = getattr(rule, "cost", rules.JWTRule.cost)
+        else:
+            self.cost = sum(child.cost for child in children)
+
+    def build(
+        self, wrap: Optional[Callable[[Callable], Callable]] = None
+    ) -> Callable[[Dict], bool]:
+        if self.kind == "rule":
+            return self.rule if wrap is None else wrap(self.rule)
+        checks = tuple(child.build(wrap) for child in self.children)
+        if self.kind == "all":
+
+            def check(token: Dict) -> bool:
+                for child in checks:
+                    if not child(token):
+                        return False
+                return True
+
+        elif self.kind == "any":
+
+            def check(token: Dict) -> bool:
+                for child in checks:
+                    if child(token):
+                        return True
+                return False
+
+        else:
+
+            def check(token: Dict) -> bool:
+                for child in checks:
+                    if child(token):
+                        return False
+                return True
+
+        return check
+
+    def explain(self, token: Dict) -> Optional[Callable]:
+        if self.kind == "rule":
+            if self.rule(token):
+                return None
+            for source in self.sources:
+                if not source(token):
+                    return source
+            return self.rule
+        if self.kind == "all":
+            for child in self.children:
+                failed = child.explain(token)
+                if failed is not None:
+                    return failed
+            return None
+        if self.kind == "any":
+            passed = any(child.explain(token) is None for child in self.children)
+            return None if passed else self.rule
+        for child in self.children:
+            if child.explain(token) is None:
+                return child.rule
+        return None
+
+
+class CompiledRule(rules.JWTRule):
+    def __init__(self, *jwt_rules: Callable):
+        self.rules = jwt_rules
+        self.root = _compile(rules.AllOf(*jwt_rules))
+        self.cost = self.root.cost
+        self._check = self.root.build(_memoized)
+        self._instrumented: Dict[int, Tuple[Any, Callable]] = {}
+
+    def __call__(self, token: Dict) -> bool:
+        return self._check(token)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, self.rules))})"
+
+    def explain(self, token: Dict) -> Optional[Callable]:
+        return self.root.explain(token)
+
+    def flatten(self) -> List[Callable]:
+        return list(_leaves(self.root))
+
+    def instrumented(self, metrics: Any) -> Callable[[Dict], bool]:
+        # built once per metrics object, the labels are rendered up front so
+        # timing a rule adds no formatting work to the request.
+        entry = self._instrumented.get(id(metrics), None)
+        if entry is None or entry[0] is not metrics:
+            timed = functools.partial(_timed, metrics)
+            entry = metrics, self.root.build(lambda rule: _memoized(rule, timed(rule)))
+            self._instrumented[id(metrics)] = entry
+        return entry[1]
+
+
+def compile_rules(*jwt_rules: Callable) -> CompiledRule:
+    return CompiledRule(*jwt_rules)
+
+
+def _compile(rule: Any) -> _Node:
+    if isinstance(rule, CompiledRule):
+        return rule.root
+    kind = _kinds.get(type(rule), None)
+    if kind is None:
+        return _Node("rule", (), rule)
+    children: List[_Node] = []
+    for child in map(_compile, rule.rules):
+        # AllOf(AllOf(a, b), c) == AllOf(a, b, c), and likewise for AnyOf.
+        if child.kind == kind and kind != "none":
+            children.extend(child.children)
+        else:
+            children.append(child)
+    if kind == "all":
+        children = _merge_scopes(children)
+    if len(children) == 1 and kind != "none":
+        return children[0]
+    children.sort(key=lambda child: child.cost)
+    return _Node(kind, tuple(children), rule)
+
+
+def _merge_scopes(children: List[_Node]) -> List[_Node]:
+    # scopes checked against different registries can't share one mask.
+    groups: Dict[Any, List[_Node]] = {}
+    for child in children:
+        if child.kind == "rule" and type(child.rule) is rules.HasScopes:
+            groups.setdefault(child.rule.registry, []).append(child)
+    merged: List[_Node] = []
+    for registry, group in groups.items():
+        if len(group) < 2:
+            continue
+        scopes = frozenset().union(*(c.rule.scopes for c in group))
+        rule = rules.HasScopes(*scopes, registry=registry)
+        merged.append(_Node("rule", (), rule, tuple(c.rule for c in group)))
+        children = [c for c in children if c not in group]
+    return merged + children
+
+
+def _memoized(
+    rule: Callable, check: Optional[Callable[[Dict], bool]] = None
+) -> Callable[[Dict], bool]:
+    # a rule shared by several policies and decorators on one view runs once
+    # per request, scope checks are cheaper to redo than to look up.
+    if getattr(rule, "cost", rules.JWTRule.cost) < rules.JWTRule.cost:
+        return check or rule
+    check = check or rule
+    key = ("rule", id(rule))
+
+    def memoized(token: Dict) -> bool:
+        request_cache = handlers._RequestCache.get()
+        if request_cache is None:
+            return check(token)
+        entry = request_cache.get(key, None)
+        if entry is not None and entry[0] is token:
+            return entry[1]
+        result = check(token)
+        request_cache[key] = (token, result)
+        return result
+
+    return memoized
+
+
+def _timed(metrics: Any, rule: Callable) -> Callable[[Dict], bool]:
+    # rules without their own repr would put an address in the label.
+    custom_repr = type(rule).__repr__ is not object.__repr__
+    labels = {"rule": repr(rule) if custom_repr else type(rule).__name__}
+
+    def check(token: Dict) -> bool:
+        with metrics.timer("rule", labels):
+            return rule(token)
+
+    return check
+
+
+def _leaves(node: _Node):
+    if node.kind == "rule":
+        yield node.rule
+    for child in node.children:
+        yield from _leaves(child)
+
+
+_kinds = {rules.AllOf: "all", rules.AnyOf: "any", rules.NoneOf: "none"}
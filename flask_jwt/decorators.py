@@ -1,24 +1,41 @@
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Optional
 import functools
-from . import errors, handlers, rules
+import inspect
+from . import compiler, handlers, policies, rules
 
 
 class JWTProtected:
+
+    handler = handlers.JWTHandler
+
     def __init__(self, *rules: rules.JWTRule):
         self.rules = rules
+        self.predicate = compiler.compile_rules(*rules)
 
     def __call__(self, func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                self._check(await self.handler.current_token_async())
+                return await func(*args, **kwargs)
+
+            return async_wrapper
+
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            token: Dict = handlers.JWTHandler.current_token()
-            if not token:
-                raise errors.JWTValidationError(
-                    "client did not supply a token in request header"
-                )
-            if not all(rule(token) for rule in self.rules):
-                raise errors.JWTValidationError(
-                    "one or more checks on the supplied jwt failed"
-                )
+            self._check(self.handler.current_token())
             return func(*args, **kwargs)
 
         return wrapper
+
+    def _check(self, token: Dict) -> None:
+        policies.enforce(self.predicate, token)
+
+    def explain(self, token: Dict) -> Optional[Callable]:
+        return self.predicate.explain(token)
+
+
+class AsyncJWTProtected(JWTProtected):
+
+    handler = handlers.AsyncFlaskJWT
@@ -0,0 +1,63 @@
+from typing import Dict, Optional, Tuple
+import calendar
+import datetime
+import jwt.utils
+from . import errors, keys, serializers
+
+
+class TokenEncoder:
+
+    header_typ = "JWT"
+    max_headers = 256
+
+    def __init__(self, serializer: Optional[serializers.Serializer] = None):
+        # with the default serializer the output is byte-identical to pyjwt.
+        self.serializer = serializer or serializers.JSONSerializer()
+        self.dumps = self.serializer.dumps
+        self._headers: Dict[Tuple, bytes] = {}
+
+    def encode(
+        self, payload: Dict, key: keys.Key, headers: Optional[Dict] = None
+    ) -> bytes:
+        for claim in ("exp", "iat", "nbf"):
+            value = payload.get(claim, None)
+            if isinstance(value, datetime.datetime):
+                payload[claim] = calendar.timegm(value.utctimetuple())
+        signing_input = b".".join(
+            (
+                self.header_segment(key.algorithm, headers),
+                jwt.utils.base64url_encode(self._dumps(payload)),
+            )
+        )
+        signature = jwt.utils.base64url_encode(key.sign(signing_input))
+        return b".".join((signing_input, signature))
+
+    def header_segment(self, algorithm: str, headers: Optional[Dict] = None) -> bytes:
+        try:
+            # 1, 1.0 and True hash alike but serialize differently.
+            cache_key = (algorithm,)
+            if headers:
+                cache_key += tuple((k, type(v), v) for k, v in headers.items())
+            return self._headers[cache_key]
+        except TypeError:
+            # unhashable header values are encoded every time.
+            return self._header_segment(algorithm, headers)
+        except KeyError:
+            segment = self._header_segment(algorithm, headers)
+            if len(self._headers) < self.max_headers:
+                self._headers[cache_key] = segment
+            return segment
+
+    def _header_segment(self, algorithm: str, headers: Optional[Dict]) -> bytes:
+        header = {"typ": self.header_typ, "alg": algorithm}
+        if headers:
+            if "kid" in headers and not isinstance(headers["kid"], str):
+                raise errors.JWTEncodeError("Key ID header parameter must be a string")
+            header.update(headers)
+        return jwt.utils.base64url_encode(self._dumps(header))
+
+    def _dumps(self, obj: Dict) -> bytes:
+        try:
+            return self.dumps(obj)
+        except (TypeError, ValueError, OverflowError) as ex:
+            raise errors.JWTEncodeError(f"can't serialize token: {ex}")
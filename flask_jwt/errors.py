@@ -31,3 +31,51 @@ class JWTValidationError(FlaskJWTError):
     """
 
     ...
+
+
+class JWTImmutableClaimsError(FlaskJWTError, TypeError):
+    """
+    raised when the claims of a verified jwt are changed in place
+    """
+
+    ...
+
+
+class JWTStructureError(JWTDecodeError):
+    """
+    raised when a jwt is malformed (size, segments or encoding)
+    """
+
+    ...
+
+
+class JWTHeaderError(JWTDecodeError):
+    """
+    raised when the header of a jwt is invalid or not allowed
+    """
+
+    ...
+
+
+class JWTClaimsError(JWTDecodeError):
+    """
+    raised when the unverified claims of a jwt are already invalid
+    """
+
+    ...
+
+
+class JWTSignatureError(JWTDecodeError):
+    """
+    raised when the signature of a jwt does not match
+    """
+
+    ...
+
+
+class JWTRevokedError(JWTDecodeError):
+    """
+    raised when a jwt has been revoked before it expired
+    """
+
+    ...
@@ -1,27 +1,182 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, Iterator, List
+from typing import Optional, Union
+import collections
+import concurrent.futures
+import contextvars
+import copy
+import functools
+import hashlib
+import inspect
+import itertools
+import pickle
 import time
+import uuid
 import json
 import flask
 import jwt
-from . import errors
+from . import cache, claims, clocks, encoder, errors, instrumentation, jwks, keys
+from . import policies, revocation, serializers, tenants, validators
 
 
 class _Store:
 
     key = "jwt"
+    loader_key = "jwt_loader"
+    sync_loader_key = "jwt_sync_loader"
+
+    @classmethod
+    def _read(cls, key: str) -> Any:
+        return getattr(flask.g, key, None)
+
+    @classmethod
+    def _write(cls, key: str, value: Any) -> None:
+        setattr(flask.g, key, value)
 
     @classmethod
     def set(cls, token: Dict) -> None:
-        setattr(flask.g, cls.key, token)
+        cls._write(cls.key, token)
+        cls._write(cls.loader_key, None)
+        cls._write(cls.sync_loader_key, None)
 
     @classmethod
     def get(cls) -> Union[Dict, None]:
-        return getattr(flask.g, cls.key, None)
+        token = cls._read(cls.key)
+        loader = cls._read(cls.loader_key)
+        if token is None and loader is not None:
+            token = cls._load(loader)
+            if inspect.isawaitable(token):
+                token.close()
+                # sync views of an async app load the token without the loop.
+                sync_loader = cls._read(cls.sync_loader_key)
+                if sync_loader is None:
+                    raise RuntimeError("token is loaded asynchronously, use get_async")
+                token = cls._load(sync_loader)
+            cls.set(token)
+        return token
+
+    @classmethod
+    async def get_async(cls) -> Union[Dict, None]:
+        token = cls._read(cls.key)
+        loader = cls._read(cls.loader_key)
+        if token is None and loader is not None:
+            token = cls._load(loader)
+            if inspect.isawaitable(token):
+                token = await cls._load_async(token)
+            cls.set(token)
+        return token
+
+    @classmethod
+    def _load(cls, loader: Callable[[], Any]) -> Any:
+        try:
+            return loader()
+        except errors.FlaskJWTError as ex:
+            cls._write(cls.loader_key, functools.partial(_reraise, ex))
+            raise
+
+    @classmethod
+    async def _load_async(cls, pending: Awaitable[Dict]) -> Dict:
+        try:
+            return await pending
+        except errors.FlaskJWTError as ex:
+            cls._write(cls.loader_key, functools.partial(_reraise, ex))
+            raise
+
+    @classmethod
+    def peek(cls) -> Union[Dict, None]:
+        return cls._read(cls.key)
+
+    @classmethod
+    def defer(
+        cls,
+        loader: Callable[[], Any],
+        sync_loader: Optional[Callable[[], Dict]] = None,
+    ) -> None:
+        cls._write(cls.key, None)
+        cls._write(cls.loader_key, loader)
+        cls._write(cls.sync_loader_key, sync_loader)
+
+
+class _ContextStore(_Store):
+
+    # for apps without flask.g (quart style), each asyncio task gets its own
+    # copy of these.
+    variables = {
+        _Store.key: contextvars.ContextVar("jwt", default=None),
+        _Store.loader_key: contextvars.ContextVar("jwt_loader", default=None),
+        _Store.sync_loader_key: contextvars.ContextVar("jwt_sync", default=None),
+    }
+
+    @classmethod
+    def _read(cls, key: str) -> Any:
+        return cls.variables[key].get()
+
+    @classmethod
+    def _write(cls, key: str, value: Any) -> None:
+        cls.variables[key].set(value)
+
+
+# handlers unpickled in this process (as a pool worker) by their state's digest.
+_worker_handlers: Dict[bytes, "JWTHandler"] = {}
+
+
+def _in_worker(digest: bytes, state: bytes, method: str, *args: Any) -> List:
+    handler = _worker_handlers.get(digest, None)
+    if handler is None:
+        handler = _worker_handlers[digest] = pickle.loads(state)
+        while len(_worker_handlers) > 8:
+            del _worker_handlers[next(iter(_worker_handlers))]
+    return getattr(handler, method)(*args)
+
+
+def _now() -> float:
+    if flask.has_app_context():
+        handler = flask.current_app.extensions.get("flask_jwt", None)
+        if handler is not None:
+            return handler.clock()
+    return time.time()
+
+
+def _reraise(ex: Exception) -> Dict:
+    raise ex
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(items)
+    chunk = list(itertools.islice(iterator, size))
+    while chunk:
+        yield chunk
+        chunk = list(itertools.islice(iterator, size))
+
+
+class _RequestCache:
+
+    key = "jwt_cache"
+
+    @classmethod
+    def get(cls) -> Union[Dict, None]:
+        if not flask.has_request_context():
+            return None
+        # an app context (and so flask.g) can outlive a single request, so
+        # the cache remembers which request it was filled for.
+        request = flask.request._get_current_object()
+        owner, request_cache = getattr(flask.g, cls.key, (None, None))
+        if owner is not request:
+            request_cache = {}
+            setattr(flask.g, cls.key, (request, request_cache))
+        return request_cache
+
+
+_jws = jwt.PyJWS()
+_jwt = jwt.PyJWT()
+# exp, nbf and iat are checked by the validator, against the handler's clock
+# and leeway.
+_no_time_checks = {"verify_exp": False, "verify_nbf": False, "verify_iat": False}
 
 
 class _Coder:
 
     decode_error = errors.JWTDecodeError
+    signature_error = errors.JWTSignatureError
     encode_error = errors.JWTEncodeError
 
     @classmethod
@@ -32,15 +187,49 @@ class _Coder:
         algorithms: List[str],
         verify: bool = True,
         options: Optional[Dict] = None,
+        loads: Optional[Callable[[bytes], Any]] = None,
         **validate: Any,
     ) -> Dict:
         try:
-            return jwt.decode(
-                jwt_bytes, secret, verify, algorithms, options, **validate
+            if loads is None:
+                return jwt.decode(
+                    jwt_bytes, secret, verify, algorithms, options, **validate
+                )
+            return cls._decode_with(
+                jwt_bytes, secret, algorithms, verify, options, loads, validate
             )
+        except jwt.InvalidSignatureError as ex:
+            raise cls.signature_error(ex)
         except jwt.PyJWTError as ex:
             raise cls.decode_error(ex)
 
+    @staticmethod
+    def _decode_with(
+        jwt_bytes: bytes,
+        secret: str,
+        algorithms: List[str],
+        verify: bool,
+        options: Optional[Dict],
+        loads: Callable[[bytes], Any],
+        validate: Dict,
+    ) -> Dict:
+        # jwt.decode with the payload parsed by another json backend; pyjwt
+        # still checks the signature and the claims.
+        options = {"verify_signature": verify, **(options or {})}
+        payload_bytes = _jws.decode(
+            jwt_bytes, secret, algorithms=algorithms, options=options
+        )
+        try:
+            payload = loads(payload_bytes)
+        except ValueError as ex:
+            raise jwt.DecodeError(f"Invalid payload string: {ex}")
+        if not isinstance(payload, dict):
+            raise jwt.DecodeError("Invalid payload string: must be a json object")
+        if verify:
+            options = jwt.utils.merge_dict(_jwt.options, options)
+            _jwt._validate_claims(payload, options, **validate)
+        return payload
+
     @classmethod
     def encode(
         cls,
@@ -61,78 +250,344 @@ class JWTHandler:
     store = _Store
     coder = _Coder
     encoding: str = "utf8"
+    # attributes tied to this process, copies sent to pool workers go without.
+    local_state = ("revocation_list",)
 
     def __init__(
         self,
-        secret: str,
+        secret: Union[str, keys.KeySet, jwks.JWKSource],
         lifespan: int,
         algorithm: str = "HS256",
         issuer: Union[str, List[str]] = None,
         audience: Union[str, List[str]] = None,
         json_encoder: Optional[json.JSONEncoder] = None,
+        validator: Optional[validators.TokenValidator] = None,
+        revocation_list: Optional[revocation.RevocationList] = None,
+        metrics: Optional[instrumentation.Metrics] = None,
+        serializer: Union[str, serializers.Serializer] = "json",
+        clock: Optional[clocks.Clock] = None,
+        leeway: Union[float, Dict[str, float], clocks.Leeway, None] = None,
     ):
         self.secret = secret
+        if isinstance(secret, (keys.KeySet, jwks.JWKSource)):
+            self.keys = secret
+        else:
+            self.keys = keys.KeySet(keys.Key(secret, algorithm))
         self.lifespan = lifespan
         self.algorithm = algorithm
         self.issuer = issuer
         self.audience = audience
         self.json_encoder = json_encoder
+        self.serializer = serializers.get(serializer, json_encoder)
+        self.encoder = encoder.TokenEncoder(self.serializer)
+        self.validator = validator or validators.TokenValidator(
+            serializer=self.serializer
+        )
+        # the stdlib backend keeps to jwt.decode's own parsing.
+        self._loads = None
+        if not isinstance(self.serializer, serializers.JSONSerializer):
+            self._loads = self.serializer.loads
+        self.revocation_list = revocation_list
+        self.metrics = metrics or instrumentation.null
+        self.clock = clock or time.time
+        self.leeway = clocks.leeway(leeway)
 
     def encode(
         self, token: Dict, headers: Optional[Dict] = None, not_before=None
     ) -> str:
-        token["exp"] = time.time() + self.lifespan
+        with self.metrics.timer("encode"):
+            try:
+                return self._encode(token, headers, not_before)
+            except errors.FlaskJWTError as ex:
+                self.metrics.error(ex)
+                raise
+
+    def _encode(self, token: Dict, headers: Optional[Dict], not_before) -> str:
+        token["exp"] = self.clock() + self.lifespan
         if self.issuer and "iss" not in token:
             token["iss"] = self.issuer
         if self.audience and "aud" not in token:
             token["aud"] = self.audience
         if not_before and "nbf" not in token:
             token["nbf"] = not_before
-        token_bytes: bytes = self.coder.encode(
-            token, self.secret, self.algorithm, headers, self.json_encoder
-        )
-        return token_bytes.decode(self.encoding)
+        key = self.keys.signing_key
+        if key is None:
+            raise errors.JWTEncodeError("no signing key available")
+        if key.kid is not None:
+            headers = {**(headers or {}), "kid": key.kid}
+        return self.encoder.encode(token, key, headers).decode(self.encoding)
 
     def decode(
         self, jwt_string: str, verify: bool = True, options: Optional[Dict] = None
     ) -> Dict:
-        token_bytes: bytes = jwt_string.encode(self.encoding)
-        return self.coder.decode(
+        return self._decode(jwt_string.encode(self.encoding), verify, options)
+
+    def _decode(
+        self,
+        token_bytes: bytes,
+        verify: bool,
+        options: Optional[Dict],
+        headers: Optional[Dict] = None,
+    ) -> Dict:
+        with self.metrics.timer("decode"):
+            try:
+                return self._decode_verified(token_bytes, verify, options, headers)
+            except errors.FlaskJWTError as ex:
+                self.metrics.error(ex)
+                raise
+
+    def _decode_verified(
+        self,
+        token_bytes: bytes,
+        verify: bool,
+        options: Optional[Dict],
+        headers: Optional[Dict],
+    ) -> Dict:
+        if not verify:
+            return self.coder.decode(
+                token_bytes, "", self.keys.algorithms, verify, options, self._loads
+            )
+        now = self.clock()
+        key, _ = self.validator.validate(
             token_bytes,
-            self.secret,
-            [self.algorithm],
+            self.keys,
+            self.issuer,
+            self.audience,
+            options,
+            headers,
+            now,
+            self.leeway,
+        )
+        try:
+            decoded = self.coder.decode(
+                token_bytes,
+                key.verifying_key,
+                [key.algorithm],
+                verify,
+                {**(options or {}), **_no_time_checks},
+                self._loads,
+                issuer=self.issuer,
+                audience=self.audience,
+            )
+        except errors.JWTDecodeError:
+            self.validator.rejected["signature"] += 1
+            raise
+        if not self.validator.precheck_claims:
+            try:
+                self.validator.check_times(decoded, options or {}, now, self.leeway)
+            except errors.JWTClaimsError:
+                self.validator.rejected["claims"] += 1
+                raise
+        self._check_revoked(decoded)
+        return decoded
+
+    def _check_revoked(self, token: Dict) -> None:
+        jti = token.get("jti", None)
+        if self.revocation_list is not None and jti is not None:
+            if self.revocation_list.is_revoked(jti):
+                raise errors.JWTRevokedError("token has been revoked")
+
+    def revoke(self, token: Dict) -> None:
+        if self.revocation_list is None:
+            raise ValueError("handler has no revocation list")
+        if "jti" not in token:
+            raise ValueError("only tokens with a jti can be revoked")
+        self.revocation_list.revoke(token["jti"], token.get("exp", None))
+
+    def decode_many(
+        self,
+        jwt_strings: Iterable[str],
+        verify: bool = True,
+        options: Optional[Dict] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+        chunk_size: int = 64,
+        max_pending: int = 8,
+    ) -> Iterator[Union[Dict, errors.FlaskJWTError]]:
+        return self._batch(
+            self._decode_chunk,
+            jwt_strings,
+            executor,
+            chunk_size,
+            max_pending,
             verify,
             options,
-            issuer=self.issuer,
-            audience=self.audience,
         )
 
+    def encode_many(
+        self,
+        tokens: Iterable[Dict],
+        headers: Optional[Dict] = None,
+        executor: Optional[concurrent.futures.Executor] = None,
+        chunk_size: int = 64,
+        max_pending: int = 8,
+    ) -> Iterator[Union[str, errors.FlaskJWTError]]:
+        return self._batch(
+            self._encode_chunk, tokens, executor, chunk_size, max_pending, headers
+        )
+
+    def _decode_chunk(
+        self, jwt_strings: List[str], verify: bool, options: Optional[Dict]
+    ) -> List[Union[Dict, errors.FlaskJWTError]]:
+        # tokens from one issuer share their header, so it is only parsed and
+        # checked against the keyset once per chunk.
+        headers: Dict = {}
+        results = []
+        for jwt_string in jwt_strings:
+            try:
+                token_bytes = jwt_string.encode(self.encoding)
+                results.append(self._decode(token_bytes, verify, options, headers))
+            except errors.FlaskJWTError as ex:
+                results.append(ex)
+        return results
+
+    def _encode_chunk(
+        self, tokens: List[Dict], headers: Optional[Dict]
+    ) -> List[Union[str, errors.FlaskJWTError]]:
+        results = []
+        for token in tokens:
+            try:
+                results.append(self.encode(token, headers))
+            except errors.FlaskJWTError as ex:
+                results.append(ex)
+        return results
+
+    def _batch(
+        self,
+        func: Callable[..., List],
+        items: Iterable,
+        executor: Optional[concurrent.futures.Executor],
+        chunk_size: int,
+        max_pending: int,
+        *args: Any,
+    ) -> Iterator:
+        chunks = _chunked(items, chunk_size)
+        # hmac is faster than handing work to a pool, so only rsa/ec batches
+        # are spread over the executor.
+        if executor is None or self.keys.symmetric:
+            for chunk in chunks:
+                yield from func(chunk, *args)
+            return
+        pending: Deque[concurrent.futures.Future] = collections.deque()
+        remote = isinstance(executor, concurrent.futures.ProcessPoolExecutor)
+        submit = functools.partial(executor.submit, func)
+        if remote:
+            # each worker unpickles (and parses the keys of) a handler once
+            # and keeps it, chunks only carry its state to look it up by.
+            state = self._worker_state(signing=func == self._encode_chunk)
+            digest = hashlib.sha256(state).digest()
+            submit = functools.partial(
+                executor.submit, _in_worker, digest, state, func.__name__
+            )
+        for chunk in chunks:
+            pending.append(submit(chunk, *args))
+            if len(pending) >= max_pending:
+                results = pending.popleft().result()
+                yield from map(self._from_worker, results) if remote else results
+        while pending:
+            results = pending.popleft().result()
+            yield from map(self._from_worker, results) if remote else results
+
+    def __getstate__(self) -> Dict:
+        # a process pool worker gets the keys and settings, revocation checks
+        # and metrics stay with this handler (see _from_worker).
+        state = self.__dict__.copy()
+        for name in self.local_state:
+            state[name] = None
+        state["metrics"] = instrumentation.null
+        if isinstance(self.keys, jwks.JWKSource):
+            state["secret"] = state["keys"] = self.keys.keyset
+        return state
+
+    def _worker_state(self, signing: bool) -> bytes:
+        worker = copy.copy(self)
+        if not signing:
+            # verifying only needs the public keys, which load faster.
+            worker.keys = worker.secret = worker.keys.public()
+        return pickle.dumps(worker)
+
+    def _from_worker(self, result: Any) -> Any:
+        if isinstance(result, errors.FlaskJWTError):
+            self.metrics.error(result)
+        elif isinstance(result, dict):
+            try:
+                self._check_revoked(result)
+            except errors.JWTRevokedError as ex:
+                self.metrics.error(ex)
+                return ex
+        return result
+
     @classmethod
     def current_token(cls) -> Union[Dict, None]:
-        return cls.store.get()
+        return cls._active_store().get()
+
+    @classmethod
+    async def current_token_async(cls) -> Union[Dict, None]:
+        return await cls._active_store().get_async()
+
+    @classmethod
+    def _active_store(cls) -> Any:
+        # the module level helpers are bound to JWTHandler, the app's
+        # extension knows which store its tokens are kept in.
+        if flask.has_app_context():
+            handler = flask.current_app.extensions.get("flask_jwt", None)
+            if handler is not None:
+                return handler.store
+        return cls.store
 
     @classmethod
     def generate_token(cls, *scopes: str, **fields: Any) -> None:
-        fields["iat"] = time.time()
+        if fields.get("jti", None) is True:
+            fields["jti"] = uuid.uuid4().hex
+        fields["iat"] = _now()
         fields["scp"] = scopes
-        cls.store.set(fields)
+        cls._active_store().set(claims.Claims(fields))
 
 
 class FlaskJWT(JWTHandler):
 
     header_key = "Authorization"
     token_prefix = "Bearer "
+    # failures that stay failures on a retry. claims can become valid and
+    # unknown key ids can appear with a key rotation, those are not cached.
+    cached_rejections = (
+        errors.JWTStructureError,
+        errors.JWTSignatureError,
+        errors.JWTRevokedError,
+    )
+    local_state = JWTHandler.local_state + (
+        "token_cache",
+        "rejection_cache",
+        "tenants",
+        "policies",
+        "app",
+    )
 
     def __init__(
-        self, *args: Any, verify: bool = True, auto_update: bool = False, **kwargs: Any
+        self,
+        *args: Any,
+        verify: bool = True,
+        auto_update: bool = False,
+        token_cache: Optional[cache.TokenCache] = None,
+        rejection_cache: Optional[cache.RejectionCache] = None,
+        lazy: bool = False,
+        refresh_threshold: Optional[float] = None,
+        tenants: Optional[tenants.TenantRegistry] = None,
+        **kwargs: Any,
     ):
         super(FlaskJWT, self).__init__(*args, **kwargs)
         self.verify = verify
         self.auto_update = auto_update
+        self.token_cache = token_cache
+        self.rejection_cache = rejection_cache
+        self.lazy = lazy
+        self.refresh_threshold = refresh_threshold
+        self.tenants = tenants
+        self.policies = policies.PolicyRegistry()
         self.app = None
 
     def init_app(self, app: flask.Flask) -> None:
         self.app = app
+        self.app.extensions["flask_jwt"] = self
         self.app.before_request(self._pre_request_callback)
         self.app.after_request(self._post_request_callback)
 
@@ -143,21 +598,159 @@ class FlaskJWT(JWTHandler):
     def _handle_user_error(_: Exception):
         return "invalid token", 403
 
+    def _header_value(self) -> Optional[str]:
+        return flask.request.headers.get(self.header_key, None)
+
     def _pre_request_callback(self) -> None:
-        prefix = self.token_prefix
-        token_string = flask.request.headers.get(self.header_key, None)
+        with self.metrics.timer("pre_request"):
+            self._pre_request()
+
+    def _pre_request(self) -> None:
+        token_string = self._header_value()
         if token_string:
-            if not token_string.startswith(prefix) and len(token_string) > len(prefix):
-                raise errors.JWTValidationError("invalid bearer token")
-            token_string = token_string[len(prefix) :]
-            decoded = self.decode(token_string, self.verify)
-            self.store.set(decoded)
+            if self.lazy:
+                self.store.defer(functools.partial(self._load_token, token_string))
+            else:
+                self.store.set(self._load_token(token_string))
+        # the token is only loaded for endpoints with a policy, lazy mode
+        # still skips it everywhere else.
+        policy = self.policies.get(flask.request.endpoint) if self.policies else None
+        if policy is not None:
+            policies.enforce(policy, self.store.get())
+
+    def _load_token(self, token_string: str) -> Dict:
+        prefix = self.token_prefix
+        if not token_string.startswith(prefix) and len(token_string) > len(prefix):
+            error = errors.JWTValidationError("invalid bearer token")
+            self.metrics.error(error)
+            raise error
+        jwt_string = token_string[len(prefix) :]
+        return self._tenant(jwt_string)._verify_token(jwt_string)
+
+    def _tenant(self, jwt_string: str) -> "FlaskJWT":
+        # tokens that match no tenant are checked against this handler's own
+        # config, each tenant verifies with its own keys, caches and metrics.
+        if self.tenants is None:
+            return self
+        tenant = self.tenants.find(jwt_string)
+        return self if tenant is None else tenant
+
+    def _verify_token(self, token_string: str) -> claims.Claims:
+        if self.rejection_cache is None:
+            return self._verify(token_string)
+        # a client retrying a bad token is turned away without signature work.
+        now = self.clock()
+        rejected = self.rejection_cache.get(token_string, now)
+        if rejected is not None:
+            labels = {"type": type(rejected).__name__}
+            self.metrics.incr("rejection_cache_hits", labels=labels)
+            self.metrics.error(rejected)
+            raise rejected
+        try:
+            return self._verify(token_string)
+        except self.cached_rejections as ex:
+            self.rejection_cache.set(token_string, ex, now)
+            raise
+
+    def _verify(self, token_string: str) -> claims.Claims:
+        if self.token_cache is None or not self.verify:
+            return claims.Claims(self.decode(token_string, self.verify), token_string)
+        # claims are immutable, so one cached object serves every request.
+        now = self.clock()
+        token = self.token_cache.get(token_string, now)
+        if token is None:
+            token = claims.Claims(self.decode(token_string, self.verify), token_string)
+            self.token_cache.set(token_string, token, now, self.leeway)
+        else:
+            self._check_revoked(token)
+        return token
 
     def _post_request_callback(self, response: flask.Response) -> flask.Response:
+        with self.metrics.timer("post_request"):
+            return self._post_request(response)
+
+    def _post_request(self, response: flask.Response) -> flask.Response:
         prefix = self.token_prefix
         if self.auto_update:
-            token_dict = self.store.get()
+            # in lazy mode a token nobody asked for is never decoded, so
+            # there is nothing to re-issue.
+            token_dict = self.store.peek()
             if token_dict:
-                encoded = self.encode(token_dict)
+                encoded = self._owner(token_dict)._reissue(token_dict)
                 response.headers.set(self.header_key, f"{prefix}{encoded}")
         return response
+
+    def _owner(self, token: Dict) -> "FlaskJWT":
+        # the tenant that verified the token also signs its replacement.
+        if self.tenants is None:
+            return self
+        raw = getattr(token, "raw", None)
+        if raw is not None:
+            return self._tenant(raw)
+        tenant = self.tenants.get(issuer=token.get("iss", None))
+        return self if tenant is None else tenant
+
+    def _reissue(self, token: Dict) -> str:
+        # a token that was changed during the request has been replaced in
+        # the store, so only the loaded claims still carry their raw string.
+        raw = getattr(token, "raw", None)
+        if raw is None or self.refresh_threshold is None:
+            return self.encode(dict(token))
+        exp = token.get("exp", None)
+        if exp is None or exp - self.clock() < self.refresh_threshold:
+            return self.encode(dict(token))
+        return raw
+
+
+class AsyncFlaskJWT(FlaskJWT):
+
+    store = _ContextStore
+    local_state = FlaskJWT.local_state + ("executor",)
+
+    def __init__(
+        self,
+        *args: Any,
+        executor: Optional[concurrent.futures.Executor] = None,
+        **kwargs: Any,
+    ):
+        super(AsyncFlaskJWT, self).__init__(*args, **kwargs)
+        self.executor = executor
+
+    async def _pre_request_callback(self) -> None:
+        with self.metrics.timer("pre_request"):
+            await self._pre_request_async()
+
+    async def _pre_request_async(self) -> None:
+        token_string = self._header_value()
+        if not token_string:
+            self.store.set(None)
+        elif self.lazy:
+            self.store.defer(
+                functools.partial(self._load_token_async, token_string),
+                functools.partial(self._load_token, token_string),
+            )
+        else:
+            self.store.set(await self._load_token_async(token_string))
+        policy = self.policies.get(flask.request.endpoint) if self.policies else None
+        if policy is not None:
+            policies.enforce(policy, await self.store.get_async())
+
+    async def _post_request_callback(self, response: Any) -> Any:
+        with self.metrics.timer("post_request"):
+            return await self._run(self._post_request, response)
+
+    async def _load_token_async(self, token_string: str) -> Dict:
+        return await self._run(self._load_token, token_string)
+
+    async def _run(self, func: Callable, *args: Any) -> Any:
+        # hmac is cheap enough to run on the event loop, rsa/ec signatures
+        # are moved to the executor so they don't stall other requests.
+        if self.keys.symmetric and (self.tenants is None or self.tenants.symmetric):
+            return func(*args)
+        # already loaded by the running loop, only the lookup is paid here.
+        import asyncio
+
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(context.run, func, *args)
+        )
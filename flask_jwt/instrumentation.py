@@ -0,0 +1,134 @@
+from typing import Any, ContextManager, Dict, List, Optional, Tuple
+import collections
+import contextlib
+import socket
+import threading
+import time
+import flask
+
+Labels = Optional[Dict[str, str]]
+
+
+class Metrics:
+
+    enabled = False
+
+    def incr(self, name: str, value: int = 1, labels: Labels = None) -> None: ...
+
+    def timing(self, name: str, seconds: float, labels: Labels = None) -> None: ...
+
+    def timer(self, name: str, labels: Labels = None) -> ContextManager:
+        return _null_timer
+
+    def error(self, ex: Exception) -> None:
+        self.incr("errors", labels={"type": type(ex).__name__})
+
+
+class _Timer:
+    def __init__(self, metrics: Metrics, name: str, labels: Labels):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+        self.start = 0.0
+
+    def __enter__(self) -> "_Timer":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.metrics.timing(self.name, time.perf_counter() - self.start, self.labels)
+
+
+class _EnabledMetrics(Metrics):
+
+    enabled = True
+
+    def timer(self, name: str, labels: Labels = None) -> ContextManager:
+        return _Timer(self, name, labels)
+
+
+class InMemoryMetrics(_EnabledMetrics):
+    def __init__(self, prefix: str = "flask_jwt"):
+        self.prefix = prefix
+        self.counters: Dict[Tuple, int] = collections.Counter()
+        self.timings: Dict[Tuple, List[float]] = collections.defaultdict(
+            lambda: [0, 0.0]
+        )
+        self._lock = threading.Lock()
+
+    def incr(self, name: str, value: int = 1, labels: Labels = None) -> None:
+        with self._lock:
+            self.counters[_key(name, labels)] += value
+
+    def timing(self, name: str, seconds: float, labels: Labels = None) -> None:
+        with self._lock:
+            summary = self.timings[_key(name, labels)]
+            summary[0] += 1
+            summary[1] += seconds
+
+    def counter(self, name: str, **labels: str) -> int:
+        return self.counters.get(_key(name, labels), 0)
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for (name, labels), value in sorted(self.counters.items()):
+                lines.append(f"{self.prefix}_{name}_total{_labels(labels)} {value}")
+            for (name, labels), (count, total) in sorted(self.timings.items()):
+                metric = f"{self.prefix}_{name}_seconds"
+                lines.append(f"{metric}_count{_labels(labels)} {count}")
+                lines.append(f"{metric}_sum{_labels(labels)} {total}")
+        return "\n".join(lines) + "\n"
+
+
+class StatsDMetrics(_EnabledMetrics):
+    def __init__(
+        self, host: str = "127.0.0.1", port: int = 8125, prefix: str = "flask_jwt"
+    ):
+        self.address = (host, port)
+        self.prefix = prefix
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def incr(self, name: str, value: int = 1, labels: Labels = None) -> None:
+        self._send(f"{self.prefix}.{name}:{value}|c{_tags(labels)}")
+
+    def timing(self, name: str, seconds: float, labels: Labels = None) -> None:
+        self._send(f"{self.prefix}.{name}:{seconds * 1000:.3f}|ms{_tags(labels)}")
+
+    def _send(self, packet: str) -> None:
+        # metrics are best effort, a missing collector must not fail requests.
+        with contextlib.suppress(OSError):
+            self._socket.sendto(packet.encode("utf8"), self.address)
+
+
+def current() -> Metrics:
+    if flask.has_app_context():
+        handler = flask.current_app.extensions.get("flask_jwt", None)
+        if handler is not None:
+            return handler.metrics
+    return null
+
+
+def _key(name: str, labels: Labels) -> Tuple:
+    return name, tuple(sorted(labels.items())) if labels else ()
+
+
+def _labels(labels: Tuple) -> str:
+    if not labels:
+        return ""
+    pairs = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return f"{{{pairs}}}"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _tags(labels: Labels) -> str:
+    if not labels:
+        return ""
+    return "|#" + ",".join(f"{k}:{v}" for k, v in sorted(labels.items()))
+
+
+_null_timer = contextlib.nullcontext()
+null = Metrics()
@@ -0,0 +1,168 @@
+from typing import Callable, List, Optional
+import os
+import threading
+import time
+import weakref
+from . import clocks, errors, keys
+
+
+class JWKSource:
+    def __init__(
+        self,
+        location: str,
+        ttl: float = 300.0,
+        refresh_ahead: float = 30.0,
+        min_interval: float = 10.0,
+        timeout: float = 5.0,
+        fetch: Optional[Callable[[], bytes]] = None,
+        clock: clocks.Clock = time.monotonic,
+    ):
+        if ttl <= 0 or not 0 <= refresh_ahead < ttl or min_interval <= 0:
+            raise ValueError(
+                "JWKSource requires a ttl longer than refresh_ahead and a min_interval"
+            )
+        self.location = location
+        self.ttl = ttl
+        self.refresh_ahead = refresh_ahead
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.fetch = fetch or self._fetch
+        self.clock = clock
+        self.expires = 0.0
+        self.attempted = 0.0
+        self.last_error: Optional[Exception] = None
+        self._pending: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: Optional[threading.Event] = None
+        self._lock = threading.Lock()
+        # the first load is not caught, a bad location fails at startup.
+        self.keyset = self._load()
+        _sources.add(self)
+
+    def __len__(self) -> int:
+        return len(self.keyset)
+
+    def __contains__(self, kid: Optional[str]) -> bool:
+        return kid in self.keyset
+
+    @property
+    def algorithms(self) -> List[str]:
+        return self.keyset.algorithms
+
+    @property
+    def symmetric(self) -> bool:
+        return self.keyset.symmetric
+
+    @property
+    def kids(self) -> List[Optional[str]]:
+        return self.keyset.kids
+
+    @property
+    def signing_key(self) -> Optional[keys.Key]:
+        return self.keyset.signing_key
+
+    @property
+    def stale(self) -> bool:
+        return self.clock() >= self.expires
+
+    def get(self, kid: Optional[str] = None) -> keys.Key:
+        if self._thread is None:
+            self.start()
+        try:
+            return self.keyset.get(kid)
+        except errors.JWTDecodeError:
+            # a key the provider just rotated in, unless it was asked for
+            # too recently.
+            if kid is None or not self._refetch():
+                raise
+        return self.keyset.get(kid)
+
+    def refresh(self) -> bool:
+        # one fetch at a time, anyone asking during it waits for its result.
+        with self._lock:
+            pending = self._pending
+            owner = pending is None
+            if owner:
+                pending = self._pending = threading.Event()
+        if not owner:
+            pending.wait(self.timeout)
+            return self.last_error is None
+        try:
+            self.keyset = self._load()
+            self.last_error = None
+        except Exception as ex:
+            # stale keys keep being served until a refresh succeeds.
+            self.last_error = ex
+        finally:
+            with self._lock:
+                self._pending = None
+            pending.set()
+        return self.last_error is None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._stopped = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._refresh_loop, args=(self._stopped,), daemon=True
+                )
+                self._thread.start()
+
+    def stop(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if self._stopped is not None:
+                self._stopped.set()
+        if thread is not None:
+            thread.join()
+
+    def _refetch(self) -> bool:
+        if self._pending is None and self.clock() - self.attempted < self.min_interval:
+            return False
+        return self.refresh()
+
+    def _load(self) -> keys.KeySet:
+        self.attempted = self.clock()
+        keyset = keys.KeySet.from_jwks(self.fetch())
+        self.expires = self.clock() + self.ttl
+        return keyset
+
+    def _fetch(self) -> bytes:
+        if self.location.startswith(("http://", "https://")):
+            import urllib.request
+
+            # the scheme is checked above, file:// and other urllib schemes
+            # never get here.
+            with urllib.request.urlopen(  # nosec B310
+                self.location, timeout=self.timeout
+            ) as response:
+                return response.read()
+        with open(self.location, "rb") as jwks_file:
+            return jwks_file.read()
+
+    def _forked(self) -> None:
+        self._lock = threading.Lock()
+        self._pending = None
+        self._thread = None
+
+    def _refresh_loop(self, stopped: threading.Event) -> None:
+        # keys are refreshed before they expire, failures are retried every
+        # min_interval.
+        while True:
+            delay = self.expires - self.refresh_ahead - self.clock()
+            if stopped.wait(delay if delay > 0 else self.min_interval):
+                return
+            self.refresh()
+
+
+# one fork hook for every source, a dropped source is not kept alive by it.
+_sources: "weakref.WeakSet[JWKSource]" = weakref.WeakSet()
+
+
+def _forked() -> None:
+    for source in list(_sources):
+        source._forked()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forked)
@@ -0,0 +1,186 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+import hmac
+import json
+import jwt
+import jwt.algorithms
+import jwt.utils
+from . import errors
+
+_ALGORITHMS = jwt.algorithms.get_default_algorithms()
+_DEFAULT_ALGORITHMS = {"oct": "HS256", "RSA": "RS256", "EC": "ES256"}
+_CURVE_ALGORITHMS = {"P-256": "ES256", "P-384": "ES384", "P-521": "ES512"}
+
+
+class Key:
+    def __init__(self, key: Any, algorithm: str = "HS256", kid: Optional[str] = None):
+        if algorithm not in _ALGORITHMS or algorithm == "none":
+            raise ValueError(f"unsupported algorithm {algorithm}")
+        self.kid = kid
+        self.algorithm = algorithm
+        self._algorithm = _ALGORITHMS[algorithm]
+        self.signing_key = self._algorithm.prepare_key(key)
+        if hasattr(self.signing_key, "public_key"):
+            self.verifying_key = self.signing_key.public_key()
+        else:
+            self.verifying_key = self.signing_key
+        self.can_sign = isinstance(self.signing_key, bytes) or hasattr(
+            self.signing_key, "public_key"
+        )
+        self._mac = None
+        if isinstance(self.signing_key, bytes):
+            # keyed once, every signature then starts from a copy.
+            self._mac = hmac.new(self.signing_key, digestmod=self._algorithm.hash_alg)
+
+    def __reduce__(self) -> Tuple:
+        # key objects can't be pickled, so they are sent as pem and prepared
+        # again on the other side (for instance in a process pool).
+        return type(self), (_to_pem(self.signing_key), self.algorithm, self.kid)
+
+    def public(self) -> "Key":
+        # hmac keys and public keys verify with what they already hold.
+        if self.verifying_key is self.signing_key:
+            return self
+        return type(self)(self.verifying_key, self.algorithm, self.kid)
+
+    def sign(self, message: bytes) -> bytes:
+        if self._mac is not None:
+            mac = self._mac.copy()
+            mac.update(message)
+            return mac.digest()
+        return self._algorithm.sign(message, self.signing_key)
+
+    @classmethod
+    def from_jwk(
+        cls, jwk: Union[str, bytes, Dict], algorithm: Optional[str] = None
+    ) -> "Key":
+        obj: Dict = json.loads(jwk) if isinstance(jwk, (str, bytes)) else jwk
+        kty = obj.get("kty", None)
+        if kty == "oct":
+            key = jwt.utils.base64url_decode(obj["k"])
+        elif kty == "RSA":
+            key = _ALGORITHMS["RS256"].from_jwk(json.dumps(obj))
+        elif kty == "EC":
+            key = _ec_from_jwk(obj)
+        else:
+            raise ValueError(f"unsupported key type {kty}")
+        if algorithm is None:
+            algorithm = obj.get("alg", None) or _CURVE_ALGORITHMS.get(
+                obj.get("crv", None), _DEFAULT_ALGORITHMS[kty]
+            )
+        return cls(key, algorithm, obj.get("kid", None))
+
+
+class KeySet:
+    def __init__(self, *keys: Key, signing_kid: Optional[str] = None):
+        self._keys: Dict[Optional[str], Key] = {}
+        self._algorithms: List[str] = []
+        self.signing_key: Optional[Key] = None
+        for key in keys:
+            self.add(key)
+        if signing_kid is not None:
+            self.set_signing_key(signing_kid)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, kid: Optional[str]) -> bool:
+        return kid in self._keys
+
+    @property
+    def algorithms(self) -> List[str]:
+        return self._algorithms
+
+    @property
+    def symmetric(self) -> bool:
+        return all(algorithm.startswith("HS") for algorithm in self._algorithms)
+
+    @property
+    def kids(self) -> List[Optional[str]]:
+        return list(self._keys)
+
+    def add(self, key: Key, signing: bool = False) -> None:
+        self._keys[key.kid] = key
+        self._update_algorithms()
+        if signing or (self.signing_key is None and key.can_sign):
+            self.set_signing_key(key.kid)
+
+    def remove(self, kid: Optional[str]) -> None:
+        key = self._keys.pop(kid)
+        self._update_algorithms()
+        if key is self.signing_key:
+            self.signing_key = next(
+                (other for other in self._keys.values() if other.can_sign), None
+            )
+
+    def public(self) -> "KeySet":
+        return type(self)(*(key.public() for key in self._keys.values()))
+
+    def set_signing_key(self, kid: Optional[str]) -> None:
+        key = self._keys[kid]
+        if not key.can_sign:
+            raise ValueError(f"key {kid} can not be used for signing")
+        self.signing_key = key
+
+    def _update_algorithms(self) -> None:
+        self._algorithms = sorted({key.algorithm for key in self._keys.values()})
+
+    def get(self, kid: Optional[str] = None) -> Key:
+        key = self._keys.get(kid, None)
+        if key is None and len(self._keys) == 1:
+            only = next(iter(self._keys.values()))
+            if kid is None or only.kid is None:
+                key = only
+        if key is None:
+            raise errors.JWTDecodeError(f"unknown key id {kid}")
+        return key
+
+    @classmethod
+    def from_jwks(cls, jwks: Union[str, bytes, Dict], **kwargs: Any) -> "KeySet":
+        obj: Dict = json.loads(jwks) if isinstance(jwks, (str, bytes)) else jwks
+        return cls(*(Key.from_jwk(jwk) for jwk in obj.get("keys", [])), **kwargs)
+
+    @classmethod
+    def from_pem(
+        cls, pem: Union[str, bytes], algorithm: str, kid: Optional[str] = None
+    ) -> "KeySet":
+        return cls(Key(pem, algorithm, kid))
+
+
+def _ec_from_jwk(obj: Dict) -> Any:
+    from cryptography.hazmat.backends import default_backend
+    from cryptography.hazmat.primitives.asymmetric import ec
+
+    curves = {"P-256": ec.SECP256R1, "P-384": ec.SECP384R1, "P-521": ec.SECP521R1}
+    curve = curves.get(obj.get("crv", None), None)
+    if curve is None:
+        raise ValueError(f"unsupported curve {obj.get('crv', None)}")
+    public_numbers = ec.EllipticCurvePublicNumbers(
+        jwt.utils.from_base64url_uint(obj["x"]),
+        jwt.utils.from_base64url_uint(obj["y"]),
+        curve(),
+    )
+    if "d" in obj:
+        private_numbers = ec.EllipticCurvePrivateNumbers(
+            jwt.utils.from_base64url_uint(obj["d"]), public_numbers
+        )
+        return private_numbers.private_key(default_backend())
+    return public_numbers.public_key(default_backend())
+
+
+def _to_pem(key: Any) -> Union[bytes, str]:
+    if isinstance(key, bytes):
+        return key
+    from cryptography.hazmat.primitives import serialization
+
+    if hasattr(key, "private_bytes"):
+        pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    else:
+        pem = key.public_bytes(
+            serialization.Encoding.PEM,
+            serialization.PublicFormat.SubjectPublicKeyInfo,
+        )
+    return pem.decode("utf8")
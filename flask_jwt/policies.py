@@ -0,0 +1,83 @@
+from typing import Callable, Dict, Optional, Tuple, Union
+import flask
+from . import errors, instrumentation
+
+
+class PolicyRegistry:
+    def __init__(self):
+        self.app_rules: Tuple[Callable, ...] = ()
+        self.blueprint_rules: Dict[str, Tuple[Callable, ...]] = {}
+        self.endpoint_rules: Dict[str, Tuple[Callable, ...]] = {}
+        self._policies: Dict[Optional[str], Optional[Callable]] = {}
+
+    def __bool__(self) -> bool:
+        return bool(self.app_rules or self.blueprint_rules or self.endpoint_rules)
+
+    def protect_app(self, *rules: Callable) -> None:
+        self.app_rules += rules
+        self._policies.clear()
+
+    def protect_blueprint(
+        self, blueprint: Union[str, flask.Blueprint], *rules: Callable
+    ) -> None:
+        name = blueprint if isinstance(blueprint, str) else blueprint.name
+        self.blueprint_rules[name] = self.blueprint_rules.get(name, ()) + rules
+        self._policies.clear()
+
+    def protect_endpoint(self, endpoint: str, *rules: Callable) -> None:
+        self.endpoint_rules[endpoint] = self.endpoint_rules.get(endpoint, ()) + rules
+        self._policies.clear()
+
+    def get(self, endpoint: Optional[str]) -> Optional[Callable]:
+        # compiled on first use, later requests only pay for the lookup.
+        try:
+            return self._policies[endpoint]
+        except KeyError:
+            policy = self._policies[endpoint] = self._compile(endpoint)
+            return policy
+
+    def check(self, endpoint: Optional[str], token: Optional[Dict]) -> None:
+        policy = self.get(endpoint)
+        if policy is not None:
+            enforce(policy, token)
+
+    def _compile(self, endpoint: Optional[str]) -> Optional[Callable]:
+        if endpoint is None:
+            # unrouted requests (404s, 405s) are left to flask.
+            return None
+        collected = list(self.app_rules)
+        blueprints = endpoint.split(".")[:-1]
+        for index in range(1, len(blueprints) + 1):
+            name = ".".join(blueprints[:index])
+            collected.extend(self.blueprint_rules.get(name, ()))
+        collected.extend(self.endpoint_rules.get(endpoint, ()))
+        # compiler -> rules -> handlers -> policies, imported late so any of
+        # them can be the first one loaded.
+        from . import compiler
+
+        return compiler.compile_rules(*collected) if collected else None
+
+
+def enforce(predicate: Callable, token: Optional[Dict]) -> None:
+    metrics = instrumentation.current()
+    if not token:
+        error = errors.JWTValidationError(
+            "client did not supply a token in request header"
+        )
+    elif _evaluate(predicate, token, metrics):
+        return
+    else:
+        error = errors.JWTValidationError(
+            "one or more checks on the supplied jwt failed"
+        )
+    metrics.error(error)
+    raise error
+
+
+def _evaluate(
+    predicate: Callable, token: Dict, metrics: instrumentation.Metrics
+) -> bool:
+    if not metrics.enabled:
+        return predicate(token)
+    with metrics.timer("rules"):
+        return predicate.instrumented(metrics)(token)
@@ -0,0 +1,219 @@
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple, Union
+import hashlib
+import math
+import threading
+import time
+
+
+class BloomFilter:
+    def __init__(self, capacity: int = 10000, error_rate: float = 0.001):
+        if capacity < 1 or not 0 < error_rate < 1:
+            raise ValueError("BloomFilter requires a capacity and an error rate")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray(math.ceil(self.size / 8))
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+
+    def _positions(self, item: str) -> Iterator[int]:
+        # double hashing: k positions from the two halves of one digest.
+        digest = hashlib.blake2b(item.encode("utf8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hashes):
+            yield (first + index * second) % self.size
+
+
+class RevocationBackend:
+
+    # whether other processes can revoke through the same backend.
+    shared = False
+
+    def add(self, jti: str, exp: float) -> None:
+        raise NotImplementedError
+
+    def contains(self, jti: str) -> bool:
+        raise NotImplementedError
+
+    def prune(self, now: float) -> None:
+        raise NotImplementedError
+
+    def items(self) -> Iterable[Tuple[str, float]]:
+        raise NotImplementedError
+
+
+class MemoryBackend(RevocationBackend):
+    def __init__(self):
+        self._entries: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, jti: str, exp: float) -> None:
+        with self._lock:
+            self._entries[jti] = exp
+
+    def contains(self, jti: str) -> bool:
+        return jti in self._entries
+
+    def prune(self, now: float) -> None:
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if v >= now}
+
+    def items(self) -> Iterable[Tuple[str, float]]:
+        return list(self._entries.items())
+
+
+class SQLiteBackend(RevocationBackend):
+    def __init__(self, path: str = ":memory:"):
+        import sqlite3
+
+        self.shared = path != ":memory:"
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS revoked (jti TEXT PRIMARY KEY, exp REAL)"
+            )
+
+    def add(self, jti: str, exp: float) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO revoked (jti, exp) VALUES (?, ?)", (jti, exp)
+            )
+
+    def contains(self, jti: str) -> bool:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM revoked WHERE jti = ?", (jti,)
+            ).fetchone()
+        return row is not None
+
+    def prune(self, now: float) -> None:
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM revoked WHERE exp < ?", (now,))
+
+    def items(self) -> Iterable[Tuple[str, float]]:
+        with self._lock:
+            return self._connection.execute("SELECT jti, exp FROM revoked").fetchall()
+
+
+class RedisBackend(RevocationBackend):
+
+    shared = True
+
+    def __init__(self, client: Any, prefix: str = "flask_jwt:revoked:"):
+        self.client = client
+        self.prefix = prefix
+
+    def add(self, jti: str, exp: float) -> None:
+        if exp == math.inf:
+            self.client.set(f"{self.prefix}{jti}", exp)
+            return
+        ttl = exp - time.time()
+        if ttl > 0:
+            self.client.set(f"{self.prefix}{jti}", exp, ex=math.ceil(ttl))
+
+    def contains(self, jti: str) -> bool:
+        return bool(self.client.exists(f"{self.prefix}{jti}"))
+
+    def prune(self, now: float) -> None:
+        # entries are stored with a ttl, redis expires them itself.
+        ...
+
+    def items(self) -> Iterable[Tuple[str, float]]:
+        for key in self.client.scan_iter(match=f"{self.prefix}*"):
+            value = self.client.get(key)
+            if isinstance(key, bytes):
+                key = key.decode("utf8")
+            if value is not None:
+                yield key[len(self.prefix) :], float(value)
+
+
+class RevocationList:
+
+    # how often a filter over a shared backend picks up other processes' jtis
+    # when no reload_interval is given.
+    shared_reload_interval = 30.0
+
+    def __init__(
+        self,
+        backend: Optional[RevocationBackend] = None,
+        capacity: int = 10000,
+        error_rate: float = 0.001,
+        prune_interval: float = 60,
+        reload_interval: Optional[float] = None,
+    ):
+        self.backend = backend or MemoryBackend()
+        if reload_interval is None and self.backend.shared:
+            reload_interval = self.shared_reload_interval
+        self.filter = BloomFilter(capacity, error_rate)
+        self.prune_interval = prune_interval
+        self.reload_interval = reload_interval
+        self.checks = 0
+        self.lookups = 0
+        self._next_prune = time.time() + prune_interval
+        self._next_reload = math.inf
+        self._next_maintenance = math.inf
+        # a revoke during a reload would be lost when the filter is swapped.
+        self._lock = threading.RLock()
+        self.reload()
+
+    def revoke(self, jti: Union[str, int], exp: Optional[float] = None) -> None:
+        # jti is meant to be a string but nothing stops issuers using numbers.
+        jti = str(jti)
+        with self._lock:
+            self.backend.add(jti, math.inf if exp is None else float(exp))
+            self.filter.add(jti)
+        if time.time() >= self._next_prune:
+            self.prune()
+
+    def is_revoked(self, jti: Union[str, int]) -> bool:
+        jti = str(jti)
+        # pruning and reloading also happen when nothing is being revoked.
+        if time.time() >= self._next_maintenance:
+            self.maintain()
+        self.checks += 1
+        if jti not in self.filter:
+            return False
+        self.lookups += 1
+        return self.backend.contains(jti)
+
+    def maintain(self) -> None:
+        with self._lock:
+            now = time.time()
+            if now >= self._next_prune:
+                self.prune()
+            elif now >= self._next_reload:
+                self.reload()
+
+    def prune(self) -> None:
+        with self._lock:
+            now = time.time()
+            self.backend.prune(now)
+            self._next_prune = now + self.prune_interval
+            self.reload()
+
+    def reload(self) -> None:
+        # a bloom filter can't forget, so it is rebuilt from the backend; this
+        # also picks up jtis revoked by other processes sharing the backend.
+        with self._lock:
+            bloom = BloomFilter(self.filter.capacity, self.filter.error_rate)
+            for jti, _ in self.backend.items():
+                bloom.add(jti)
+            self.filter = bloom
+            if self.reload_interval is not None:
+                self._next_reload = time.time() + self.reload_interval
+            self._next_maintenance = min(self._next_prune, self._next_reload)
+
+    def stats(self) -> Dict[str, int]:
+        return {"checks": self.checks, "lookups": self.lookups}
@@ -1,71 +1,169 @@
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import functools
 import flask
-import jsonpointer
+from . import handlers, scopes as scope_registry
 
 
 class JWTRule:
+
+    cost: int = 5
+
     def __call__(self, token: Dict) -> bool:
         raise NotImplementedError
 
 
 class HasScopes(JWTRule):
-    def __init__(self, *scopes: str):
-        self.scopes = scopes
+
+    cost = 1
+
+    def __init__(
+        self, *scopes: str, registry: Optional[scope_registry.ScopeRegistry] = None
+    ):
+        self.scopes = frozenset(scopes)
+        self.registry = registry
+        self.mask = registry.mask(self.scopes) if registry is not None else 0
 
     def __call__(self, token: Dict) -> bool:
+        if self.registry is not None:
+            mask = self.mask
+            return self.registry.token_bitset(token) & mask == mask
         jwt_scopes: List[str] = token.get("scp", [])
-        return all(scope in jwt_scopes for scope in self.scopes)
+        return self.scopes.issubset(jwt_scopes)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, sorted(self.scopes)))})"
 
 
 class MatchValue(JWTRule):
-    def __init__(self, *paths):
-        self.matchers: List[(Callable, str)] = [
+
+    cost = 10
+    sources: Tuple[str, ...] = ("header", "json", "url", "param", "form", "jwt")
+    coercers: Dict[str, Callable[[Any], Any]] = {
+        "str": str,
+        "int": int,
+        "float": float,
+        "lower": lambda value: str(value).lower(),
+    }
+
+    def __init__(
+        self, *paths: str, coerce: Union[str, Callable[[Any], Any], None] = None
+    ):
+        self.paths = paths
+        self.matchers: List[Tuple[str, Callable, Tuple, Callable]] = [
             self._resolve_path(path) for path in paths
         ]
         if len(self.matchers) < 2:
             raise ValueError(f"MatchValue requires two or more paths")
+        if isinstance(coerce, str):
+            if coerce not in self.coercers:
+                raise ValueError(f"unknown coercer {coerce}")
+            coerce = self.coercers[coerce]
+        self.coerce = coerce
 
     def __call__(self, token: Dict) -> bool:
+        request_cache = handlers._RequestCache.get()
         return self._check_equal(
-            [matcher[0](matcher[1], token) for matcher in self.matchers]
+            [self._extract(*matcher, token, request_cache) for matcher in self.matchers]
         )
 
-    def _resolve_path(self, path) -> (Callable, str):
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, self.paths))})"
+
+    def _resolve_path(self, path: str) -> Tuple[str, Callable, Tuple, Callable]:
         object_name, pointer = path.split(":")
-        if not pointer.startswith("/"):
-            pointer = f"/{pointer}"
-        if object_name.startswith("_") or not hasattr(self, object_name):
+        if object_name not in self.sources:
             raise AttributeError(f"invalid match object {object_name}")
-        obj: Callable = getattr(self, object_name)
-        return obj, pointer
+        source: Callable = getattr(self, object_name)
+        # json pointer syntax, split and unescaped once instead of per request.
+        parts = tuple(
+            part.replace("~1", "/").replace("~0", "~")
+            for part in pointer.lstrip("/").split("/")
+        )
+        return object_name, source, parts, _accessor(parts)
 
     @staticmethod
-    def _check_equal(values: List[Any]) -> bool:
+    def _extract(
+        object_name: str,
+        source: Callable,
+        parts: Tuple,
+        accessor: Callable,
+        token: Dict,
+        request_cache: Optional[Dict],
+    ) -> Any:
+        # the token can be replaced during a request, so only values taken
+        # from the request itself are memoized.
+        if request_cache is None or object_name == "jwt":
+            return accessor(source(token))
+        key = ("match", object_name, parts)
+        if key not in request_cache:
+            request_cache[key] = accessor(source(token))
+        return request_cache[key]
+
+    def _check_equal(self, values: List[Any]) -> bool:
+        if any(value is _missing for value in values):
+            return False
+        if self.coerce is not None:
+            try:
+                values = [self.coerce(value) for value in values]
+            except (TypeError, ValueError):
+                return False
         return all(values[0] == rest for rest in values[1:])
 
     @staticmethod
-    def header(path: str, _: Any) -> Any:
-        return jsonpointer.resolve_pointer(flask.request.headers, path)
+    def header(_: Dict) -> Any:
+        return flask.request.headers
 
     @staticmethod
-    def json(path: str, _: Any) -> Any:
-        return jsonpointer.resolve_pointer(flask.request.json, path)
+    def json(_: Dict) -> Any:
+        return flask.request.json
 
     @staticmethod
-    def url(path: str, _: Any) -> Any:
-        return jsonpointer.resolve_pointer(flask.request.view_args, path)
+    def url(_: Dict) -> Any:
+        return flask.request.view_args
 
     @staticmethod
-    def param(path: str, _: Any) -> Any:
-        return jsonpointer.resolve_pointer(flask.request.args, path)
+    def param(_: Dict) -> Any:
+        return flask.request.args
 
     @staticmethod
-    def form(path: str, _: Any) -> Any:
-        return jsonpointer.resolve_pointer(flask.request.form, path)
+    def form(_: Dict) -> Any:
+        return flask.request.form
 
     @staticmethod
-    def jwt(path: str, token: Dict) -> Any:
-        return jsonpointer.resolve_pointer(token, path)
+    def jwt(token: Dict) -> Any:
+        return token
+
+
+_missing = object()
+
+
+def _accessor(parts: Tuple[str, ...]) -> Callable[[Any], Any]:
+    if len(parts) == 1:
+        key = parts[0]
+
+        def get(obj: Any) -> Any:
+            # headers, args and form are not dicts, but all have get().
+            try:
+                return obj.get(key, _missing)
+            except AttributeError:
+                return _walk(obj, parts)
+
+        return get
+    return functools.partial(_walk, parts=parts)
+
+
+def _walk(obj: Any, parts: Tuple[str, ...]) -> Any:
+    for part in parts:
+        try:
+            if not isinstance(obj, list):
+                obj = obj[part]
+            elif part.isdigit():
+                obj = obj[int(part)]
+            else:
+                return _missing
+        except (KeyError, IndexError, TypeError):
+            return _missing
+    return obj
 
 
 class _CollectionRule(JWTRule):
@@ -75,6 +173,9 @@ class _CollectionRule(JWTRule):
     def __call__(self, token: Dict) -> bool:
         raise NotImplementedError
 
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, self.rules))})"
+
 
 class AnyOf(_CollectionRule):
     def __call__(self, token: Dict) -> bool:
@@ -0,0 +1,78 @@
+from typing import Dict, Iterable
+import threading
+from . import handlers
+
+
+class ScopeRegistry:
+
+    cache_key = "scopes"
+
+    def __init__(self, *scopes: str, separator: str = ":", wildcard: str = "*"):
+        self.separator = separator
+        self.wildcard = wildcard
+        self.bits: Dict[str, int] = {}
+        self.prefixes: Dict[str, int] = {}
+        self.all = 0
+        self.version = 0
+        self._lock = threading.Lock()
+        for scope in scopes:
+            self.register(scope)
+
+    def __len__(self) -> int:
+        return len(self.bits)
+
+    def __contains__(self, scope: str) -> bool:
+        return scope in self.bits
+
+    def register(self, scope: str) -> int:
+        bit = self.bits.get(scope, None)
+        if bit is not None:
+            return bit
+        with self._lock:
+            if scope in self.bits:
+                return self.bits[scope]
+            bit = 1 << len(self.bits)
+            # every parent of orders:items:read gets the bit, so a wildcard
+            # like orders:* resolves with a single lookup.
+            parts = scope.split(self.separator)
+            for index in range(1, len(parts)):
+                prefix = self.separator.join(parts[:index]) + self.separator
+                self.prefixes[prefix] = self.prefixes.get(prefix, 0) | bit
+            self.all |= bit
+            self.bits[scope] = bit
+            self.version += 1
+        return bit
+
+    def mask(self, scopes: Iterable[str]) -> int:
+        mask = 0
+        for scope in scopes:
+            mask |= self.register(scope)
+        return mask
+
+    def bitset(self, scopes: Iterable[str]) -> int:
+        bits = self.bits
+        wildcard = self.wildcard
+        bitset = 0
+        for scope in scopes:
+            bit = bits.get(scope, None)
+            if bit is not None:
+                bitset |= bit
+            elif scope.endswith(wildcard):
+                prefix = scope[: -len(wildcard)]
+                bitset |= self.prefixes.get(prefix, 0) if prefix else self.all
+        return bitset
+
+    def token_bitset(self, token: Dict) -> int:
+        scopes = token.get("scp", [])
+        request_cache = handlers._RequestCache.get()
+        if request_cache is None:
+            return self.bitset(scopes)
+        # keyed on the scp object itself, so a replaced token (or new scopes
+        # registered mid request) builds a fresh bitset.
+        key = (self.cache_key, self)
+        entry = request_cache.get(key, None)
+        if entry is not None and entry[0] is scopes and entry[1] == self.version:
+            return entry[2]
+        bitset = self.bitset(scopes)
+        request_cache[key] = (scopes, self.version, bitset)
+        return bitset
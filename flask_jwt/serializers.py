@@ -0,0 +1,155 @@
+from typing import Any, Dict, Optional, Type, Union
+import json
+
+
+class Serializer:
+
+    name = ""
+
+    def __init__(self, json_encoder: Optional[Type[json.JSONEncoder]] = None):
+        self.json_encoder = json_encoder
+
+    @staticmethod
+    def available(json_encoder: Optional[Type[json.JSONEncoder]]) -> bool:
+        return True
+
+    def dumps(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        raise NotImplementedError
+
+
+class JSONSerializer(Serializer):
+
+    name = "json"
+
+    def __init__(self, json_encoder: Optional[Type[json.JSONEncoder]] = None):
+        super(JSONSerializer, self).__init__(json_encoder)
+        # pyjwt's settings, built once instead of on every json.dumps call.
+        encoder = json_encoder or json.JSONEncoder
+        self._encode = encoder(separators=(",", ":")).encode
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encode(obj).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data.decode("utf-8"))
+
+
+class OrjsonSerializer(Serializer):
+
+    name = "orjson"
+
+    def __init__(self, json_encoder: Optional[Type[json.JSONEncoder]] = None):
+        import orjson
+
+        super(OrjsonSerializer, self).__init__(json_encoder)
+        # datetimes and dataclasses are left to the encoder's default(), as
+        # the stdlib would do, instead of orjson's own formats.
+        self._options = (
+            orjson.OPT_NON_STR_KEYS
+            | orjson.OPT_PASSTHROUGH_DATETIME
+            | orjson.OPT_PASSTHROUGH_DATACLASS
+        )
+        self._default = json_encoder().default if json_encoder else None
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+        # orjson only handles 64 bit integers, it raises on larger ones when
+        # dumping and turns them into floats when loading. those payloads go
+        # through the stdlib instead.
+        self._fallback = JSONSerializer(json_encoder)
+
+    @staticmethod
+    def available(json_encoder: Optional[Type[json.JSONEncoder]]) -> bool:
+        return _importable("orjson") and _default_only(json_encoder)
+
+    def dumps(self, obj: Any) -> bytes:
+        try:
+            return self._dumps(obj, default=self._default, option=self._options)
+        except TypeError:
+            return self._fallback.dumps(obj)
+
+    def loads(self, data: bytes) -> Any:
+        if _long_number in data.translate(_digits):
+            return self._fallback.loads(data)
+        return self._loads(data)
+
+
+class UjsonSerializer(Serializer):
+
+    name = "ujson"
+
+    def __init__(self, json_encoder: Optional[Type[json.JSONEncoder]] = None):
+        import ujson
+
+        super(UjsonSerializer, self).__init__(json_encoder)
+        self._kwargs: Dict[str, Any] = {
+            "ensure_ascii": False,
+            "escape_forward_slashes": False,
+        }
+        if json_encoder is not None:
+            self._kwargs["default"] = json_encoder().default
+        self._dumps = ujson.dumps
+        self._loads = ujson.loads
+
+    @staticmethod
+    def available(json_encoder: Optional[Type[json.JSONEncoder]]) -> bool:
+        return _importable("ujson") and _default_only(json_encoder)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj, **self._kwargs).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return self._loads(data)
+
+
+backends: Dict[str, Type[Serializer]] = {
+    "json": JSONSerializer,
+    "orjson": OrjsonSerializer,
+    "ujson": UjsonSerializer,
+}
+
+preference = ("orjson", "ujson", "json")
+
+# 19 digits in a row may be an integer past 64 bits. digits are mapped to
+# "0" and everything else to " ", a regex search is ten times slower.
+_digits = bytes(ord("0") if chr(i) in "0123456789" else ord(" ") for i in range(256))
+_long_number = b"0" * 19
+
+
+def get(
+    backend: Union[str, Serializer] = "json",
+    json_encoder: Optional[Type[json.JSONEncoder]] = None,
+) -> Serializer:
+    if isinstance(backend, Serializer):
+        return backend
+    if backend == "auto":
+        names = preference
+    elif backend in backends:
+        names = (backend, "json")
+    else:
+        raise ValueError(f"unknown json backend {backend}")
+    for name in names:
+        if backends[name].available(json_encoder):
+            return backends[name](json_encoder)
+    return JSONSerializer(json_encoder)
+
+
+def _importable(module: str) -> bool:
+    try:
+        __import__(module)
+    except ImportError:
+        return False
+    return True
+
+
+def _default_only(json_encoder: Optional[Type[json.JSONEncoder]]) -> bool:
+    # other backends can call an encoder's default(), but not an overridden
+    # encode() or iterencode(), so those encoders stay on the stdlib.
+    if json_encoder is None:
+        return True
+    return (
+        json_encoder.encode is json.JSONEncoder.encode
+        and json_encoder.iterencode is json.JSONEncoder.iterencode
+    )
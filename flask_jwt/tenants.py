@@ -0,0 +1,110 @@
+from typing import Any, Dict, Iterator, List, Optional
+import binascii
+import json
+import threading
+import jwt.utils
+
+
+class TenantRegistry:
+    def __init__(self, *tenants: Any):
+        self.issuers: Dict[str, Any] = {}
+        self.kids: Dict[str, Any] = {}
+        self.symmetric = True
+        self._lock = threading.Lock()
+        for tenant in tenants:
+            self.add(tenant)
+
+    def __len__(self) -> int:
+        return len(self._tenants())
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._tenants())
+
+    def __contains__(self, tenant: Any) -> bool:
+        return any(tenant is other for other in self._tenants())
+
+    def add(self, tenant: Any) -> None:
+        issuers = _issuers(tenant)
+        kids = [kid for kid in getattr(tenant.keys, "kids", ()) if kid is not None]
+        if not issuers and not kids:
+            raise ValueError("a tenant needs an issuer or keys with a key id")
+        with self._lock:
+            # the indexes are replaced rather than changed, so requests read
+            # them without taking the lock. adding a tenant again re-indexes it.
+            issuer_index = _without(self.issuers, tenant)
+            kid_index = _without(self.kids, tenant)
+            for index, names, kind in (
+                (issuer_index, issuers, "issuer"),
+                (kid_index, kids, "key id"),
+            ):
+                for name in names:
+                    if name in index:
+                        raise ValueError(f"{kind} {name} belongs to another tenant")
+                    index[name] = tenant
+            self.issuers, self.kids = issuer_index, kid_index
+            self._update_symmetric()
+
+    def remove(self, tenant: Any) -> None:
+        with self._lock:
+            if tenant not in self:
+                raise KeyError("tenant is not registered")
+            self.issuers = _without(self.issuers, tenant)
+            self.kids = _without(self.kids, tenant)
+            self._update_symmetric()
+
+    def get(self, issuer: Any = None, kid: Any = None) -> Optional[Any]:
+        # a key id is more specific than the issuer, it's checked first.
+        if isinstance(kid, str):
+            tenant = self.kids.get(kid, None)
+            if tenant is not None:
+                return tenant
+        if isinstance(issuer, str):
+            return self.issuers.get(issuer, None)
+        return None
+
+    def find(self, jwt_string: str) -> Optional[Any]:
+        # nothing here is verified, it only picks the tenant whose keys will
+        # verify the token. malformed tokens are left to that handler.
+        segments = jwt_string.split(".")
+        if len(segments) != 3:
+            return None
+        if self.kids:
+            tenant = self.get(kid=_segment(segments[0]).get("kid", None))
+            if tenant is not None:
+                return tenant
+        if self.issuers:
+            return self.get(issuer=_segment(segments[1]).get("iss", None))
+        return None
+
+    def _update_symmetric(self) -> None:
+        # async apps only keep verification on the event loop when every
+        # tenant uses hmac.
+        self.symmetric = all(
+            getattr(tenant.keys, "symmetric", False) for tenant in self._tenants()
+        )
+
+    def _tenants(self) -> List[Any]:
+        tenants: Dict[int, Any] = {}
+        for index in (self.issuers, self.kids):
+            for tenant in index.values():
+                tenants.setdefault(id(tenant), tenant)
+        return list(tenants.values())
+
+
+def _issuers(tenant: Any) -> List[str]:
+    issuer = tenant.issuer
+    if not issuer:
+        return []
+    return [issuer] if isinstance(issuer, str) else list(issuer)
+
+
+def _without(index: Dict[str, Any], tenant: Any) -> Dict[str, Any]:
+    return {name: other for name, other in index.items() if other is not tenant}
+
+
+def _segment(segment: str) -> Dict:
+    try:
+        obj = json.loads(jwt.utils.base64url_decode(segment.encode("utf8")))
+    except (binascii.Error, UnicodeError, ValueError):
+        return {}
+    return obj if isinstance(obj, dict) else {}
@@ -0,0 +1,157 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+import binascii
+import collections
+import re
+import time
+import jwt.utils
+from . import clocks, errors, keys, serializers
+
+
+class TokenValidator:
+
+    stages = ("structure", "header", "claims", "signature")
+    segment_pattern = re.compile(rb"^[A-Za-z0-9_-]+$")
+
+    def __init__(
+        self,
+        max_size: Optional[int] = None,
+        precheck_claims: bool = True,
+        serializer: Optional[serializers.Serializer] = None,
+    ):
+        self.max_size = max_size
+        self.precheck_claims = precheck_claims
+        self.serializer = serializer or serializers.JSONSerializer()
+        self.rejected: Dict[str, int] = collections.Counter()
+
+    def validate(
+        self,
+        jwt_bytes: bytes,
+        keyset: keys.KeySet,
+        issuer: Union[str, List[str]] = None,
+        audience: Union[str, List[str]] = None,
+        options: Optional[Dict] = None,
+        headers: Optional[Dict[bytes, Tuple[keys.Key, Dict]]] = None,
+        now: Optional[float] = None,
+        leeway: clocks.Leeway = clocks.Leeway(),
+    ) -> Tuple[keys.Key, Dict]:
+        try:
+            segments = self.check_structure(jwt_bytes)
+            if headers is not None and segments[0] in headers:
+                key, header = headers[segments[0]]
+            else:
+                header = self.parse_segment(segments[0], errors.JWTHeaderError)
+                key = self.check_header(header, keyset)
+                if headers is not None:
+                    headers[segments[0]] = key, header
+            if self.precheck_claims:
+                payload = self.parse_segment(segments[1], errors.JWTClaimsError)
+                self.check_claims(payload, issuer, audience, options or {}, now, leeway)
+        except errors.JWTStructureError:
+            self.rejected["structure"] += 1
+            raise
+        except errors.JWTHeaderError:
+            self.rejected["header"] += 1
+            raise
+        except errors.JWTClaimsError:
+            self.rejected["claims"] += 1
+            raise
+        return key, header
+
+    def check_structure(self, jwt_bytes: bytes) -> List[bytes]:
+        # no limit by default, the handler signs tokens of any size itself.
+        if self.max_size is not None and len(jwt_bytes) > self.max_size:
+            raise errors.JWTStructureError("token exceeds the size limit")
+        segments = jwt_bytes.split(b".")
+        if len(segments) != 3:
+            raise errors.JWTStructureError("token must have three segments")
+        for segment in segments:
+            if len(segment) % 4 == 1 or not self.segment_pattern.match(segment):
+                raise errors.JWTStructureError("token segment is not base64url")
+        return segments
+
+    def parse_segment(self, segment: bytes, error: type) -> Dict:
+        try:
+            obj = self.serializer.loads(jwt.utils.base64url_decode(segment))
+        except (binascii.Error, ValueError) as ex:
+            raise error(ex)
+        if not isinstance(obj, dict):
+            raise error("token segment must be a json object")
+        return obj
+
+    @staticmethod
+    def check_header(header: Dict, keyset: keys.KeySet) -> keys.Key:
+        algorithm = header.get("alg", None)
+        kid = header.get("kid", None)
+        if kid is not None and not isinstance(kid, str):
+            raise errors.JWTHeaderError("key id must be a string")
+        # the key is looked up before the algorithm is checked, a JWKSource
+        # refetches unknown key ids and a rotated key can bring a new one.
+        try:
+            key = keyset.get(kid)
+        except errors.JWTDecodeError as ex:
+            raise errors.JWTHeaderError(ex)
+        if key.algorithm != algorithm:
+            if algorithm not in keyset.algorithms:
+                raise errors.JWTHeaderError(f"algorithm {algorithm} is not allowed")
+            raise errors.JWTHeaderError(f"algorithm {algorithm} does not match key")
+        return key
+
+    @staticmethod
+    def check_claims(
+        payload: Dict,
+        issuer: Union[str, List[str]],
+        audience: Union[str, List[str]],
+        options: Dict,
+        now: Optional[float] = None,
+        leeway: clocks.Leeway = clocks.Leeway(),
+    ) -> None:
+        TokenValidator.check_times(payload, options, now, leeway)
+        if options.get("verify_iss", True) and issuer is not None:
+            if payload.get("iss", None) != issuer:
+                raise errors.JWTClaimsError("invalid issuer")
+        if options.get("verify_aud", True) and not _audience_ok(payload, audience):
+            raise errors.JWTClaimsError("invalid audience")
+
+    @staticmethod
+    def check_times(
+        payload: Dict,
+        options: Dict,
+        now: Optional[float] = None,
+        leeway: clocks.Leeway = clocks.Leeway(),
+    ) -> None:
+        # pyjwt's time checks are turned off by the handlers, so these are
+        # the authoritative ones; the claims are compared as integers like
+        # pyjwt does.
+        now = int(time.time() if now is None else now)
+        if "exp" in payload and options.get("verify_exp", True):
+            if _int(payload["exp"], "exp") < now - leeway.exp:
+                raise errors.JWTClaimsError("token has expired")
+        if "nbf" in payload and options.get("verify_nbf", True):
+            if _int(payload["nbf"], "nbf") > now + leeway.nbf:
+                raise errors.JWTClaimsError("token is not yet valid")
+        if "iat" in payload and options.get("verify_iat", True):
+            iat = _int(payload["iat"], "iat")
+            if leeway.iat is not None and iat > now + leeway.iat:
+                raise errors.JWTClaimsError("token was issued in the future")
+
+
+def _int(value: Any, claim: str) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise errors.JWTClaimsError(f"{claim} claim must be an integer")
+
+
+def _audience_ok(payload: Dict, audience: Union[str, List[str]]) -> bool:
+    if "aud" not in payload:
+        return audience is None
+    if audience is None:
+        return False
+    claims = payload["aud"]
+    if isinstance(claims, str):
+        claims = [claims]
+    if not isinstance(claims, list):
+        return False
+    if isinstance(audience, str):
+        audience = [audience]
+    return any(aud in claims for aud in audience)
@@ -7,14 +7,19 @@ NAME = 'flask-jwt'
 VERSION = '0.0.0'
 REQUIRES = [
     'flask',
-    'pyjwt',
-    'jsonpointer'
+    'pyjwt'
 ]
+EXTRAS = {
+    'crypto': ['cryptography'],
+    'async': ['flask[async]'],
+    'orjson': ['orjson']
+}
 
 
 setuptools.setup(
     name=NAME,
     version=VERSION,
     install_requires=REQUIRES,
-    packages=setuptools.find_packages()
+    extras_require=EXTRAS,
+    packages=setuptools.find_packages(exclude=['benchmarks'])
 )
@@ -1,6 +1,9 @@
-from typing import Any, Dict, Callable
+from typing import Any, Dict, Callable, Optional
 import unittest.mock
-from flask_jwt import rules
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from flask_jwt import keys, rules
 
 
 patch_object = unittest.mock.patch.object
@@ -31,6 +34,9 @@ class MockStore:
     def set(self, obj: Dict) -> None:
         self.obj = obj
 
+    def peek(self) -> Dict:
+        return self.obj
+
 
 class MockRequest:
     def __init__(
@@ -50,3 +56,49 @@ class MockRequest:
 
 class FakeG:
     ...
+
+
+def coroutine(value: Any = None, error: Exception = None) -> Callable:
+    async def _coroutine(*_: Any, **__: Any) -> Any:
+        if error is not None:
+            raise error
+        return value
+
+    return _coroutine
+
+
+class MockRedis:
+    def __init__(self):
+        self.data = {}
+        self.expiry = {}
+
+    def set(self, name: str, value: Any, ex: int = None) -> None:
+        self.data[name.encode()] = str(value).encode()
+        self.expiry[name.encode()] = ex
+
+    def get(self, name: bytes) -> Any:
+        return self.data.get(name, None)
+
+    def exists(self, name: str) -> int:
+        return int(name.encode() in self.data)
+
+    def scan_iter(self, match: str) -> Any:
+        prefix = match.rstrip("*").encode()
+        return [key for key in self.data if key.startswith(prefix)]
+
+
+def rsa_pem() -> str:
+    key = rsa.generate_private_key(65537, 2048, default_backend())
+    return key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode("utf8")
+
+
+def ec_key() -> ec.EllipticCurvePrivateKey:
+    return ec.generate_private_key(ec.SECP256R1(), default_backend())
+
+
+def ec_keyset(kid: Optional[str] = None) -> keys.KeySet:
+    return keys.KeySet(keys.Key(ec_key(), "ES256", kid))
@@ -96,3 +96,73 @@ class MatchValueTest(unittest.TestCase):
         rule = flask_jwt.rules.MatchValue(*paths)
         with mocks.patch_object(flask, "request", mocks.MockRequest(form=form)):
             self.assertFalse(rule(token))
+
+    def test_memoizes_request_values(self):
+        app = flask.Flask(__name__)
+        token = {"uuid": "1234", "other": "1234"}
+        json = unittest.mock.Mock(return_value={"user": {"uuid": "1234"}})
+        with mocks.patch_object(flask_jwt.rules.MatchValue, "json", json):
+            rules = [
+                flask_jwt.rules.MatchValue("json:user/uuid", "jwt:uuid"),
+                flask_jwt.rules.MatchValue("json:user/uuid", "jwt:other"),
+            ]
+        with app.test_request_context("/"):
+            for rule in rules:
+                self.assertTrue(rule(token))
+        self.assertEqual(json.call_count, 1)
+
+    def test_missing_value(self):
+        rule = flask_jwt.rules.MatchValue("header:uuid", "jwt:uuid")
+        with mocks.patch_object(flask, "request", mocks.MockRequest()):
+            self.assertFalse(rule({"uuid": "1234"}))
+            self.assertFalse(rule({}))
+
+    def test_nested_pointer(self):
+        paths = "json:/users/1/a~1b", "jwt:sub"
+        json = {"users": [{}, {"a/b": "1234"}]}
+        rule = flask_jwt.rules.MatchValue(*paths)
+        with mocks.patch_object(flask, "request", mocks.MockRequest(json=json)):
+            self.assertTrue(rule({"sub": "1234"}))
+            self.assertFalse(rule({"sub": "4321"}))
+        for json in ({"users": {}}, {"users": ["x"]}, None, [1]):
+            with mocks.patch_object(flask, "request", mocks.MockRequest(json=json)):
+                self.assertFalse(rule({"sub": "1234"}))
+
+    def test_compiled_paths(self):
+        rule = flask_jwt.rules.MatchValue("url:id", "json:user/id")
+        self.assertEqual(
+            [matcher[2] for matcher in rule.matchers], [("id",), ("user", "id")]
+        )
+
+    def test_strict_types(self):
+        rule = flask_jwt.rules.MatchValue("url:id", "jwt:sub")
+        request = mocks.MockRequest(view_args={"id": "1234"})
+        with mocks.patch_object(flask, "request", request):
+            self.assertFalse(rule({"sub": 1234}))
+
+    def test_coerce(self):
+        request = mocks.MockRequest(view_args={"id": "1234"}, headers={"u": "ABC"})
+        with mocks.patch_object(flask, "request", request):
+            rule = flask_jwt.rules.MatchValue("url:id", "jwt:sub", coerce="int")
+            self.assertTrue(rule({"sub": 1234}))
+            self.assertFalse(rule({"sub": "nope"}))
+            rule = flask_jwt.rules.MatchValue("header:u", "jwt:u", coerce="lower")
+            self.assertTrue(rule({"u": "abc"}))
+            rule = flask_jwt.rules.MatchValue("url:id", "jwt:sub", coerce=str)
+            self.assertTrue(rule({"sub": 1234}))
+
+    def test_unknown_coercer(self):
+        paths = "url:id", "jwt:sub"
+        self.assertRaises(ValueError, flask_jwt.rules.MatchValue, *paths, coerce="x")
+
+    def test_custom_source(self):
+        class CookieMatch(flask_jwt.rules.MatchValue):
+            sources = flask_jwt.rules.MatchValue.sources + ("cookie",)
+
+            @staticmethod
+            def cookie(_):
+                return {"user": "1234"}
+
+        self.assertTrue(CookieMatch("cookie:user", "jwt:sub")({"sub": "1234"}))
+        paths = "cost:x", "jwt:sub"
+        self.assertRaises(AttributeError, flask_jwt.rules.MatchValue, *paths)
@@ -0,0 +1,161 @@
+import unittest
+import asyncio
+import concurrent.futures
+import flask
+import flask_jwt
+from . import mocks
+
+
+class AsyncProtectedTest(unittest.TestCase):
+    def test_async_view(self):
+        async def view():
+            return True
+
+        with mocks.patch_object(
+            flask_jwt.handlers.JWTHandler, "current_token_async", mocks.coroutine("t")
+        ):
+            protected = flask_jwt.decorators.JWTProtected(mocks.MockRule(True))(view)
+            self.assertTrue(asyncio.iscoroutinefunction(protected))
+            self.assertTrue(asyncio.run(protected()))
+
+    def test_async_view_fails(self):
+        async def view():
+            return True
+
+        with mocks.patch_object(
+            flask_jwt.handlers.JWTHandler, "current_token_async", mocks.coroutine("t")
+        ):
+            protected = flask_jwt.decorators.JWTProtected(mocks.MockRule(False))(view)
+            with self.assertRaises(flask_jwt.errors.JWTValidationError):
+                asyncio.run(protected())
+
+    def test_flask_async_view(self):
+        app = flask.Flask(__name__)
+        jwt = flask_jwt.FlaskJWT("secret", 60)
+        jwt.init_app(app)
+
+        async def view():
+            return "success"
+
+        app.add_url_rule("/", "view", flask_jwt.jwt_protected()(view))
+        client = app.test_client()
+        self.assertEqual(client.get("/").status_code, 403)
+        headers = {"Authorization": f"Bearer {jwt.encode({})}"}
+        self.assertEqual(client.get("/", headers=headers).status_code, 200)
+
+
+class ContextStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.store = flask_jwt.handlers._ContextStore
+
+    def test_isolated_per_task(self):
+        async def task(value):
+            self.store.set({"value": value})
+            await asyncio.sleep(0)
+            return self.store.get()["value"]
+
+        async def main():
+            return await asyncio.gather(task(1), task(2))
+
+        self.assertEqual(asyncio.run(main()), [1, 2])
+
+    def test_async_loader(self):
+        async def main():
+            self.store.defer(mocks.coroutine({"thing": True}))
+            self.assertRaises(RuntimeError, self.store.get)
+            self.store.defer(mocks.coroutine({"thing": True}))
+            token = await self.store.get_async()
+            return token, self.store.peek()
+
+        token, stored = asyncio.run(main())
+        self.assertEqual(token, {"thing": True})
+        self.assertIs(token, stored)
+
+    def test_async_loader_error(self):
+        error = flask_jwt.errors.JWTDecodeError("nope")
+
+        async def main():
+            self.store.defer(mocks.coroutine(error=error))
+            for _ in range(2):
+                with self.assertRaises(flask_jwt.errors.JWTDecodeError):
+                    await self.store.get_async()
+
+        asyncio.run(main())
+
+
+class AsyncFlaskJWTTest(unittest.TestCase):
+    def setUp(self):
+        self.executor = concurrent.futures.ThreadPoolExecutor(1)
+        self.app = flask.Flask(__name__)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def client(self, **kwargs):
+        jwt = flask_jwt.AsyncFlaskJWT(
+            mocks.ec_keyset(), 60, executor=self.executor, **kwargs
+        )
+        jwt.init_app(self.app)
+
+        async def view():
+            token = await flask_jwt.AsyncFlaskJWT.current_token_async()
+            return str(token["thing"])
+
+        self.app.add_url_rule("/", "view", flask_jwt.async_jwt_protected()(view))
+        self.app.add_url_rule("/public", "public", lambda: "public")
+        return jwt, self.app.test_client()
+
+    def test_eager(self):
+        jwt, client = self.client(auto_update=True)
+        headers = {"Authorization": f"Bearer {jwt.encode({'thing': True})}"}
+        response = client.get("/", headers=headers)
+        self.assertEqual(response.data, b"True")
+        self.assertIsNotNone(response.headers.get("Authorization"))
+        self.assertEqual(client.get("/").status_code, 403)
+
+    def test_lazy(self):
+        jwt, client = self.client(lazy=True)
+        headers = {"Authorization": "Bearer invalid"}
+        self.assertEqual(client.get("/public", headers=headers).status_code, 200)
+        self.assertEqual(client.get("/", headers=headers).status_code, 403)
+        headers = {"Authorization": f"Bearer {jwt.encode({'thing': False})}"}
+        self.assertEqual(client.get("/", headers=headers).data, b"False")
+
+    def test_public_names(self):
+        jwt = flask_jwt.AsyncFlaskJWT(
+            mocks.ec_keyset(), 60, executor=self.executor, auto_update=True
+        )
+        jwt.init_app(self.app)
+
+        async def view():
+            token = await flask_jwt.current_token_async()
+            return str(token["thing"] and flask_jwt.current_token()["thing"])
+
+        def login():
+            flask_jwt.generate_token(thing=True)
+            return "logged in"
+
+        self.app.add_url_rule("/", "view", flask_jwt.jwt_protected()(view))
+        self.app.add_url_rule("/login", "login", login)
+        client = self.app.test_client()
+        self.assertEqual(client.get("/").status_code, 403)
+        token = client.get("/login").headers.get("Authorization")
+        self.assertIsNotNone(token)
+        response = client.get("/", headers={"Authorization": token})
+        self.assertEqual(response.data, b"True")
+
+    def test_lazy_sync_view(self):
+        jwt = flask_jwt.AsyncFlaskJWT(
+            mocks.ec_keyset(), 60, executor=self.executor, lazy=True
+        )
+        jwt.init_app(self.app)
+
+        def view():
+            return str(flask_jwt.current_token()["thing"])
+
+        self.app.add_url_rule("/", "view", flask_jwt.jwt_protected()(view))
+        client = self.app.test_client()
+        headers = {"Authorization": f"Bearer {jwt.encode({'thing': True})}"}
+        self.assertEqual(client.get("/", headers=headers).data, b"True")
+        headers = {"Authorization": "Bearer invalid"}
+        self.assertEqual(client.get("/", headers=headers).status_code, 403)
@@ -0,0 +1,120 @@
+import unittest
+import unittest.mock
+import concurrent.futures
+import pickle
+import flask_jwt
+from . import mocks
+
+
+def ec_handler() -> flask_jwt.handlers.JWTHandler:
+    return flask_jwt.handlers.JWTHandler(mocks.ec_keyset("a"), 60)
+
+
+class BatchTest(unittest.TestCase):
+    def test_decode_many(self):
+        handler = flask_jwt.handlers.JWTHandler("secret", 60)
+        tokens = [handler.encode({"index": index}) for index in range(10)]
+        tokens.insert(3, "invalid")
+        results = list(handler.decode_many(tokens, chunk_size=4))
+        self.assertEqual(len(results), 11)
+        self.assertIsInstance(results[3], flask_jwt.errors.JWTStructureError)
+        del results[3]
+        self.assertEqual([result["index"] for result in results], list(range(10)))
+
+    def test_decode_many_parses_header_once(self):
+        handler = flask_jwt.handlers.JWTHandler("secret", 60)
+        tokens = [handler.encode({"index": index}) for index in range(5)]
+        check_header = unittest.mock.Mock(wraps=handler.validator.check_header)
+        with mocks.patch_object(handler.validator, "check_header", check_header):
+            self.assertEqual(len(list(handler.decode_many(tokens))), 5)
+        self.assertEqual(check_header.call_count, 1)
+
+    def test_decode_many_is_lazy(self):
+        handler = flask_jwt.handlers.JWTHandler("secret", 60)
+        token = handler.encode({})
+
+        def tokens():
+            while True:
+                yield token
+
+        results = handler.decode_many(tokens(), chunk_size=2)
+        self.assertEqual(next(results), next(results))
+
+    def test_encode_many(self):
+        handler = flask_jwt.handlers.JWTHandler("secret", 60)
+        encoded = list(handler.encode_many([{"index": 0}, {"index": 1}]))
+        self.assertEqual([handler.decode(e)["index"] for e in encoded], [0, 1])
+
+    def test_encode_many_errors(self):
+        handler = flask_jwt.handlers.JWTHandler("secret", 60)
+        (result,) = handler.encode_many([{}], headers={"kid": 1})
+        self.assertIsInstance(result, flask_jwt.errors.JWTEncodeError)
+
+    def test_thread_pool(self):
+        handler = ec_handler()
+        tokens = list(handler.encode_many({"index": i} for i in range(20)))
+        with concurrent.futures.ThreadPoolExecutor(2) as executor:
+            results = handler.decode_many(
+                tokens, executor=executor, chunk_size=3, max_pending=2
+            )
+            self.assertEqual([r["index"] for r in results], list(range(20)))
+
+    def test_process_pool(self):
+        handler = ec_handler()
+        with concurrent.futures.ProcessPoolExecutor(1) as executor:
+            tokens = list(
+                handler.encode_many(({"index": i} for i in range(4)), executor=executor)
+            )
+        self.assertEqual([handler.decode(t)["index"] for t in tokens], [0, 1, 2, 3])
+
+    def test_pickle_keys(self):
+        handler = ec_handler()
+        token = handler.encode({"thing": True})
+        copied = pickle.loads(pickle.dumps(handler))
+        self.assertTrue(copied.decode(token)["thing"])
+        self.assertTrue(handler.decode(copied.encode({"thing": True}))["thing"])
+
+    def test_worker_handler_built_once(self):
+        handler = ec_handler()
+        token = handler.encode({"thing": True})
+        state = handler._worker_state(signing=False)
+        workers = {}
+        with mocks.patch_object(flask_jwt.handlers, "_worker_handlers", workers):
+            built = []
+            for _ in range(2):
+                (result,) = flask_jwt.handlers._in_worker(
+                    b"digest", state, "_decode_chunk", [token], True, None
+                )
+                self.assertTrue(result["thing"])
+                built.append(workers[b"digest"])
+        self.assertIs(built[0], built[1])
+        worker = built[0]
+        self.assertIsNone(worker.keys.signing_key)
+
+    def test_process_pool_local_state(self):
+        handler = ec_handler()
+        handler.metrics = flask_jwt.InMemoryMetrics()
+        handler.revocation_list = flask_jwt.RevocationList()
+        tokens = [handler.encode({"jti": jti}) for jti in "ab"] + ["invalid"]
+        handler.revoke({"jti": "b"})
+        with concurrent.futures.ProcessPoolExecutor(1) as executor:
+            results = list(handler.decode_many(tokens, executor=executor))
+        self.assertEqual(results[0]["jti"], "a")
+        self.assertIsInstance(results[1], flask_jwt.errors.JWTRevokedError)
+        self.assertIsInstance(results[2], flask_jwt.errors.JWTStructureError)
+        self.assertEqual(handler.metrics.counter("errors", type="JWTRevokedError"), 1)
+        self.assertEqual(handler.metrics.counter("errors", type="JWTStructureError"), 1)
+
+    def test_pickle_local_state(self):
+        jwt = flask_jwt.AsyncFlaskJWT(
+            "secret",
+            60,
+            metrics=flask_jwt.StatsDMetrics(),
+            token_cache=flask_jwt.TokenCache(),
+            executor=concurrent.futures.ThreadPoolExecutor(1),
+        )
+        copied = pickle.loads(pickle.dumps(jwt))
+        self.assertIsNone(copied.token_cache)
+        self.assertIsNone(copied.executor)
+        self.assertEqual(copied.decode(jwt.encode({"thing": 1}))["thing"], 1)
+        jwt.executor.shutdown()
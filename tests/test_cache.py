@@ -0,0 +1,230 @@
+import unittest
+import unittest.mock
+import multiprocessing
+import os
+import time
+import flask_jwt
+
+
+class TokenCacheTest(unittest.TestCase):
+    def test_get_set(self):
+        cache = flask_jwt.cache.TokenCache()
+        token = {"thing": True, "exp": time.time() + 60}
+        cache.set("token", token)
+        cached = cache.get("token")
+        self.assertEqual(cached, token)
+        self.assertIsNot(cached, token)
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 0)
+
+    def test_miss(self):
+        cache = flask_jwt.cache.TokenCache()
+        self.assertIsNone(cache.get("token"))
+        self.assertEqual(cache.misses, 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = flask_jwt.cache.TokenCache(max_size=2)
+        exp = time.time() + 60
+        cache.set("a", {"exp": exp})
+        cache.set("b", {"exp": exp})
+        cache.get("a")
+        cache.set("c", {"exp": exp})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_expired(self):
+        cache = flask_jwt.cache.TokenCache()
+        cache.set("token", {"exp": time.time() - 1})
+        self.assertIsNone(cache.get("token"))
+        self.assertEqual(len(cache), 0)
+
+    def test_not_yet_valid(self):
+        cache = flask_jwt.cache.TokenCache()
+        cache.set("token", {"exp": time.time() + 60, "nbf": time.time() + 30})
+        self.assertIsNone(cache.get("token"))
+
+    def test_no_expiry(self):
+        cache = flask_jwt.cache.TokenCache()
+        cache.set("token", {"thing": True})
+        self.assertEqual(len(cache), 0)
+
+    def test_ttl(self):
+        cache = flask_jwt.cache.TokenCache(ttl=0)
+        cache.set("token", {"exp": time.time() + 60})
+        self.assertIsNone(cache.get("token"))
+
+    def test_invalid_size(self):
+        self.assertRaises(ValueError, flask_jwt.cache.TokenCache, 0)
+
+    def test_clear(self):
+        cache = flask_jwt.cache.TokenCache()
+        cache.set("token", {"exp": time.time() + 60})
+        cache.clear()
+        self.assertEqual(cache.stats(), {"hits": 0, "misses": 0, "size": 0})
+
+
+class RejectionCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = flask_jwt.RejectionCache(max_size=2, ttl=5)
+
+    def test_get_set(self):
+        self.assertIsNone(self.cache.get("bad", 100))
+        self.cache.set("bad", flask_jwt.errors.JWTSignatureError("nope"), 100)
+        error = self.cache.get("bad", 101)
+        self.assertIsInstance(error, flask_jwt.errors.JWTSignatureError)
+        self.assertEqual(str(error), "nope")
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_ttl(self):
+        self.cache.set("bad", flask_jwt.errors.JWTDecodeError("nope"), 100)
+        self.assertIsNone(self.cache.get("bad", 105))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_max_size(self):
+        for token in ("a", "b", "c"):
+            self.cache.set(token, flask_jwt.errors.JWTDecodeError(token))
+        self.assertIsNone(self.cache.get("a"))
+        self.assertIsNotNone(self.cache.get("c"))
+
+    def test_least_recently_used(self):
+        for token in ("a", "b"):
+            self.cache.set(token, flask_jwt.errors.JWTDecodeError(token))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.cache.set("c", flask_jwt.errors.JWTDecodeError("c"))
+        self.assertIsNone(self.cache.get("b"))
+        self.cache.set("a", flask_jwt.errors.JWTDecodeError("a"))
+        self.cache.set("d", flask_jwt.errors.JWTDecodeError("d"))
+        self.assertIsNotNone(self.cache.get("a"))
+        self.assertIsNone(self.cache.get("c"))
+
+    def test_top(self):
+        self.cache.set("a", flask_jwt.errors.JWTDecodeError("a"))
+        self.cache.set("b", flask_jwt.errors.JWTDecodeError("b"))
+        self.cache.get("b")
+        self.cache.get("b")
+        digest, hits, reason = self.cache.top(1)[0]
+        self.assertEqual(len(digest), 64)
+        self.assertEqual((hits, reason), (2, "JWTDecodeError: b"))
+
+    def test_flask_jwt(self):
+        metrics = flask_jwt.InMemoryMetrics()
+        flaskjwt = flask_jwt.FlaskJWT(
+            "secret", 60, rejection_cache=self.cache, metrics=metrics
+        )
+        token = flask_jwt.handlers.JWTHandler("other", 60).encode({})
+        with unittest.mock.patch.object(
+            flaskjwt.coder, "decode", wraps=flaskjwt.coder.decode
+        ) as decode:
+            for _ in range(3):
+                self.assertRaises(
+                    flask_jwt.errors.JWTSignatureError, flaskjwt._verify_token, token
+                )
+        self.assertEqual(decode.call_count, 1)
+        labels = {"type": "JWTSignatureError"}
+        self.assertEqual(metrics.counter("rejection_cache_hits", **labels), 2)
+        self.assertEqual(metrics.counter("errors", **labels), 3)
+
+    def test_flask_jwt_time_dependent(self):
+        clock = flask_jwt.clocks.FrozenClock()
+        keys = flask_jwt.KeySet(flask_jwt.Key("secret", kid="old"))
+        flaskjwt = flask_jwt.FlaskJWT(keys, 60, rejection_cache=self.cache, clock=clock)
+        token = flaskjwt.encode({"nbf": clock() + 10})
+        self.assertRaises(
+            flask_jwt.errors.JWTClaimsError, flaskjwt._verify_token, token
+        )
+        unknown_kid = flask_jwt.handlers.JWTHandler(
+            flask_jwt.KeySet(flask_jwt.Key("secret", kid="new")), 60
+        ).encode({})
+        self.assertRaises(
+            flask_jwt.errors.JWTHeaderError, flaskjwt._verify_token, unknown_kid
+        )
+        self.assertEqual(len(self.cache), 0)
+        clock.advance(10)
+        self.assertEqual(flaskjwt._verify_token(token)["nbf"], clock())
+
+
+def _set_in_child(shared, jwt_string, exp):
+    shared.set(jwt_string, {"sub": "child", "exp": exp})
+
+
+class SharedTokenCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.cache = flask_jwt.cache.SharedTokenCache(max_size=64, slot_size=256)
+        self.exp = time.time() + 60
+
+    def test_get_set(self):
+        token = {"thing": True, "exp": self.exp}
+        self.cache.set("token", token)
+        cached = self.cache.get("token")
+        self.assertEqual(cached, token)
+        self.assertIsInstance(cached, flask_jwt.Claims)
+        self.assertEqual(cached.raw, "token")
+        self.assertEqual(self.cache.stats(), {"hits": 1, "misses": 0, "size": 1})
+
+    def test_miss(self):
+        self.assertIsNone(self.cache.get("token"))
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_expired(self):
+        self.cache.set("token", {"exp": time.time() - 1})
+        self.assertIsNone(self.cache.get("token"))
+        self.cache.set("token", {"exp": self.exp}, now=time.time() - 120)
+        self.assertIsNotNone(self.cache.get("token"))
+        self.assertIsNone(self.cache.get("token", now=self.exp + 1))
+
+    def test_not_yet_valid(self):
+        self.cache.set("token", {"exp": self.exp, "nbf": time.time() + 30})
+        self.assertIsNone(self.cache.get("token"))
+
+    def test_too_large(self):
+        self.cache.set("token", {"exp": self.exp, "data": "x" * 256})
+        self.assertIsNone(self.cache.get("token"))
+
+    def test_bucket_evicts_first_to_expire(self):
+        cache = flask_jwt.cache.SharedTokenCache(max_size=2, ways=2, slot_size=256)
+        cache.set("a", {"exp": self.exp})
+        cache.set("b", {"exp": self.exp - 30})
+        cache.set("c", {"exp": self.exp})
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_replace(self):
+        self.cache.set("token", {"exp": self.exp, "v": 1})
+        self.cache.set("token", {"exp": self.exp, "v": 2})
+        self.assertEqual(self.cache.get("token")["v"], 2)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_torn_read_is_a_miss(self):
+        self.cache.set("token", {"exp": self.exp})
+        offsets = [
+            offset
+            for offset in range(0, self.cache.max_size * 256, 256)
+            if self.cache._read(offset)[3]
+        ]
+        flask_jwt.cache._sequence.pack_into(self.cache._buffer, offsets[0], 7)
+        self.assertIsNone(self.cache.get("token"))
+        self.cache.set("token", {"exp": self.exp})
+        self.assertIsNotNone(self.cache.get("token"))
+
+    def test_clear(self):
+        self.cache.set("token", {"exp": self.exp})
+        self.cache.clear()
+        self.assertEqual(len(self.cache), 0)
+        self.assertIsNone(self.cache.get("token"))
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, flask_jwt.cache.SharedTokenCache, 0)
+        self.assertRaises(ValueError, flask_jwt.cache.SharedTokenCache, slot_size=8)
+
+    @unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+    def test_shared_between_processes(self):
+        context = multiprocessing.get_context("fork")
+        child = context.Process(target=_set_in_child, args=(self.cache, "t", self.exp))
+        child.start()
+        child.join()
+        self.assertEqual(child.exitcode, 0)
+        self.assertEqual(self.cache.get("t")["sub"], "child")
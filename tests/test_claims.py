@@ -0,0 +1,70 @@
+import unittest
+import json
+import pickle
+import time
+import flask
+import jsonpointer
+import flask_jwt
+
+
+class ClaimsTest(unittest.TestCase):
+    def setUp(self):
+        self.source = {"sub": "1", "scp": ["a"], "name": "x", "exp": 10}
+        self.claims = flask_jwt.Claims(self.source, "raw")
+
+    def test_mapping(self):
+        self.assertEqual(self.claims, dict(self.source))
+        self.assertEqual(dict(self.source), self.claims)
+        self.assertEqual(self.claims["name"], "x")
+        self.assertEqual(self.claims.get("missing", 1), 1)
+        self.assertIn("sub", self.claims)
+        self.assertEqual(list(self.claims), ["sub", "scp", "name", "exp"])
+        self.assertEqual(len(self.claims), 4)
+        self.assertRaises(KeyError, lambda: self.claims["missing"])
+        self.assertEqual(json.loads(json.dumps(self.claims.copy())), self.source)
+
+    def test_json(self):
+        self.assertEqual(json.loads(json.dumps(self.claims)), self.source)
+        with flask.Flask(__name__).app_context():
+            self.assertEqual(flask.jsonify(self.claims).get_json(), self.source)
+        serializer = flask_jwt.serializers.get("auto")
+        self.assertEqual(serializer.loads(serializer.dumps(self.claims)), self.source)
+
+    def test_registered(self):
+        self.assertEqual(self.claims.sub, "1")
+        self.assertIs(self.claims.scp, self.source["scp"])
+        self.assertIsNone(self.claims.iss)
+        self.assertEqual(self.claims.raw, "raw")
+        self.assertFalse(hasattr(self.claims, "__dict__"))
+
+    def test_custom(self):
+        self.assertEqual(dict(self.claims.custom), {"name": "x"})
+        self.assertIs(self.claims.custom, self.claims.custom)
+        with self.assertRaises(TypeError):
+            self.claims.custom["a"] = 1
+
+    def test_immutable(self):
+        with self.assertRaises(flask_jwt.errors.JWTImmutableClaimsError):
+            self.claims["sub"] = "2"
+        for method in ("clear", "pop", "popitem", "setdefault", "update"):
+            self.assertRaises(TypeError, getattr(self.claims, method), "sub")
+        self.assertEqual(self.claims, self.source)
+        with self.assertRaises(AttributeError):
+            self.claims.sub = "2"
+        with self.assertRaises(AttributeError):
+            del self.claims.raw
+
+    def test_pickle(self):
+        copied = pickle.loads(pickle.dumps(self.claims))
+        self.assertEqual(copied, self.claims)
+        self.assertEqual(copied.raw, "raw")
+
+    def test_rules(self):
+        self.assertTrue(flask_jwt.HasScopes("a")(self.claims))
+        self.assertEqual(jsonpointer.resolve_pointer(self.claims, "/scp/0"), "a")
+
+    def test_cache_shares(self):
+        claims = flask_jwt.Claims({"exp": time.time() + 60})
+        cache = flask_jwt.TokenCache()
+        cache.set("token", claims)
+        self.assertIs(cache.get("token"), claims)
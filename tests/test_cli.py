@@ -0,0 +1,119 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+import flask_jwt
+from flask_jwt import cli
+from . import mocks
+
+
+def run(argv, stdin=""):
+    stdin = io.StringIO(stdin) if isinstance(stdin, str) else stdin
+    stdout, stderr = io.StringIO(), io.StringIO()
+    code = cli.main(argv, stdin, stdout, stderr)
+    records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+    return code, records, stderr.getvalue()
+
+
+class CLITest(unittest.TestCase):
+    def test_encode_verify(self):
+        claims = '{"sub": "1"}\n{"sub": "2", "scp": ["a"]}\n'
+        code, tokens, summary = run(
+            ["encode", "-s", "secret", "--issuer", "me"], claims
+        )
+        self.assertEqual(code, 0)
+        self.assertEqual([record["line"] for record in tokens], [1, 2])
+        self.assertIn("encode: 2 tokens, 0 errors", summary)
+        lines = "".join(f"{record['token']}\n" for record in tokens)
+        code, decoded, _ = run(["verify", "-s", "secret", "--issuer", "me"], lines)
+        self.assertEqual(code, 0)
+        self.assertEqual(decoded[1]["claims"]["scp"], ["a"])
+
+    def test_errors_keep_line_order(self):
+        token = flask_jwt.handlers.JWTHandler("secret", 60).encode({"sub": "1"})
+        lines = f"{token}\n\nnope\nBearer {token}\n"
+        code, records, summary = run(["verify", "-s", "secret"], lines)
+        self.assertEqual(code, 1)
+        self.assertEqual([record["line"] for record in records], [1, 3, 4])
+        self.assertEqual(records[1]["error"], "JWTStructureError")
+        self.assertEqual(records[2]["claims"]["sub"], "1")
+        self.assertIn("verify: 3 tokens, 1 errors", summary)
+
+    def test_invalid_claims(self):
+        code, records, _ = run(["encode", "-s", "secret"], 'nope\n[1]\n{"a": 1}\n')
+        self.assertEqual(code, 1)
+        self.assertEqual(
+            [record.get("error") for record in records][:2], ["JWTEncodeError"] * 2
+        )
+        self.assertIn("token", records[2])
+
+    def test_runs_of_invalid_claims(self):
+        in_flight = []
+
+        def lines():
+            for index in range(200):
+                yield '{"a": 1}\n' if index % 50 == 0 else "nope\n"
+                in_flight.append(len(results.pending))
+
+        handler = flask_jwt.handlers.JWTHandler("secret", 60)
+        results = cli._Results(io.StringIO(), "token")
+        results.consume(lines(), cli._claims, handler.encode_many, None, 64)
+        self.assertEqual((results.total, results.failed), (200, 196))
+        self.assertLessEqual(max(in_flight), 1)
+        numbers = [
+            json.loads(line)["line"] for line in results.stdout.getvalue().splitlines()
+        ]
+        self.assertEqual(numbers, list(range(1, 201)))
+
+    def test_decode_without_key(self):
+        token = flask_jwt.handlers.JWTHandler("secret", 60).encode({"sub": "1"})
+        for argv in (["decode"], ["decode", "-a", "RS256"]):
+            code, records, _ = run(argv, token)
+            self.assertEqual(code, 0)
+            self.assertEqual(records[0]["claims"]["sub"], "1")
+        code, records, _ = run(["verify", "-s", "wrong"], token)
+        self.assertEqual(records[0]["error"], "JWTSignatureError")
+
+    def test_key_file_and_workers(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "key.pem")
+            with open(path, "w") as key_file:
+                key_file.write(mocks.rsa_pem())
+            argv = ["-a", "RS256", "-k", path, "-w", "4", "--chunk-size", "2"]
+            claims = "".join(f'{{"sub": "{index}"}}\n' for index in range(9))
+            _, tokens, _ = run(["encode"] + argv, claims)
+            lines = "".join(f"{record['token']}\n" for record in tokens)
+            code, records, _ = run(["verify"] + argv, lines)
+        self.assertEqual(code, 0)
+        subs = [record["claims"]["sub"] for record in records]
+        self.assertEqual(subs, [str(index) for index in range(9)])
+
+    def test_files(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "claims.ndjson")
+            with open(path, "w") as claims_file:
+                claims_file.write('{"sub": "1"}\n')
+            code, records, _ = run(["encode", "-s", "secret", path, "-"], '{"a": 1}\n')
+        self.assertEqual(code, 0)
+        self.assertEqual(len(records), 2)
+
+    def test_missing_key_file(self):
+        code, _, message = run(["verify", "-k", "/nope/key.pem"])
+        self.assertEqual(code, 2)
+        self.assertIn("/nope/key.pem", message)
+
+    def test_streams(self):
+        stdout = io.StringIO()
+        token = flask_jwt.handlers.JWTHandler("secret", 60).encode({})
+
+        def lines():
+            for index in range(1000):
+                if index == 500:
+                    # results were written before the input was exhausted.
+                    self.assertGreater(len(stdout.getvalue().splitlines()), 400)
+                yield f"{token}\n"
+
+        code = cli.main(["verify", "-s", "secret"], lines(), stdout, io.StringIO())
+        self.assertEqual(code, 0)
+        self.assertEqual(len(stdout.getvalue().splitlines()), 1000)
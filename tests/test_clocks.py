@@ -0,0 +1,104 @@
+import unittest
+import flask
+import flask_jwt
+from . import mocks
+
+
+class ClockTest(unittest.TestCase):
+    def test_frozen(self):
+        clock = flask_jwt.clocks.FrozenClock(100)
+        self.assertEqual(clock(), 100)
+        clock.advance(5)
+        self.assertEqual(clock(), 105)
+
+    def test_leeway(self):
+        leeway = flask_jwt.clocks.leeway
+        self.assertEqual(leeway(None), (0, 0, None))
+        self.assertEqual(leeway(5), (5, 5, None))
+        self.assertEqual(leeway({"nbf": 2, "iat": 0}), (0, 2, 0))
+        self.assertRaises(TypeError, leeway, {"other": 1})
+
+
+class HandlerClockTest(unittest.TestCase):
+    def setUp(self):
+        self.clock = flask_jwt.clocks.FrozenClock(1000000)
+        self.handler = flask_jwt.handlers.JWTHandler(
+            "secret", 60, clock=self.clock, leeway={"exp": 10, "nbf": 5, "iat": 5}
+        )
+
+    def token(self, **claims):
+        return self.handler.encoder.encode(claims, self.handler.keys.signing_key)
+
+    def check(self, token, valid):
+        for precheck in (True, False):
+            self.handler.validator.precheck_claims = precheck
+            if valid:
+                self.handler.decode(token.decode())
+            else:
+                self.assertRaises(
+                    flask_jwt.errors.JWTDecodeError, self.handler.decode, token.decode()
+                )
+
+    def test_encode(self):
+        token = {}
+        self.handler.encode(token)
+        self.assertEqual(token["exp"], 1000060)
+
+    def test_exp(self):
+        self.check(self.token(exp=999995), True)
+        self.check(self.token(exp=999989), False)
+        self.check(self.token(exp="soon"), False)
+
+    def test_nbf(self):
+        self.check(self.token(nbf=1000005), True)
+        self.check(self.token(nbf=1000006), False)
+
+    def test_iat(self):
+        self.check(self.token(iat=1000005), True)
+        self.check(self.token(iat=1000006), False)
+        self.check(self.token(iat="now"), False)
+
+    def test_iat_not_checked_by_default(self):
+        self.handler.leeway = flask_jwt.clocks.leeway(10)
+        self.check(self.token(iat=2000000), True)
+
+    def test_options(self):
+        token = self.token(exp=1).decode()
+        self.handler.decode(token, options={"verify_exp": False})
+
+    def test_token_cache(self):
+        flaskjwt = flask_jwt.FlaskJWT(
+            "secret",
+            60,
+            clock=self.clock,
+            leeway=10,
+            token_cache=flask_jwt.TokenCache(),
+        )
+        token = self.token(exp=1000001).decode()
+        self.assertEqual(flaskjwt._verify_token(token)["exp"], 1000001)
+        self.clock.advance(10)
+        self.assertIs(flaskjwt._verify_token(token), flaskjwt._verify_token(token))
+        self.clock.advance(2)
+        self.assertRaises(
+            flask_jwt.errors.JWTDecodeError, flaskjwt._verify_token, token
+        )
+
+    def test_refresh(self):
+        flaskjwt = flask_jwt.FlaskJWT(
+            "secret", 60, clock=self.clock, refresh_threshold=30
+        )
+        raw = self.token(exp=1000040).decode()
+        token = flaskjwt._load_token(f"Bearer {raw}")
+        self.assertEqual(flaskjwt._reissue(token), raw)
+        self.clock.advance(20)
+        self.assertNotEqual(flaskjwt._reissue(token), raw)
+
+    def test_generate_token(self):
+        app = flask.Flask(__name__)
+        flask_jwt.FlaskJWT("secret", 60, clock=self.clock).init_app(app)
+        mock_store = mocks.MockStore()
+        with app.app_context(), mocks.patch_object(
+            flask_jwt.FlaskJWT, "store", mock_store
+        ):
+            flask_jwt.FlaskJWT.generate_token("a")
+        self.assertEqual(mock_store.obj["iat"], 1000000)
@@ -0,0 +1,72 @@
+import unittest
+import flask_jwt
+from . import mocks
+
+
+class CompiledRuleTest(unittest.TestCase):
+    def test_all(self):
+        rule = flask_jwt.compiler.compile_rules(mocks.MockRule(True), lambda _: True)
+        self.assertTrue(rule({}))
+        self.assertIsNone(rule.explain({}))
+
+    def test_empty(self):
+        self.assertTrue(flask_jwt.compiler.compile_rules()({}))
+
+    def test_fails(self):
+        failing = mocks.MockRule(False)
+        rule = flask_jwt.compiler.compile_rules(mocks.MockRule(True), failing)
+        self.assertFalse(rule({}))
+        self.assertIs(rule.explain({}), failing)
+
+    def test_flattens(self):
+        a, b, c = mocks.MockRule(True), mocks.MockRule(True), mocks.MockRule(True)
+        rule = flask_jwt.compiler.compile_rules(
+            flask_jwt.rules.AllOf(a, flask_jwt.rules.AllOf(b)), c
+        )
+        self.assertEqual(rule.root.kind, "all")
+        self.assertEqual(rule.flatten(), [a, b, c])
+
+    def test_orders_by_cost(self):
+        match = flask_jwt.rules.MatchValue("jwt:a", "jwt:b")
+        scopes = flask_jwt.rules.HasScopes("a")
+        rule = flask_jwt.compiler.compile_rules(match, scopes)
+        self.assertEqual(rule.flatten(), [scopes, match])
+
+    def test_merges_scopes(self):
+        has_a, has_b = flask_jwt.rules.HasScopes("a"), flask_jwt.rules.HasScopes("b")
+        rule = flask_jwt.compiler.compile_rules(has_a, has_b)
+        (merged,) = rule.flatten()
+        self.assertEqual(merged.scopes, frozenset(("a", "b")))
+        self.assertTrue(rule({"scp": ["a", "b"]}))
+        self.assertIs(rule.explain({"scp": ["a"]}), has_b)
+        self.assertIs(rule.explain({"scp": ["b"]}), has_a)
+
+    def test_any_of(self):
+        any_of = flask_jwt.rules.AnyOf(mocks.MockRule(False), mocks.MockRule(False))
+        rule = flask_jwt.compiler.compile_rules(any_of)
+        self.assertFalse(rule({}))
+        self.assertIs(rule.explain({}), any_of)
+        any_of.rules[0].return_value = True
+        self.assertTrue(rule({}))
+
+    def test_none_of(self):
+        passing = mocks.MockRule(True)
+        rule = flask_jwt.compiler.compile_rules(
+            flask_jwt.rules.NoneOf(mocks.MockRule(False), passing)
+        )
+        self.assertFalse(rule({}))
+        self.assertIs(rule.explain({}), passing)
+        passing.return_value = False
+        self.assertTrue(rule({}))
+        self.assertIsNone(rule.explain({}))
+
+    def test_nested_compiled(self):
+        inner = flask_jwt.compiler.compile_rules(mocks.MockRule(False))
+        rule = flask_jwt.compiler.compile_rules(inner, mocks.MockRule(True))
+        self.assertFalse(rule({}))
+
+    def test_repr(self):
+        rule = flask_jwt.compiler.compile_rules(
+            flask_jwt.rules.AnyOf(flask_jwt.rules.HasScopes("b", "a"))
+        )
+        self.assertEqual(repr(rule), "CompiledRule(AnyOf(HasScopes('a', 'b')))")
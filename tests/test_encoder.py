@@ -0,0 +1,103 @@
+import unittest
+import datetime
+import json
+import jwt
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+import flask_jwt
+
+
+class DateEncoder(json.JSONEncoder):
+    def default(self, o):
+        if isinstance(o, datetime.date):
+            return o.isoformat()
+        return super(DateEncoder, self).default(o)
+
+
+class TokenEncoderTest(unittest.TestCase):
+    def setUp(self):
+        self.encoder = flask_jwt.encoder.TokenEncoder()
+        self.payload = {"sub": "user", "scp": ["a", "b"], "name": "é", "exp": 1}
+
+    def test_hmac_identical(self):
+        for algorithm in ("HS256", "HS384", "HS512"):
+            key = flask_jwt.Key("secret", algorithm)
+            self.assertEqual(
+                self.encoder.encode(dict(self.payload), key),
+                jwt.encode(dict(self.payload), "secret", algorithm),
+            )
+
+    def test_rsa_identical(self):
+        private = rsa.generate_private_key(65537, 2048, default_backend())
+        key = flask_jwt.Key(private, "RS256", "a")
+        headers = {"kid": "a", "cty": "x"}
+        self.assertEqual(
+            self.encoder.encode(dict(self.payload), key, headers),
+            jwt.encode(dict(self.payload), private, "RS256", headers),
+        )
+
+    def test_json_encoder(self):
+        serializer = flask_jwt.serializers.JSONSerializer(DateEncoder)
+        encoder = flask_jwt.encoder.TokenEncoder(serializer)
+        payload = {"day": datetime.date(2020, 1, 2)}
+        key = flask_jwt.Key("secret")
+        self.assertEqual(
+            encoder.encode(dict(payload), key),
+            jwt.encode(dict(payload), "secret", json_encoder=DateEncoder),
+        )
+
+    def test_datetime_claims(self):
+        payload = {"exp": datetime.datetime(2030, 1, 1)}
+        encoded = self.encoder.encode(dict(payload), flask_jwt.Key("secret"))
+        self.assertEqual(encoded, jwt.encode(payload, "secret"))
+        self.assertEqual(payload, {"exp": 1893456000})
+
+    def test_header_cache(self):
+        first = self.encoder.header_segment("HS256", {"kid": "a"})
+        self.assertIs(first, self.encoder.header_segment("HS256", {"kid": "a"}))
+        self.assertNotEqual(first, self.encoder.header_segment("HS256", {"kid": "b"}))
+        self.assertEqual(len(self.encoder._headers), 2)
+
+    def test_header_value_types(self):
+        segments = {
+            self.encoder.header_segment("HS256", {"x": value})
+            for value in (1, True, 1.0)
+        }
+        self.assertEqual(len(segments), 3)
+
+    def test_header_unhashable(self):
+        key = flask_jwt.Key("secret")
+        headers = {"crit": ["exp"]}
+        self.assertEqual(
+            self.encoder.encode({}, key, headers),
+            jwt.encode({}, "secret", headers=headers),
+        )
+        self.assertEqual(len(self.encoder._headers), 0)
+
+    def test_invalid_kid(self):
+        self.assertRaises(
+            flask_jwt.errors.JWTEncodeError,
+            self.encoder.encode,
+            {},
+            flask_jwt.Key("secret"),
+            {"kid": 1},
+        )
+
+    def test_unserializable(self):
+        for serializer in ("json", "auto"):
+            encoder = flask_jwt.encoder.TokenEncoder(
+                flask_jwt.serializers.get(serializer)
+            )
+            with self.assertRaises(flask_jwt.errors.JWTEncodeError):
+                encoder.encode({"scopes": {"a"}}, flask_jwt.Key("secret"))
+
+
+class HandlerEncodeTest(unittest.TestCase):
+    def test_identical(self):
+        handler = flask_jwt.handlers.JWTHandler(
+            "secret", 60, issuer="me", audience=["you"]
+        )
+        token = {"iat": 1, "aud": "them"}
+        encoded = handler.encode(token, not_before=5)
+        self.assertEqual(list(token), ["iat", "aud", "exp", "iss", "nbf"])
+        self.assertEqual(encoded, jwt.encode(token, "secret").decode("utf8"))
@@ -1,4 +1,6 @@
 import unittest
+import unittest.mock
+import time
 import jwt
 import flask
 import flask_jwt
@@ -50,3 +52,136 @@ class FlaskJWTTest(unittest.TestCase):
             self.flaskjwt._post_request_callback(response)
             auth = response.headers.get("Authorization")
             self.assertIsNotNone(auth)
+
+    def test_token_cache(self):
+        token_body = {"thing": True, "exp": int(time.time()) + 60}
+        token = jwt.encode(token_body, "secret").decode("utf8")
+        self.flaskjwt.token_cache = flask_jwt.cache.TokenCache()
+        mock_store = mocks.MockStore()
+        mock_request = mocks.MockRequest(headers={"Authorization": f"Bearer {token}"})
+        with mocks.patch_object(flask, "request", mock_request), mocks.patch_object(
+            flask_jwt.handlers.FlaskJWT, "store", mock_store
+        ):
+            self.flaskjwt._pre_request_callback()
+            self.flaskjwt._pre_request_callback()
+            with mocks.patch_object(
+                jwt, "decode", mocks.raise_error(jwt.InvalidSignatureError)
+            ):
+                self.flaskjwt._pre_request_callback()
+            self.assertEqual(mock_store.obj, token_body)
+            self.assertEqual(self.flaskjwt.token_cache.hits, 2)
+            self.assertEqual(self.flaskjwt.token_cache.misses, 1)
+
+    def test_shared_token_cache(self):
+        token_body = {"thing": True, "exp": int(time.time()) + 60}
+        token = jwt.encode(token_body, "secret").decode("utf8")
+        self.flaskjwt.token_cache = flask_jwt.cache.SharedTokenCache(max_size=8)
+        mock_store = mocks.MockStore()
+        mock_request = mocks.MockRequest(headers={"Authorization": f"Bearer {token}"})
+        with mocks.patch_object(flask, "request", mock_request), mocks.patch_object(
+            flask_jwt.handlers.FlaskJWT, "store", mock_store
+        ):
+            self.flaskjwt._pre_request_callback()
+            self.flaskjwt._pre_request_callback()
+            self.assertEqual(mock_store.obj, token_body)
+            self.assertEqual(mock_store.obj.raw, token)
+            self.assertEqual(self.flaskjwt.token_cache.hits, 1)
+
+
+class LazyFlaskJWTTest(unittest.TestCase):
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+        self.flaskjwt = flask_jwt.handlers.FlaskJWT("secret", 60, lazy=True)
+        self.flaskjwt.init_app(self.app)
+        self.app.add_url_rule("/public", "public", lambda: "public")
+        self.app.add_url_rule(
+            "/protected",
+            "protected",
+            flask_jwt.decorators.JWTProtected()(lambda: "protected"),
+        )
+        self.app.add_url_rule(
+            "/twice",
+            "twice",
+            lambda: str(
+                flask_jwt.current_token() is flask_jwt.current_token() is not None
+            ),
+        )
+        self.client = self.app.test_client()
+
+    def get(self, path: str, token: str):
+        return self.client.get(path, headers={"Authorization": f"Bearer {token}"})
+
+    def test_public_not_decoded(self):
+        with mocks.patch_object(self.flaskjwt, "decode", mocks.raise_error(KeyError)):
+            self.assertEqual(self.get("/public", "invalid").status_code, 200)
+
+    def test_protected_decoded(self):
+        self.assertEqual(self.get("/protected", "invalid").status_code, 403)
+        token = self.flaskjwt.encode({"thing": True})
+        self.assertEqual(self.get("/protected", token).status_code, 200)
+
+    def test_memoized(self):
+        token = self.flaskjwt.encode({"thing": True})
+        decode = unittest.mock.Mock(return_value={"thing": True})
+        with mocks.patch_object(self.flaskjwt, "decode", decode):
+            response = self.get("/twice", token)
+        self.assertEqual(response.data, b"True")
+        self.assertEqual(decode.call_count, 1)
+
+    def test_error_memoized(self):
+        with self.app.test_request_context("/"):
+            loader = unittest.mock.Mock(
+                side_effect=flask_jwt.errors.JWTDecodeError("nope")
+            )
+            flask_jwt.handlers._Store.defer(loader)
+            for _ in range(2):
+                self.assertRaises(
+                    flask_jwt.errors.JWTDecodeError, flask_jwt.current_token
+                )
+            self.assertEqual(loader.call_count, 1)
+
+
+class RefreshPolicyTest(unittest.TestCase):
+    def setUp(self):
+        self.flaskjwt = flask_jwt.handlers.FlaskJWT(
+            "secret", 60, auto_update=True, refresh_threshold=30
+        )
+
+    def reissue(self, token: dict) -> str:
+        with mocks.patch_object(
+            flask_jwt.handlers.FlaskJWT, "store", mocks.MockStore(token)
+        ):
+            response = self.flaskjwt._post_request_callback(flask.Response(200))
+        return response.headers.get("Authorization")[len("Bearer ") :]
+
+    def loaded(self, lifespan: int) -> dict:
+        raw = jwt.encode({"exp": int(time.time()) + lifespan}, "secret").decode()
+        return self.flaskjwt._load_token(f"Bearer {raw}")
+
+    def test_unchanged(self):
+        token = self.loaded(60)
+        self.assertEqual(self.reissue(token), token.raw)
+
+    def test_replaced(self):
+        token = self.loaded(60)
+        self.assertNotEqual(self.reissue({**token, "thing": True}), token.raw)
+
+    def test_immutable(self):
+        token = self.loaded(60)
+        with self.assertRaises(flask_jwt.errors.JWTImmutableClaimsError):
+            token["thing"] = True
+        for method in ("update", "pop", "setdefault", "popitem", "clear"):
+            self.assertRaises(TypeError, getattr(token, method), "thing")
+        self.assertEqual(self.reissue(token), token.raw)
+
+    def test_expiring(self):
+        token = self.loaded(10)
+        self.assertNotEqual(self.reissue(token), token.raw)
+
+    def test_generated(self):
+        self.assertIsNotNone(self.reissue({"thing": True}))
+
+    def test_no_threshold(self):
+        self.flaskjwt.refresh_threshold = None
+        token = self.loaded(60)
+        self.assertNotEqual(self.reissue(token), token.raw)
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+import unittest
+import flask_jwt
+
+
+def loaded_after(statement: str) -> set:
+    # a fresh interpreter, the test run has already imported everything.
+    script = f"import sys; {statement}; print(' '.join(sys.modules))"
+    output = subprocess.run(
+        [sys.executable, "-c", script], check=True, stdout=subprocess.PIPE
+    )
+    return set(output.stdout.decode("utf8").split())
+
+
+class LazyExportsTest(unittest.TestCase):
+    def test_exports(self):
+        self.assertIs(flask_jwt.FlaskJWT, flask_jwt.handlers.FlaskJWT)
+        self.assertIs(flask_jwt.jwt_protected, flask_jwt.decorators.JWTProtected)
+        self.assertEqual(
+            flask_jwt.generate_token, flask_jwt.handlers.JWTHandler.generate_token
+        )
+
+    def test_all_resolve(self):
+        for name in flask_jwt.__all__:
+            self.assertIsNotNone(getattr(flask_jwt, name))
+
+    def test_dir(self):
+        names = dir(flask_jwt)
+        self.assertIn("KeySet", names)
+        self.assertIn("serializers", names)
+
+    def test_unknown(self):
+        self.assertRaises(AttributeError, getattr, flask_jwt, "nope")
+        with self.assertRaises(ImportError):
+            from flask_jwt import nope
+
+    def test_import_is_lazy(self):
+        loaded = loaded_after("import flask_jwt")
+        self.assertFalse({"flask", "jwt", "flask_jwt.handlers"} & loaded)
+
+    def test_keys_without_flask(self):
+        loaded = loaded_after("from flask_jwt import KeySet")
+        self.assertIn("flask_jwt.keys", loaded)
+        self.assertNotIn("flask", loaded)
+
+    def test_rules_without_jsonpointer(self):
+        loaded = loaded_after("from flask_jwt import FlaskJWT, HasScopes")
+        self.assertIn("flask_jwt.rules", loaded)
+        self.assertFalse({"jsonpointer", "asyncio"} & loaded)
+
+    def test_any_module_first(self):
+        # rules, compiler, policies and handlers import each other.
+        for module in ("rules", "compiler", "policies", "scopes", "decorators"):
+            self.assertIn(
+                f"flask_jwt.{module}", loaded_after(f"import flask_jwt.{module}")
+            )
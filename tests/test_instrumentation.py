@@ -0,0 +1,128 @@
+import unittest
+import socket
+import flask
+import flask_jwt
+from . import mocks
+
+
+class NullMetricsTest(unittest.TestCase):
+    def test_disabled(self):
+        metrics = flask_jwt.instrumentation.null
+        self.assertFalse(metrics.enabled)
+        with metrics.timer("decode"):
+            metrics.incr("errors")
+        metrics.error(ValueError())
+
+    def test_current_outside_app(self):
+        self.assertIs(
+            flask_jwt.instrumentation.current(), flask_jwt.instrumentation.null
+        )
+
+
+class InMemoryMetricsTest(unittest.TestCase):
+    def test_counters(self):
+        metrics = flask_jwt.InMemoryMetrics()
+        metrics.incr("errors", labels={"type": "JWTDecodeError"})
+        metrics.error(flask_jwt.errors.JWTDecodeError())
+        self.assertEqual(metrics.counter("errors", type="JWTDecodeError"), 2)
+        self.assertEqual(metrics.counter("errors", type="JWTEncodeError"), 0)
+
+    def test_timings(self):
+        metrics = flask_jwt.InMemoryMetrics()
+        with metrics.timer("decode"):
+            ...
+        metrics.timing("decode", 0.5)
+        count, total = metrics.timings[("decode", ())]
+        self.assertEqual(count, 2)
+        self.assertGreaterEqual(total, 0.5)
+
+    def test_render_prometheus(self):
+        metrics = flask_jwt.InMemoryMetrics()
+        metrics.incr("errors", labels={"type": 'a"b'})
+        metrics.timing("rule", 0.25, {"rule": "HasScopes('a')"})
+        lines = metrics.render_prometheus().splitlines()
+        self.assertIn('flask_jwt_errors_total{type="a\\"b"} 1', lines)
+        self.assertIn("flask_jwt_rule_seconds_count{rule=\"HasScopes('a')\"} 1", lines)
+        self.assertIn("flask_jwt_rule_seconds_sum{rule=\"HasScopes('a')\"} 0.25", lines)
+
+
+class StatsDMetricsTest(unittest.TestCase):
+    def test_packets(self):
+        server = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server.bind(("127.0.0.1", 0))
+        server.settimeout(1)
+        metrics = flask_jwt.StatsDMetrics(*server.getsockname())
+        try:
+            metrics.incr("errors", labels={"type": "JWTDecodeError"})
+            self.assertEqual(
+                server.recv(1024), b"flask_jwt.errors:1|c|#type:JWTDecodeError"
+            )
+            metrics.timing("decode", 0.002)
+            self.assertEqual(server.recv(1024), b"flask_jwt.decode:2.000|ms")
+        finally:
+            server.close()
+
+
+class HandlerMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.metrics = flask_jwt.InMemoryMetrics()
+        self.handler = flask_jwt.handlers.JWTHandler("secret", 60, metrics=self.metrics)
+
+    def test_decode(self):
+        self.handler.decode(self.handler.encode({"a": 1}))
+        self.assertEqual(self.metrics.timings[("encode", ())][0], 1)
+        self.assertEqual(self.metrics.timings[("decode", ())][0], 1)
+
+    def test_decode_errors(self):
+        token = flask_jwt.handlers.JWTHandler("other", 60).encode({})
+        for bad in ("not-a-token", token):
+            self.assertRaises(flask_jwt.errors.JWTDecodeError, self.handler.decode, bad)
+        self.assertEqual(self.metrics.counter("errors", type="JWTStructureError"), 1)
+        self.assertEqual(self.metrics.counter("errors", type="JWTSignatureError"), 1)
+
+    def test_encode_errors(self):
+        self.handler.keys = flask_jwt.KeySet()
+        self.assertRaises(flask_jwt.errors.JWTEncodeError, self.handler.encode, {})
+        self.assertEqual(self.metrics.counter("errors", type="JWTEncodeError"), 1)
+
+
+class FlaskMetricsTest(unittest.TestCase):
+    def setUp(self):
+        self.metrics = flask_jwt.InMemoryMetrics()
+        self.app = flask.Flask(__name__)
+        self.flaskjwt = flask_jwt.FlaskJWT(
+            "secret", 60, auto_update=True, metrics=self.metrics
+        )
+        self.flaskjwt.init_app(self.app)
+
+        @self.app.route("/")
+        @flask_jwt.jwt_protected(flask_jwt.HasScopes("a"), mocks.MockRule(True))
+        def index():
+            return "ok"
+
+        self.client = self.app.test_client()
+
+    def request(self, *scopes):
+        with self.app.test_request_context():
+            token = self.flaskjwt.encode({"scp": list(scopes)})
+        return self.client.get("/", headers={"Authorization": f"Bearer {token}"})
+
+    def test_phases(self):
+        self.assertEqual(self.request("a").status_code, 200)
+        for phase in ("pre_request", "decode", "rules", "post_request", "encode"):
+            self.assertIn((phase, ()), self.metrics.timings)
+        rules = [labels for name, labels in self.metrics.timings if name == "rule"]
+        self.assertEqual(
+            sorted(rules), [(("rule", "HasScopes('a')"),), (("rule", "MockRule"),)]
+        )
+
+    def test_validation_error(self):
+        self.assertEqual(self.request("b").status_code, 403)
+        self.assertEqual(self.metrics.counter("errors", type="JWTValidationError"), 1)
+
+    def test_instrumented_cached(self):
+        predicate = flask_jwt.compile_rules(flask_jwt.HasScopes("a"))
+        self.assertIs(
+            predicate.instrumented(self.metrics), predicate.instrumented(self.metrics)
+        )
+        self.assertTrue(predicate.instrumented(self.metrics)({"scp": ["a"]}))
@@ -0,0 +1,170 @@
+import gc
+import http.server
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+import weakref
+import flask_jwt
+
+
+def jwks(*kids: str) -> bytes:
+    keys = [{"kty": "oct", "k": "c2VjcmV0", "alg": "HS256", "kid": kid} for kid in kids]
+    return json.dumps({"keys": keys}).encode("utf8")
+
+
+class Provider:
+    def __init__(self, *kids: str):
+        self.document = jwks(*kids)
+        self.calls = 0
+        self.error = None
+        self.delay = 0.0
+
+    def __call__(self) -> bytes:
+        self.calls += 1
+        time.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return self.document
+
+
+class JWKSourceTest(unittest.TestCase):
+    def setUp(self):
+        self.provider = Provider("a")
+        self.clock = flask_jwt.clocks.FrozenClock(100.0)
+        self.source = flask_jwt.JWKSource(
+            "", ttl=60, min_interval=10, fetch=self.provider, clock=self.clock
+        )
+
+    def tearDown(self):
+        self.source.stop()
+
+    def test_load(self):
+        self.assertEqual(self.source.kids, ["a"])
+        self.assertEqual(self.source.algorithms, ["HS256"])
+        self.assertEqual(self.source.get("a").kid, "a")
+        self.assertEqual(self.source.expires, 160.0)
+        self.assertFalse(self.source.stale)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, flask_jwt.JWKSource, "", ttl=10, refresh_ahead=10)
+        self.assertRaises(ValueError, flask_jwt.JWKSource, "", min_interval=0)
+
+    def test_first_load_fails(self):
+        self.provider.error = OSError("unreachable")
+        self.assertRaises(OSError, flask_jwt.JWKSource, "", fetch=self.provider)
+
+    def test_unknown_kid_refetches(self):
+        self.provider.document = jwks("a", "b")
+        self.clock.advance(10)
+        self.assertEqual(self.source.get("b").kid, "b")
+        self.assertEqual(self.provider.calls, 2)
+
+    def test_unknown_kid_rate_limited(self):
+        self.clock.advance(5)
+        self.assertRaises(flask_jwt.errors.JWTDecodeError, self.source.get, "b")
+        self.assertEqual(self.provider.calls, 1)
+        self.clock.advance(5)
+        self.assertRaises(flask_jwt.errors.JWTDecodeError, self.source.get, "b")
+        self.assertRaises(flask_jwt.errors.JWTDecodeError, self.source.get, "c")
+        self.assertEqual(self.provider.calls, 2)
+
+    def test_single_refetch_for_waiting_requests(self):
+        self.clock.advance(10)
+        self.provider.document = jwks("a", "b")
+        self.provider.delay = 0.05
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.source.get("b")))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(results), 8)
+        self.assertEqual(self.provider.calls, 2)
+
+    def test_stale_while_refresh_fails(self):
+        self.clock.advance(120)
+        self.assertTrue(self.source.stale)
+        self.provider.error = OSError("unreachable")
+        self.assertFalse(self.source.refresh())
+        self.assertIsInstance(self.source.last_error, OSError)
+        self.assertEqual(self.source.get("a").kid, "a")
+        self.provider.error = None
+        self.assertTrue(self.source.refresh())
+        self.assertIsNone(self.source.last_error)
+        self.assertFalse(self.source.stale)
+
+    def test_background_refresh(self):
+        provider = Provider("a")
+        source = flask_jwt.JWKSource(
+            "", ttl=0.05, refresh_ahead=0.02, min_interval=0.01, fetch=provider
+        )
+        provider.document = jwks("b")
+        source.get("a")
+        deadline = time.monotonic() + 2
+        while "b" not in source and time.monotonic() < deadline:
+            time.sleep(0.01)
+        source.stop()
+        self.assertEqual(source.kids, ["b"])
+
+    def test_fork_hook(self):
+        self.source._pending = threading.Event()
+        flask_jwt.jwks._forked()
+        self.assertIsNone(self.source._pending)
+        source = flask_jwt.JWKSource("", fetch=self.provider)
+        collected = weakref.ref(source)
+        del source
+        gc.collect()
+        self.assertIsNone(collected())
+
+    def test_handler(self):
+        handler = flask_jwt.handlers.JWTHandler(self.source, 60)
+        token = flask_jwt.handlers.JWTHandler(
+            flask_jwt.KeySet(flask_jwt.Key("secret", kid="a")), 60
+        ).encode({})
+        self.assertIn("exp", handler.decode(token))
+
+    def test_new_algorithm_refetches(self):
+        key = {"kty": "oct", "k": "c2VjcmV0", "alg": "HS512", "kid": "b"}
+        self.provider.document = json.dumps({"keys": [key]}).encode("utf8")
+        self.clock.advance(10)
+        handler = flask_jwt.handlers.JWTHandler(self.source, 60)
+        token = flask_jwt.handlers.JWTHandler(
+            flask_jwt.KeySet(flask_jwt.Key("secret", "HS512", "b")), 60
+        ).encode({})
+        self.assertIn("exp", handler.decode(token))
+        self.assertEqual(self.provider.calls, 2)
+
+
+class LocationTest(unittest.TestCase):
+    def test_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "jwks.json")
+            with open(path, "wb") as jwks_file:
+                jwks_file.write(jwks("a"))
+            self.assertEqual(flask_jwt.JWKSource(path).kids, ["a"])
+
+    def test_http(self):
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.end_headers()
+                self.wfile.write(jwks("a"))
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            url = f"http://127.0.0.1:{server.server_port}/jwks.json"
+            self.assertEqual(flask_jwt.JWKSource(url).kids, ["a"])
+        finally:
+            server.shutdown()
+            server.server_close()
@@ -31,3 +31,8 @@ class JWTProtectedTest(unittest.TestCase):
             self.assertRaises(
                 flask_jwt.errors.JWTValidationError, protected(lambda: True)
             )
+
+    def test_explain(self):
+        rules = [mocks.MockRule(True), mocks.MockRule(False)]
+        protected = flask_jwt.decorators.JWTProtected(*rules)
+        self.assertIs(protected.explain("token"), rules[1])
@@ -0,0 +1,134 @@
+import unittest
+import json
+import jwt
+import jwt.algorithms
+import flask_jwt
+from . import mocks
+
+
+class KeyTest(unittest.TestCase):
+    def test_hmac(self):
+        key = flask_jwt.keys.Key("secret", "HS256", "kid")
+        self.assertEqual(key.signing_key, b"secret")
+        self.assertIs(key.signing_key, key.verifying_key)
+        self.assertTrue(key.can_sign)
+
+    def test_rsa_pem(self):
+        key = flask_jwt.keys.Key(mocks.rsa_pem(), "RS256")
+        self.assertTrue(key.can_sign)
+        self.assertIsNot(key.signing_key, key.verifying_key)
+        self.assertTrue(hasattr(key.verifying_key, "verify"))
+
+    def test_public_key_can_not_sign(self):
+        public = mocks.ec_key().public_key()
+        key = flask_jwt.keys.Key(public, "ES256")
+        self.assertFalse(key.can_sign)
+        self.assertRaises(ValueError, flask_jwt.keys.KeySet(key).set_signing_key, None)
+
+    def test_public(self):
+        key = flask_jwt.keys.Key(mocks.ec_key(), "ES256", "a")
+        public = key.public()
+        self.assertFalse(public.can_sign)
+        self.assertIs(public.verifying_key, key.verifying_key)
+        self.assertEqual(public.kid, "a")
+        hmac_key = flask_jwt.keys.Key("secret")
+        self.assertIs(hmac_key.public(), hmac_key)
+        keyset = flask_jwt.keys.KeySet(key, hmac_key).public()
+        self.assertEqual(keyset.kids, ["a", None])
+        self.assertIs(keyset.signing_key, hmac_key)
+
+    def test_invalid_algorithm(self):
+        self.assertRaises(ValueError, flask_jwt.keys.Key, "secret", "none")
+        self.assertRaises(ValueError, flask_jwt.keys.Key, "secret", "nope")
+
+    def test_oct_jwk(self):
+        jwk = {"kty": "oct", "k": "c2VjcmV0", "kid": "a"}
+        key = flask_jwt.keys.Key.from_jwk(jwk)
+        self.assertEqual(key.signing_key, b"secret")
+        self.assertEqual(key.algorithm, "HS256")
+        self.assertEqual(key.kid, "a")
+
+    def test_rsa_jwk(self):
+        pem = mocks.rsa_pem()
+        prepared = jwt.algorithms.RSAAlgorithm(jwt.algorithms.RSAAlgorithm.SHA256)
+        jwk = json.loads(prepared.to_jwk(prepared.prepare_key(pem)))
+        jwk["kid"] = "rsa"
+        key = flask_jwt.keys.Key.from_jwk(json.dumps(jwk))
+        self.assertEqual(key.algorithm, "RS256")
+        self.assertTrue(key.can_sign)
+
+    def test_ec_jwk(self):
+        numbers = mocks.ec_key().private_numbers()
+        jwk = {
+            "kty": "EC",
+            "crv": "P-256",
+            "x": jwt.utils.to_base64url_uint(numbers.public_numbers.x).decode(),
+            "y": jwt.utils.to_base64url_uint(numbers.public_numbers.y).decode(),
+            "d": jwt.utils.to_base64url_uint(numbers.private_value).decode(),
+        }
+        key = flask_jwt.keys.Key.from_jwk(jwk)
+        self.assertEqual(key.algorithm, "ES256")
+        self.assertTrue(key.can_sign)
+        del jwk["d"]
+        self.assertFalse(flask_jwt.keys.Key.from_jwk(jwk).can_sign)
+
+    def test_invalid_jwk(self):
+        self.assertRaises(ValueError, flask_jwt.keys.Key.from_jwk, {"kty": "nope"})
+        self.assertRaises(
+            ValueError, flask_jwt.keys.Key.from_jwk, {"kty": "EC", "crv": "nope"}
+        )
+
+
+class KeySetTest(unittest.TestCase):
+    def test_get(self):
+        a = flask_jwt.keys.Key("a", kid="a")
+        b = flask_jwt.keys.Key("b", kid="b")
+        keyset = flask_jwt.keys.KeySet(a, b, signing_kid="b")
+        self.assertIs(keyset.get("a"), a)
+        self.assertIs(keyset.signing_key, b)
+        self.assertRaises(flask_jwt.errors.JWTDecodeError, keyset.get, "c")
+        self.assertRaises(flask_jwt.errors.JWTDecodeError, keyset.get)
+
+    def test_single_key_without_kid(self):
+        key = flask_jwt.keys.Key("a", kid="a")
+        self.assertIs(flask_jwt.keys.KeySet(key).get(), key)
+
+    def test_rotation(self):
+        keyset = flask_jwt.keys.KeySet(flask_jwt.keys.Key("a", kid="a"))
+        keyset.add(flask_jwt.keys.Key("b", kid="b"), signing=True)
+        self.assertEqual(keyset.signing_key.kid, "b")
+        keyset.remove("b")
+        self.assertEqual(keyset.signing_key.kid, "a")
+        self.assertEqual(keyset.kids, ["a"])
+
+    def test_from_jwks(self):
+        jwks = {"keys": [{"kty": "oct", "k": "YQ", "kid": "a", "alg": "HS512"}]}
+        keyset = flask_jwt.keys.KeySet.from_jwks(json.dumps(jwks))
+        self.assertTrue("a" in keyset)
+        self.assertEqual(keyset.algorithms, ["HS512"])
+
+    def test_handler_rotation(self):
+        old = flask_jwt.keys.Key(mocks.rsa_pem(), "RS256", "old")
+        new = flask_jwt.keys.Key(mocks.ec_key(), "ES256", "new")
+        keyset = flask_jwt.keys.KeySet(old)
+        handler = flask_jwt.handlers.JWTHandler(keyset, 60)
+        old_token = handler.encode({"thing": True})
+        keyset.add(new, signing=True)
+        new_token = handler.encode({"thing": False})
+        self.assertEqual(jwt.get_unverified_header(new_token)["kid"], "new")
+        self.assertTrue(handler.decode(old_token)["thing"])
+        self.assertFalse(handler.decode(new_token)["thing"])
+        keyset.remove("old")
+        self.assertRaises(flask_jwt.errors.JWTDecodeError, handler.decode, old_token)
+
+    def test_handler_from_pem(self):
+        keyset = flask_jwt.keys.KeySet.from_pem(mocks.rsa_pem(), "RS256")
+        handler = flask_jwt.handlers.JWTHandler(keyset, 60)
+        self.assertEqual(handler.decode(handler.encode({"a": 1}))["a"], 1)
+
+    def test_handler_without_signing_key(self):
+        keyset = flask_jwt.keys.KeySet(
+            flask_jwt.keys.Key(mocks.ec_key().public_key(), "ES256")
+        )
+        handler = flask_jwt.handlers.JWTHandler(keyset, 60)
+        self.assertRaises(flask_jwt.errors.JWTEncodeError, handler.encode, {})
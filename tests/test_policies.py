@@ -0,0 +1,115 @@
+import unittest
+import flask
+import flask_jwt
+from . import mocks
+
+
+class CountingRule(flask_jwt.JWTRule):
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, token):
+        self.calls += 1
+        return True
+
+
+class PolicyRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = flask_jwt.policies.PolicyRegistry()
+
+    def test_empty(self):
+        self.assertFalse(self.registry)
+        self.assertIsNone(self.registry.get("index"))
+        self.registry.check("index", None)
+
+    def test_resolution(self):
+        a, b, c = mocks.MockRule(True), mocks.MockRule(True), mocks.MockRule(True)
+        self.registry.protect_app(a)
+        self.registry.protect_blueprint("api", b)
+        self.registry.protect_endpoint("api.v1.index", c)
+        self.assertEqual(self.registry.get("api.v1.index").flatten(), [a, b, c])
+        self.assertEqual(self.registry.get("api.other").flatten(), [a, b])
+        self.assertEqual(self.registry.get("index").flatten(), [a])
+        self.assertIsNone(self.registry.get(None))
+
+    def test_cached(self):
+        self.registry.protect_endpoint("index", mocks.MockRule(True))
+        policy = self.registry.get("index")
+        self.assertIs(self.registry.get("index"), policy)
+        self.registry.protect_endpoint("index", mocks.MockRule(True))
+        self.assertIsNot(self.registry.get("index"), policy)
+        self.assertEqual(len(self.registry.get("index").flatten()), 2)
+
+    def test_check(self):
+        self.registry.protect_endpoint("index", mocks.MockRule(False))
+        self.assertRaises(
+            flask_jwt.errors.JWTValidationError, self.registry.check, "index", None
+        )
+        self.assertRaises(
+            flask_jwt.errors.JWTValidationError, self.registry.check, "index", {"a": 1}
+        )
+
+
+class FlaskPolicyTest(unittest.TestCase):
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+        self.flaskjwt = flask_jwt.FlaskJWT("secret", 60)
+        self.flaskjwt.init_app(self.app)
+        self.shared = CountingRule()
+        blueprint = flask.Blueprint("api", __name__)
+
+        @blueprint.route("/orders")
+        @flask_jwt.jwt_protected(self.shared)
+        def orders():
+            return "ok"
+
+        self.app.add_url_rule("/", "index", lambda: "ok")
+        self.app.register_blueprint(blueprint)
+        self.flaskjwt.policies.protect_blueprint(
+            blueprint, flask_jwt.HasScopes("orders"), self.shared
+        )
+        self.client = self.app.test_client()
+
+    def get(self, path, *scopes):
+        with self.app.test_request_context():
+            token = self.flaskjwt.encode({"scp": list(scopes)})
+        return self.client.get(path, headers={"Authorization": f"Bearer {token}"})
+
+    def test_protected(self):
+        self.assertEqual(self.get("/orders", "orders").status_code, 200)
+        self.assertEqual(self.get("/orders", "other").status_code, 403)
+        self.assertEqual(self.client.get("/orders").status_code, 403)
+
+    def test_unprotected(self):
+        self.assertEqual(self.client.get("/").status_code, 200)
+        self.assertEqual(self.client.get("/missing").status_code, 404)
+
+    def test_shared_rule_runs_once(self):
+        self.get("/orders", "orders")
+        self.assertEqual(self.shared.calls, 1)
+
+    def test_async_handler(self):
+        app = flask.Flask(__name__)
+        jwt = flask_jwt.AsyncFlaskJWT("secret", 60, lazy=True)
+        jwt.init_app(app)
+        app.add_url_rule("/", "index", lambda: "ok")
+        jwt.policies.protect_endpoint("index", flask_jwt.HasScopes("a"))
+        client = app.test_client()
+        with app.test_request_context():
+            token = jwt.encode({"scp": ["a"]})
+        self.assertEqual(client.get("/").status_code, 403)
+        headers = {"Authorization": f"Bearer {token}"}
+        self.assertEqual(client.get("/", headers=headers).status_code, 200)
+
+    def test_lazy_unprotected_endpoint(self):
+        for handler in (flask_jwt.FlaskJWT, flask_jwt.AsyncFlaskJWT):
+            app = flask.Flask(__name__)
+            jwt = handler("secret", 60, lazy=True)
+            jwt.init_app(app)
+            app.add_url_rule("/public", "public", lambda: "ok")
+            app.add_url_rule("/admin", "admin", lambda: "ok")
+            jwt.policies.protect_endpoint("admin", flask_jwt.HasScopes("admin"))
+            client = app.test_client()
+            headers = {"Authorization": "Bearer garbage"}
+            self.assertEqual(client.get("/public", headers=headers).status_code, 200)
+            self.assertEqual(client.get("/admin", headers=headers).status_code, 403)
@@ -0,0 +1,183 @@
+import unittest
+import math
+import threading
+import time
+import flask_jwt
+from . import mocks
+
+
+class BloomFilterTest(unittest.TestCase):
+    def test_contains(self):
+        bloom = flask_jwt.revocation.BloomFilter(100, 0.01)
+        bloom.add("a")
+        self.assertTrue("a" in bloom)
+        self.assertFalse("b" in bloom)
+        bloom.clear()
+        self.assertFalse("a" in bloom)
+
+    def test_error_rate(self):
+        bloom = flask_jwt.revocation.BloomFilter(1000, 0.01)
+        for index in range(1000):
+            bloom.add(f"in:{index}")
+        false_positives = sum(f"out:{index}" in bloom for index in range(10000))
+        self.assertLess(false_positives, 300)
+
+    def test_invalid(self):
+        self.assertRaises(ValueError, flask_jwt.revocation.BloomFilter, 0)
+        self.assertRaises(ValueError, flask_jwt.revocation.BloomFilter, 10, 1)
+
+
+class BackendTest(unittest.TestCase):
+    def backends(self):
+        return [
+            flask_jwt.revocation.MemoryBackend(),
+            flask_jwt.revocation.SQLiteBackend(),
+            flask_jwt.revocation.RedisBackend(mocks.MockRedis()),
+        ]
+
+    def test_add_contains(self):
+        for backend in self.backends():
+            backend.add("a", time.time() + 60)
+            self.assertTrue(backend.contains("a"))
+            self.assertFalse(backend.contains("b"))
+            self.assertEqual([jti for jti, _ in backend.items()], ["a"])
+
+    def test_prune(self):
+        for backend in self.backends()[:2]:
+            backend.add("old", time.time() - 1)
+            backend.add("new", time.time() + 60)
+            backend.prune(time.time())
+            self.assertFalse(backend.contains("old"))
+            self.assertTrue(backend.contains("new"))
+
+    def test_redis_no_expiry(self):
+        client = mocks.MockRedis()
+        backend = flask_jwt.revocation.RedisBackend(client)
+        backend.add("a", math.inf)
+        backend.add("b", time.time() + 60)
+        self.assertIsNone(client.expiry[b"flask_jwt:revoked:a"])
+        self.assertEqual(client.expiry[b"flask_jwt:revoked:b"], 60)
+        self.assertEqual(dict(backend.items())["a"], math.inf)
+
+    def test_base(self):
+        backend = flask_jwt.revocation.RevocationBackend()
+        self.assertRaises(NotImplementedError, backend.add, "a", 0)
+        self.assertRaises(NotImplementedError, backend.contains, "a")
+        self.assertRaises(NotImplementedError, backend.prune, 0)
+        self.assertRaises(NotImplementedError, backend.items)
+
+
+class RevocationListTest(unittest.TestCase):
+    def test_revoke(self):
+        revocations = flask_jwt.revocation.RevocationList()
+        revocations.revoke("a", time.time() + 60)
+        self.assertTrue(revocations.is_revoked("a"))
+        self.assertFalse(revocations.is_revoked("b"))
+        self.assertEqual(revocations.stats()["checks"], 2)
+
+    def test_filter_skips_backend(self):
+        backend = flask_jwt.revocation.MemoryBackend()
+        revocations = flask_jwt.revocation.RevocationList(backend)
+        with mocks.patch_object(backend, "contains", mocks.raise_error(KeyError)):
+            self.assertFalse(revocations.is_revoked("a"))
+        self.assertEqual(revocations.lookups, 0)
+
+    def test_prune(self):
+        revocations = flask_jwt.revocation.RevocationList(prune_interval=0)
+        revocations.revoke("old", time.time() - 1)
+        revocations.revoke("new", time.time() + 60)
+        self.assertFalse("old" in revocations.filter)
+        self.assertTrue(revocations.is_revoked("new"))
+
+    def test_prune_without_revoke(self):
+        revocations = flask_jwt.revocation.RevocationList(prune_interval=0)
+        revocations.backend.add("old", time.time() - 1)
+        revocations.is_revoked("old")
+        self.assertEqual(list(revocations.backend.items()), [])
+
+    def test_reload(self):
+        backend = flask_jwt.revocation.SQLiteBackend()
+        revocations = flask_jwt.revocation.RevocationList(backend, reload_interval=0)
+        backend.add("a", time.time() + 60)
+        self.assertTrue(revocations.is_revoked("a"))
+
+    def test_shared_backend_reloads(self):
+        redis = flask_jwt.revocation.RedisBackend(mocks.MockRedis())
+        revocations = flask_jwt.revocation.RevocationList(redis)
+        self.assertEqual(revocations.reload_interval, 30.0)
+        local = flask_jwt.revocation.RevocationList()
+        self.assertIsNone(local.reload_interval)
+
+    def test_revoke_during_reload(self):
+        started, release = threading.Event(), threading.Event()
+
+        class SlowBackend(flask_jwt.revocation.MemoryBackend):
+            blocking = False
+
+            def items(self):
+                items = super().items()
+                if self.blocking:
+                    started.set()
+                    release.wait(5)
+                return items
+
+        backend = SlowBackend()
+        revocations = flask_jwt.revocation.RevocationList(backend)
+        backend.blocking = True
+        reload = threading.Thread(target=revocations.reload)
+        reload.start()
+        started.wait(5)
+        revoke = threading.Thread(target=revocations.revoke, args=("a",))
+        revoke.start()
+        time.sleep(0.05)
+        release.set()
+        reload.join()
+        revoke.join()
+        self.assertTrue(revocations.is_revoked("a"))
+
+
+class HandlerRevocationTest(unittest.TestCase):
+    def setUp(self):
+        self.revocations = flask_jwt.revocation.RevocationList()
+        self.handler = flask_jwt.handlers.FlaskJWT(
+            "secret",
+            60,
+            revocation_list=self.revocations,
+            token_cache=flask_jwt.cache.TokenCache(),
+        )
+
+    def test_decode(self):
+        token = self.handler.encode({"jti": "a"})
+        decoded = self.handler.decode(token)
+        self.handler.revoke(decoded)
+        self.assertRaises(flask_jwt.errors.JWTRevokedError, self.handler.decode, token)
+
+    def test_numeric_jti(self):
+        token = self.handler.encode({"jti": 123})
+        self.assertEqual(self.handler.decode(token)["jti"], 123)
+        self.handler.revoke({"jti": 123})
+        self.assertRaises(flask_jwt.errors.JWTRevokedError, self.handler.decode, token)
+        self.handler.revoke({"jti": 7})
+        self.assertTrue(self.revocations.is_revoked(7))
+        self.assertTrue(self.revocations.is_revoked("7"))
+
+    def test_cached(self):
+        token = self.handler.encode({"jti": "a"})
+        self.handler._verify_token(token)
+        self.revocations.revoke("a")
+        self.assertRaises(
+            flask_jwt.errors.JWTRevokedError, self.handler._verify_token, token
+        )
+
+    def test_revoke_errors(self):
+        self.assertRaises(ValueError, self.handler.revoke, {})
+        self.handler.revocation_list = None
+        self.assertRaises(ValueError, self.handler.revoke, {"jti": "a"})
+
+    def test_generate_jti(self):
+        store = mocks.MockStore()
+        with mocks.patch_object(flask_jwt.FlaskJWT, "store", store):
+            flask_jwt.FlaskJWT.generate_token("read", jti=True)
+            self.assertIsInstance(store.obj["jti"], str)
+            flask_jwt.FlaskJWT.generate_token("read", jti="given")
+            self.assertEqual(store.obj["jti"], "given")
@@ -0,0 +1,73 @@
+import unittest
+import flask
+import flask_jwt
+
+
+class ScopeRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = flask_jwt.ScopeRegistry(
+            "orders:read", "orders:items:write", "users:read"
+        )
+
+    def test_register(self):
+        self.assertEqual(self.registry.register("orders:read"), 1)
+        self.assertEqual(self.registry.register("admin"), 8)
+        self.assertEqual(len(self.registry), 4)
+        self.assertIn("admin", self.registry)
+        self.assertEqual(self.registry.mask(["orders:read", "admin"]), 9)
+
+    def test_bitset(self):
+        self.assertEqual(self.registry.bitset(["orders:read", "unknown"]), 1)
+        self.assertEqual(self.registry.bitset(["orders:*"]), 3)
+        self.assertEqual(self.registry.bitset(["orders:items:*"]), 2)
+        self.assertEqual(self.registry.bitset(["*"]), 7)
+        self.assertEqual(self.registry.bitset(["nothing:*"]), 0)
+
+    def test_wildcard_sees_new_scopes(self):
+        self.registry.register("orders:delete")
+        self.assertEqual(self.registry.bitset(["orders:*"]), 11)
+
+    def test_request_cache(self):
+        app = flask.Flask(__name__)
+        token = {"scp": ["orders:read"]}
+        with app.test_request_context():
+            self.assertEqual(self.registry.token_bitset(token), 1)
+            token["scp"].append("users:read")
+            self.assertEqual(self.registry.token_bitset(token), 1)
+            token["scp"] = ["users:read"]
+            self.assertEqual(self.registry.token_bitset(token), 4)
+
+
+class RegistryHasScopesTest(unittest.TestCase):
+    def setUp(self):
+        self.registry = flask_jwt.ScopeRegistry()
+
+    def test_has_scopes(self):
+        rule = flask_jwt.HasScopes("orders:read", "users:read", registry=self.registry)
+        self.assertTrue(rule({"scp": ["users:read", "orders:read", "other"]}))
+        self.assertFalse(rule({"scp": ["orders:read"]}))
+        self.assertFalse(rule({}))
+
+    def test_wildcards(self):
+        rule = flask_jwt.HasScopes("orders:items:read", registry=self.registry)
+        self.assertTrue(rule({"scp": ["orders:*"]}))
+        self.assertTrue(rule({"scp": ["orders:items:*"]}))
+        self.assertTrue(rule({"scp": ["*"]}))
+        self.assertFalse(rule({"scp": ["orders:read:*"]}))
+
+    def test_compiled(self):
+        other = flask_jwt.ScopeRegistry()
+        rule = flask_jwt.compile_rules(
+            flask_jwt.HasScopes("a", registry=self.registry),
+            flask_jwt.HasScopes("b", registry=self.registry),
+            flask_jwt.HasScopes("c", registry=other),
+            flask_jwt.AnyOf(
+                flask_jwt.HasScopes("d", registry=self.registry),
+                flask_jwt.HasScopes("e", registry=self.registry),
+            ),
+        )
+        merged = [r for r in rule.flatten() if r.registry is self.registry]
+        self.assertEqual(merged[0].scopes, frozenset(("a", "b")))
+        self.assertEqual(len(merged), 3)
+        self.assertTrue(rule({"scp": ["a", "b", "c", "e"]}))
+        self.assertFalse(rule({"scp": ["a", "b", "c"]}))
@@ -0,0 +1,127 @@
+import unittest
+import datetime
+import json
+import jwt.utils
+import flask_jwt
+
+HAS_ORJSON = flask_jwt.serializers.OrjsonSerializer.available(None)
+
+payloads = [
+    {},
+    {"sub": "1234", "scp": ["a", "b"], "exp": 1.5},
+    {"name": "é ☃ /", "nested": {"list": [1, None, True, {"x": -2}]}},
+    {"big": 2**62, "float": 0.1, "empty": "", 1: "int key"},
+    {"big": 2**70, "negative": -(2**64), "float": 1e300},
+]
+
+
+class DateEncoder(json.JSONEncoder):
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.strftime("%Y/%m/%d")
+        return super(DateEncoder, self).default(o)
+
+
+class SortedEncoder(json.JSONEncoder):
+    def encode(self, o):
+        return json.dumps(o, sort_keys=True, separators=(",", ":"))
+
+
+class SerializerTest(unittest.TestCase):
+    def serializers(self, json_encoder=None):
+        names = ["json", "auto"] + (["orjson"] if HAS_ORJSON else [])
+        return [flask_jwt.serializers.get(name, json_encoder) for name in names]
+
+    def test_round_trip(self):
+        reference = flask_jwt.serializers.JSONSerializer()
+        for serializer in self.serializers():
+            for payload in payloads:
+                dumped = serializer.dumps(payload)
+                self.assertIsInstance(dumped, bytes)
+                self.assertEqual(
+                    serializer.loads(dumped), json.loads(reference.dumps(payload))
+                )
+                self.assertEqual(
+                    reference.loads(dumped), serializer.loads(reference.dumps(payload))
+                )
+
+    def test_json_encoder_default(self):
+        payload = {"when": datetime.datetime(2020, 1, 2)}
+        for serializer in self.serializers(DateEncoder):
+            self.assertEqual(
+                serializer.loads(serializer.dumps(payload)), {"when": "2020/01/02"}
+            )
+        for serializer in self.serializers():
+            self.assertRaises(TypeError, serializer.dumps, payload)
+
+    def test_json_encoder_override(self):
+        for name in ("auto", "orjson"):
+            serializer = flask_jwt.serializers.get(name, SortedEncoder)
+            self.assertIsInstance(serializer, flask_jwt.serializers.JSONSerializer)
+            self.assertEqual(serializer.dumps({"b": 1, "a": 2}), b'{"a":2,"b":1}')
+
+    def test_fallback(self):
+        serializer = flask_jwt.serializers.get("ujson")
+        if not flask_jwt.serializers.UjsonSerializer.available(None):
+            self.assertIsInstance(serializer, flask_jwt.serializers.JSONSerializer)
+        self.assertRaises(ValueError, flask_jwt.serializers.get, "nope")
+
+    @unittest.skipUnless(HAS_ORJSON, "orjson is not installed")
+    def test_auto(self):
+        serializer = flask_jwt.serializers.get("auto")
+        self.assertIsInstance(serializer, flask_jwt.serializers.OrjsonSerializer)
+        self.assertIs(flask_jwt.serializers.get(serializer), serializer)
+
+
+@unittest.skipUnless(HAS_ORJSON, "orjson is not installed")
+class HandlerSerializerTest(unittest.TestCase):
+    def setUp(self):
+        self.handler = flask_jwt.handlers.JWTHandler(
+            "secret", 60, audience="me", serializer="orjson"
+        )
+        self.stdlib = flask_jwt.handlers.JWTHandler("secret", 60, audience="me")
+
+    def test_round_trip(self):
+        for payload in payloads[:3]:
+            token = self.handler.encode(dict(payload))
+            self.assertEqual(self.handler.decode(token), self.stdlib.decode(token))
+            token = self.stdlib.encode(dict(payload))
+            self.assertEqual(self.handler.decode(token), self.stdlib.decode(token))
+
+    def test_big_int(self):
+        token = self.handler.encode({"big": 2**70})
+        self.assertEqual(self.handler.decode(token)["big"], 2**70)
+        (result,) = self.handler.encode_many([{"set": {1}}])
+        self.assertIsInstance(result, flask_jwt.errors.JWTEncodeError)
+
+    def test_unverified(self):
+        token = self.handler.encode({"a": 1})
+        self.assertEqual(self.handler.decode(token, verify=False)["a"], 1)
+
+    def test_errors(self):
+        self.handler.validator.precheck_claims = False
+        key = self.handler.keys.signing_key
+        expired = self.handler.encoder.encode({"exp": 1, "aud": "me"}, key)
+        other = flask_jwt.handlers.JWTHandler(
+            "other", 60, audience="me", serializer="orjson"
+        ).encode({})
+        self.assertRaises(
+            flask_jwt.errors.JWTDecodeError, self.handler.decode, expired.decode()
+        )
+        self.assertRaises(
+            flask_jwt.errors.JWTSignatureError, self.handler.decode, other
+        )
+
+    def test_non_object(self):
+        header = self.handler.encoder.header_segment("HS256")
+        signing_input = header + b"." + jwt.utils.base64url_encode(b"[1]")
+        signature = self.handler.keys.signing_key.sign(signing_input)
+        token = signing_input + b"." + jwt.utils.base64url_encode(signature)
+        self.handler.validator.precheck_claims = False
+        for verify in (True, False):
+            self.assertRaises(
+                flask_jwt.errors.JWTDecodeError,
+                self.handler.decode,
+                token.decode("utf8"),
+                verify,
+            )
@@ -24,3 +24,21 @@ class JWTStoreTest(unittest.TestCase):
     def test_returns_none_if_no_token_set(self):
         with mocks.patch_object(flask, "g", mocks.FakeG()):
             self.assertIsNone(self.store.get())
+
+
+class RequestCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.app = flask.Flask(__name__)
+        self.cache = flask_jwt.handlers._RequestCache
+
+    def test_no_request(self):
+        self.assertIsNone(self.cache.get())
+
+    def test_per_request(self):
+        with self.app.app_context():
+            with self.app.test_request_context("/"):
+                first = self.cache.get()
+                first["thing"] = True
+                self.assertIs(self.cache.get(), first)
+            with self.app.test_request_context("/"):
+                self.assertEqual(self.cache.get(), {})
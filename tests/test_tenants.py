@@ -0,0 +1,120 @@
+import unittest
+import flask
+import flask_jwt
+
+
+def tenant(issuer=None, kid=None, secret="secret", **kwargs):
+    keyset = flask_jwt.KeySet(flask_jwt.Key(secret, "HS256", kid=kid))
+    return flask_jwt.FlaskJWT(keyset, 60, issuer=issuer, **kwargs)
+
+
+class TenantRegistryTest(unittest.TestCase):
+    def setUp(self):
+        self.a = tenant("https://a.example", secret="a")
+        self.b = tenant(kid="b-1", secret="b")
+        self.registry = flask_jwt.TenantRegistry(self.a, self.b)
+
+    def test_index(self):
+        self.assertEqual(self.registry.issuers, {"https://a.example": self.a})
+        self.assertEqual(self.registry.kids, {"b-1": self.b})
+        self.assertEqual(len(self.registry), 2)
+        self.assertIn(self.a, self.registry)
+
+    def test_get(self):
+        self.assertIs(self.registry.get(issuer="https://a.example"), self.a)
+        self.assertIs(self.registry.get(issuer="https://a.example", kid="b-1"), self.b)
+        self.assertIsNone(self.registry.get(issuer="https://c.example"))
+        self.assertIsNone(self.registry.get(issuer=["https://a.example"]))
+
+    def test_find(self):
+        self.assertIs(self.registry.find(self.a.encode({})), self.a)
+        self.assertIs(self.registry.find(self.b.encode({})), self.b)
+        other = tenant("https://c.example")
+        self.assertIsNone(self.registry.find(other.encode({})))
+
+    def test_find_malformed(self):
+        for jwt_string in ("", "a.b", "a.b.c", "e30.W10.c", "e30.e30.c"):
+            self.assertIsNone(self.registry.find(jwt_string))
+
+    def test_requires_issuer_or_kid(self):
+        self.assertRaises(ValueError, self.registry.add, tenant())
+
+    def test_conflict(self):
+        self.assertRaises(ValueError, self.registry.add, tenant("https://a.example"))
+        self.assertRaises(ValueError, self.registry.add, tenant(kid="b-1"))
+        self.assertEqual(len(self.registry), 2)
+
+    def test_remove(self):
+        self.registry.remove(self.a)
+        self.assertEqual(self.registry.issuers, {})
+        self.assertNotIn(self.a, self.registry)
+        self.assertRaises(KeyError, self.registry.remove, self.a)
+
+    def test_reindex(self):
+        self.a.issuer = "https://a2.example"
+        self.registry.add(self.a)
+        self.assertEqual(self.registry.issuers, {"https://a2.example": self.a})
+        token = self.a.encode({})
+        self.assertEqual(self.a.decode(token)["iss"], "https://a2.example")
+
+    def test_symmetric(self):
+        self.assertTrue(self.registry.symmetric)
+
+
+class FlaskTenantTest(unittest.TestCase):
+    def setUp(self):
+        self.a = tenant(
+            "https://a.example", secret="a", token_cache=flask_jwt.TokenCache()
+        )
+        self.b = tenant(
+            "https://b.example", secret="b", metrics=flask_jwt.InMemoryMetrics()
+        )
+        self.registry = flask_jwt.TenantRegistry(self.a, self.b)
+        self.app = flask.Flask(__name__)
+        self.flaskjwt = flask_jwt.FlaskJWT("default", 60, tenants=self.registry)
+        self.flaskjwt.init_app(self.app)
+
+        @self.app.route("/")
+        def index():
+            return flask_jwt.current_token()["iss"]
+
+        self.client = self.app.test_client()
+
+    def get(self, token):
+        return self.client.get("/", headers={"Authorization": f"Bearer {token}"})
+
+    def test_routes_to_tenant(self):
+        response = self.get(self.a.encode({}))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, b"https://a.example")
+        self.assertEqual(self.get(self.b.encode({})).data, b"https://b.example")
+
+    def test_default(self):
+        token = self.flaskjwt.encode({"iss": "default"})
+        self.assertEqual(self.get(token).status_code, 200)
+
+    def test_wrong_tenant_key(self):
+        forged = tenant("https://a.example", secret="b").encode({})
+        self.assertEqual(self.get(forged).status_code, 403)
+
+    def test_per_tenant_state(self):
+        token = self.a.encode({})
+        self.get(token)
+        self.assertIsNotNone(self.a.token_cache.get(token))
+        self.get(self.b.encode({}))
+        self.assertEqual(self.b.metrics.timings[("decode", ())][0], 1)
+
+    def test_runtime_changes(self):
+        c = tenant("https://c.example", secret="c")
+        token = c.encode({})
+        self.assertEqual(self.get(token).status_code, 403)
+        self.registry.add(c)
+        self.assertEqual(self.get(token).status_code, 200)
+        self.registry.remove(c)
+        self.assertEqual(self.get(token).status_code, 403)
+
+    def test_reissued_by_tenant(self):
+        self.flaskjwt.auto_update = True
+        response = self.get(self.b.encode({}))
+        reissued = response.headers["Authorization"][len("Bearer ") :]
+        self.assertEqual(self.b.decode(reissued)["iss"], "https://b.example")
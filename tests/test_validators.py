@@ -0,0 +1,103 @@
+import unittest
+import time
+import jwt
+import flask_jwt
+from . import mocks
+
+
+class TokenValidatorTest(unittest.TestCase):
+    def setUp(self):
+        self.validator = flask_jwt.validators.TokenValidator(max_size=512)
+        self.keyset = flask_jwt.keys.KeySet(flask_jwt.keys.Key("secret", kid="a"))
+
+    def validate(self, token: bytes, **kwargs):
+        return self.validator.validate(token, self.keyset, **kwargs)
+
+    def assertRejected(self, error, stage, token: bytes, **kwargs):
+        self.assertRaises(error, self.validate, token, **kwargs)
+        self.assertEqual(self.validator.rejected[stage], 1)
+
+    def test_valid(self):
+        token = jwt.encode({"exp": time.time() + 60}, "secret", headers={"kid": "a"})
+        key, header = self.validate(token)
+        self.assertEqual(key.kid, "a")
+        self.assertEqual(header["alg"], "HS256")
+        self.assertEqual(sum(self.validator.rejected.values()), 0)
+
+    def test_too_large(self):
+        token = jwt.encode({"a": "a" * 512}, "secret")
+        self.assertRejected(flask_jwt.errors.JWTStructureError, "structure", token)
+
+    def test_no_size_limit(self):
+        handler = flask_jwt.handlers.JWTHandler("secret", 60)
+        scopes = [f"service:resource-{index}:write" for index in range(500)]
+        token = handler.encode({"scp": scopes})
+        self.assertGreater(len(token), 8192)
+        self.assertEqual(handler.decode(token)["scp"], scopes)
+
+    def test_segments(self):
+        self.assertRejected(flask_jwt.errors.JWTStructureError, "structure", b"a.b")
+
+    def test_base64(self):
+        token = b"e30.e30.a+b/"
+        self.assertRejected(flask_jwt.errors.JWTStructureError, "structure", token)
+
+    def test_header_json(self):
+        token = b"bm9wZQ.e30.abcd"
+        self.assertRejected(flask_jwt.errors.JWTHeaderError, "header", token)
+
+    def test_algorithm(self):
+        token = jwt.encode({}, "secret", algorithm="HS512")
+        self.assertRejected(flask_jwt.errors.JWTHeaderError, "header", token)
+
+    def test_unknown_kid(self):
+        token = jwt.encode({}, "secret", headers={"kid": "b"})
+        self.assertRejected(flask_jwt.errors.JWTHeaderError, "header", token)
+
+    def test_expired(self):
+        token = jwt.encode({"exp": time.time() - 60}, "secret")
+        self.assertRejected(flask_jwt.errors.JWTClaimsError, "claims", token)
+
+    def test_expired_not_verified(self):
+        token = jwt.encode({"exp": time.time() - 60}, "secret")
+        self.validate(token, options={"verify_exp": False})
+
+    def test_not_before(self):
+        token = jwt.encode({"nbf": time.time() + 60}, "secret")
+        self.assertRejected(flask_jwt.errors.JWTClaimsError, "claims", token)
+
+    def test_issuer(self):
+        token = jwt.encode({"iss": "other"}, "secret")
+        self.assertRejected(
+            flask_jwt.errors.JWTClaimsError, "claims", token, issuer="thing"
+        )
+
+    def test_audience(self):
+        token = jwt.encode({"aud": ["a", "b"]}, "secret")
+        self.validate(token, audience="b")
+        self.assertRejected(
+            flask_jwt.errors.JWTClaimsError, "claims", token, audience="c"
+        )
+
+    def test_missing_audience(self):
+        token = jwt.encode({}, "secret")
+        self.assertRejected(
+            flask_jwt.errors.JWTClaimsError, "claims", token, audience="a"
+        )
+
+    def test_precheck_disabled(self):
+        self.validator.precheck_claims = False
+        self.validate(jwt.encode({"exp": time.time() - 60}, "secret"))
+
+    def test_handler_counts_signature(self):
+        handler = flask_jwt.handlers.JWTHandler("secret", 60)
+        token = jwt.encode({}, "other").decode("utf8")
+        self.assertRaises(flask_jwt.errors.JWTSignatureError, handler.decode, token)
+        self.assertEqual(handler.validator.rejected["signature"], 1)
+
+    def test_handler_skips_signature(self):
+        handler = flask_jwt.handlers.JWTHandler("secret", 60)
+        with mocks.patch_object(jwt, "decode", mocks.raise_error(AssertionError)):
+            self.assertRaises(
+                flask_jwt.errors.JWTStructureError, handler.decode, "not.a.token!"
+            )